@@ -1,24 +1,65 @@
-from langchain_ollama import ChatOllama
-from configs.model_config import MODEL_NAME, DEFAULT_SYSTEM_MESSAGE, VOICE_SYSTEM_MESSAGE
+from brain.resource_registry import resource_registry
+from configs.model_config import MODEL_NAME, TORCH_THREADS
+from configs.external_keys import GEMINI_API_KEY
+
+# Models are built on first use (or by the startup warm-up), not at import
+
+
+def _ollama_loader():
+    def load():
+        from langchain_ollama import ChatOllama
+        # Don't set system message here - we'll handle it in the templates
+        return ChatOllama(model=MODEL_NAME)
+    return load
 
-# Default model for text-only queries
-default_model = ChatOllama(
-    model=MODEL_NAME,
-    # Don't set system message here - we'll handle it in the templates
-)    
 
+def _configure_gemini():
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
+
+
+# Default model for text-only queries
+resource_registry.register("ollama_default", _ollama_loader())
 # Voice model for voice queries
-voice_model = ChatOllama(
-    model=MODEL_NAME,
-    # Don't set system message here - we'll handle it in the templates
-)
+resource_registry.register("ollama_voice", _ollama_loader())
+# Vision model - using Gemma 3 4B for vision tasks as well
+resource_registry.register("ollama_vision", _ollama_loader())
+# Gemini is configured once here instead of in every module that calls it
+resource_registry.register("gemini", _configure_gemini)
+
+_gemini_models = {}
+_torch_threads_configured = False
+
+
+def configure_torch_threads():
+    """Size torch's thread pool once (TORCH_THREADS); a no-op without torch."""
+    global _torch_threads_configured
+    if _torch_threads_configured:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    # Process-wide: set here rather than by whichever model happens to load last
+    torch.set_num_threads(TORCH_THREADS)
+    _torch_threads_configured = True
+
+
+def get_default_model():
+    return resource_registry.get("ollama_default")
+
 
-# Vision model - using Gemma 3 4B for vision tasks
-vision_model = ChatOllama(
-    model=MODEL_NAME,  # Using Gemma 3 4B for vision as well
-    # Don't set system message here - we'll handle it in the templates
-)
+def get_voice_model():
+    return resource_registry.get("ollama_voice")
 
 
+def get_vision_model():
+    return resource_registry.get("ollama_vision")
 
 
+def get_gemini_model(model_name: str = 'gemini-2.0-flash'):
+    """Shared GenerativeModel per model name."""
+    if model_name not in _gemini_models:
+        _gemini_models[model_name] = resource_registry.get("gemini").GenerativeModel(model_name)
+    return _gemini_models[model_name]
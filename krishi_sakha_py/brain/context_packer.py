@@ -0,0 +1,299 @@
+"""
+Token-budgeted packing of retrieved context into the prompt.
+
+Every context source (vector DB chunks, scraped web pages, the crop
+advisory sections) used to go into the prompt whole. The packer takes
+snippets from any of them, drops near-duplicates, splits the rest into
+sentences (lines, for tables and bullet lists) and, when the whole lot
+doesn't fit the token budget, keeps the sentences that share the most terms
+with the question, favouring higher-ranked snippets. Kept sentences stay in
+their original order under their snippet's source label.
+
+A snippet is {"text": str, "score": optional float (higher is better),
+"source": optional label}; as_snippets() builds them from the shapes the
+routes already pass around.
+"""
+
+import re
+import math
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from brain.resource_registry import resource_registry, READY, NOT_LOADED
+from data.functions.sparse_index import query_terms
+from configs.context_packer_config import (
+    CONTEXT_TOKEN_BUDGET, CONTEXT_TOKENIZER_NAME, CONTEXT_DUPLICATE_THRESHOLD, CONTEXT_MIN_DEDUPE_WORDS,
+    CONTEXT_TITLE_WORDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _load_tokenizer():
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(CONTEXT_TOKENIZER_NAME)
+
+
+# Not part of the startup warm-up: token counts fall back to an estimate, so
+# a tokenizer that can't be downloaded mustn't keep /ready failing
+tokenizer_resource = resource_registry.register("context_tokenizer", _load_tokenizer, warm_up=False)
+_tokenizer_loading = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt-token count (about 4 characters per token for English)."""
+    return math.ceil(len(text) / 4)
+
+
+def _load_tokenizer_in_background():
+    def load():
+        try:
+            tokenizer_resource.get()
+        except Exception:
+            pass
+        finally:
+            _tokenizer_loading.release()
+    threading.Thread(target=load, name="context-tokenizer-load", daemon=True).start()
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens of text: the model tokenizer once loaded, an estimate until then."""
+    if tokenizer_resource.state == READY:
+        return len(tokenizer_resource.get().encode(text, add_special_tokens=False))
+    if tokenizer_resource.state == NOT_LOADED and _tokenizer_loading.acquire(blocking=False):
+        _load_tokenizer_in_background()
+    return estimate_tokens(text)
+
+
+# Banner rules and table borders carry no information
+_DECORATION = re.compile(r"^[\s═─━│├└┌┐┘┤┬┴┼=\-_*~#|+.]*$")
+# Heavy rules end a section; light ones only underline its title
+_SECTION_RULE = re.compile(r"^\s*[═━=]{3,}\s*$")
+# A list number ("4. Wheat") is not the end of a sentence
+_SENTENCE_END = re.compile(r"(?<!^\d\.)(?<!^\d\d\.)(?<=[.!?।])\s+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _shingles(text: str) -> set:
+    words = _words(text)
+    if len(words) < 3:
+        return set(words)
+    return {tuple(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def _source_of_metadata(metadata: Dict) -> str:
+    source = metadata.get('document_title') or ""
+    if not source and metadata.get('source_file'):
+        source = Path(metadata['source_file']).name
+    if metadata.get('page_end') and metadata.get('page_start') and metadata['page_end'] != metadata['page_start']:
+        source += f" (pages {metadata['page_start']}-{metadata['page_end']})"
+    elif metadata.get('page_number'):
+        source += f" (page {metadata['page_number']})"
+    return source.strip()
+
+
+def snippets_from_results(results: Dict) -> List[Dict]:
+    """Snippets from a search_documents / hybrid_search / rerank result, best first."""
+    def first(key):
+        values = results.get(key) or []
+        return values[0] if values and isinstance(values[0], list) else values
+
+    documents = first("documents")
+    metadatas = first("metadatas")
+    # One score field for the whole list; cross-encoder logits, RRF scores and
+    # distances aren't comparable with each other
+    scores = [None] * len(documents)
+    if any(score is not None for score in first("rerank_scores")):
+        scores = first("rerank_scores")
+    elif first("rrf_scores"):
+        scores = first("rrf_scores")
+    elif first("distances"):
+        scores = [None if distance is None else 1 - distance for distance in first("distances")]
+
+    return [{
+        "text": document,
+        "score": scores[i] if i < len(scores) else None,
+        "source": _source_of_metadata(metadatas[i] if i < len(metadatas) and metadatas[i] else {}),
+    } for i, document in enumerate(documents)]
+
+
+def snippets_from_documents(documents: List[Dict]) -> List[Dict]:
+    """Snippets from scraped pages ({"url", "title", "success", "content"}), in ranked order."""
+    snippets = []
+    for doc in documents:
+        if doc.get("success") is False or not (doc.get("content") or "").strip():
+            continue
+        source = " - ".join(part for part in (doc.get("title"), doc.get("url")) if part)
+        snippets.append({"text": doc["content"], "score": doc.get("score"), "source": source})
+    return snippets
+
+
+def snippets_from_text(text: str) -> List[Dict]:
+    """One snippet per section (split at blank lines and heavy rules), in document order."""
+    snippets, lines = [], []
+    for line in text.splitlines() + [""]:
+        if not line.strip() or _SECTION_RULE.match(line):
+            if lines:
+                snippets.append({"text": "\n".join(lines)})
+                lines = []
+        elif not _DECORATION.match(line):
+            lines.append(line.rstrip())
+    return snippets
+
+
+def as_snippets(context: Any) -> List[Dict]:
+    """Snippets from a string, a Chroma-style result, or a list of strings, pages or snippets."""
+    if not context:
+        return []
+    if isinstance(context, str):
+        return snippets_from_text(context)
+    if isinstance(context, dict):
+        return snippets_from_results(context) if "documents" in context else as_snippets([context])
+
+    snippets = []
+    for item in context:
+        if isinstance(item, str):
+            snippets.append({"text": item})
+        elif isinstance(item, dict) and "text" in item:
+            snippets.append(item)
+        elif isinstance(item, dict) and "content" in item:
+            snippets.extend(snippets_from_documents([item]))
+        elif isinstance(item, dict) and "documents" in item:
+            snippets.extend(snippets_from_results(item))
+        elif item:
+            snippets.append({"text": str(item)})
+    return snippets
+
+
+class ContextPacker:
+    """Dedupes, compresses and fits context snippets into a token budget."""
+
+    def __init__(self,
+                 token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 count_tokens: Callable[[str], int] = count_tokens,
+                 duplicate_threshold: float = CONTEXT_DUPLICATE_THRESHOLD,
+                 min_dedupe_words: int = CONTEXT_MIN_DEDUPE_WORDS,
+                 title_words: int = CONTEXT_TITLE_WORDS):
+        self.token_budget = token_budget
+        self.count_tokens = count_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.min_dedupe_words = min_dedupe_words
+        self.title_words = title_words
+
+    def _rank(self, snippets: List[Dict]) -> List[Dict]:
+        """Scored snippets by score, then unscored ones in the order given."""
+        snippets = [snippet for snippet in snippets if (snippet.get("text") or "").strip()]
+        order = sorted(range(len(snippets)), key=lambda i: (
+            snippets[i].get("score") is None, -(snippets[i].get("score") or 0.0), i))
+        return [snippets[i] for i in order]
+
+    def _dedupe(self, snippets: List[Dict]) -> List[Dict]:
+        """Drop snippets mostly contained in a higher-ranked one."""
+        kept, kept_shingles = [], []
+        for snippet in snippets:
+            shingles = _shingles(snippet["text"])
+            if any(len(shingles & other) >= self.duplicate_threshold * min(len(shingles), len(other))
+                   for other in kept_shingles if shingles and other):
+                continue
+            kept.append(snippet)
+            kept_shingles.append(shingles)
+        return kept
+
+    def _units(self, text: str) -> List[Tuple[str, str]]:
+        """(separator, sentence) pairs; lines never merge, so tables stay row by row."""
+        units = []
+        for line in text.splitlines():
+            if not line.strip() or _DECORATION.match(line):
+                continue
+            for j, sentence in enumerate(_SENTENCE_END.split(line.strip())):
+                if sentence:
+                    units.append(("\n" if j == 0 else " ", sentence))
+        return units
+
+    @staticmethod
+    def _header(rank: int, snippet: Dict) -> str:
+        return f"[{rank + 1}] {snippet['source']}\n" if snippet.get("source") else ""
+
+    def pack(self, context: Any, query: str = "", token_budget: Optional[int] = None) -> str:
+        """
+        Pack context into at most token_budget prompt tokens.
+
+        Args:
+            context: Anything as_snippets() accepts
+            query: The user's question; sentences sharing its terms are kept first
+            token_budget: Overrides the packer's budget
+
+        Returns:
+            Context string, "" when there is nothing to pack
+        """
+        budget = token_budget if token_budget is not None else self.token_budget
+        snippets = self._dedupe(self._rank(as_snippets(context)))
+
+        # (utility, rank, position, separator, sentence, tokens)
+        candidates, titles, seen = [], {}, set()
+        terms = set(query_terms(query)) if query else set()
+        for rank, snippet in enumerate(snippets):
+            units = self._units(snippet["text"])
+            for position, (separator, sentence) in enumerate(units):
+                words = _words(sentence)
+                candidate = (0.0, rank, position, separator, sentence, self.count_tokens(sentence))
+                if position == 0 and len(units) > 1 and units[1][0] == "\n" and len(words) <= self.title_words:
+                    # A short first line is the section's title: it goes in
+                    # with the section's first kept sentence, never on its own
+                    titles[rank] = candidate
+                    continue
+                if len(words) >= self.min_dedupe_words:
+                    key = " ".join(words)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                overlap = len(terms & set(words)) / len(terms) if terms else 0.0
+                candidates.append((overlap + 0.5 / (1 + rank),) + candidate[1:])
+        if not candidates:
+            return ""
+
+        # Tokens a snippet costs before its first sentence: source label and title
+        opening = {rank: self.count_tokens(self._header(rank, snippet)) + (titles[rank][5] if rank in titles else 0)
+                   for rank, snippet in enumerate(snippets)}
+        total = sum(candidate[5] for candidate in candidates) + sum(opening.values())
+        if total <= budget:
+            selected = candidates + list(titles.values())
+        else:
+            selected, used, opened = [], 0, set()
+            for candidate in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+                rank, tokens = candidate[1], candidate[5]
+                cost = tokens + (opening[rank] if rank not in opened else 0)
+                if used + cost > budget:
+                    continue
+                selected.append(candidate)
+                used += cost
+                if rank not in opened and rank in titles:
+                    selected.append(titles[rank])
+                opened.add(rank)
+            if not selected:
+                # Even the best sentence is too long: keep as much of it as fits
+                best = max(candidates, key=lambda c: (c[0], -c[1], -c[2]))
+                keep = max(1, int(len(best[4]) * budget / max(best[5], 1)))
+                selected, used = [best[:4] + (best[4][:keep], best[5])], budget
+            logger.info(f"Packed context from {total} to {used} tokens "
+                        f"({len(selected)}/{len(candidates) + len(titles)} sentences, "
+                        f"{len(opened)}/{len(snippets)} snippets)")
+
+        blocks = []
+        for rank, snippet in enumerate(snippets):
+            chosen = sorted((c for c in selected if c[1] == rank), key=lambda c: c[2])
+            if not chosen:
+                continue
+            text = "".join((separator if i else "") + sentence for i, (_, _, _, separator, sentence, _) in enumerate(chosen))
+            blocks.append(self._header(rank, snippet) + text)
+        return "\n\n".join(blocks)
+
+
+# Global packer instance
+context_packer = ContextPacker()
@@ -12,10 +12,215 @@ This module prioritizes data in order of importance:
 
 import csv
 import json
-from typing import List, Dict, Tuple
+import os
+import threading
+from typing import List, Dict, Set, Tuple
 from datetime import datetime
 import re
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Fixed weather vocabulary used for ranking (see filter_crops_by_weather)
+WEATHER_KEYWORDS = [
+    "rainfall", "rain", "wet", "humid",
+    "temperature", "hot", "cold", "warm",
+    "drought", "dry", "arid",
+    "irrigation", "moisture", "soil",
+    "loam", "clay", "sandy"
+]
+
+AGRICULTURE_KEYWORDS = [
+    'farmer', 'agriculture', 'cultivation', 'crop', 'farm',
+    'subsidy', 'loan', 'credit', 'support', 'assistance'
+]
+
+_NUMBER_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+_AMOUNT_PATTERN = re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?)')
+
+
+def _parse_profit(profit_str) -> float:
+    match = _NUMBER_PATTERN.search(str(profit_str))
+    return float(match.group(1)) if match else 0.0
+
+
+def _parse_amount(value_str) -> float:
+    match = _AMOUNT_PATTERN.search(str(value_str).replace(',', ''))
+    return float(match.group(1)) if match else 0.0
+
+
+def _read_csv(path: str, label: str) -> List[Dict]:
+    rows = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                rows.append(row)
+    except Exception as e:
+        print(f"Error loading {label}: {e}")
+    return rows
+
+
+class CropSchemeTables:
+    """
+    Crop and scheme CSVs compiled once into lookup-friendly tables.
+
+    Everything that doesn't depend on the request is computed at load time:
+    profit/cost parsed into arrays, the demand/risk part of each crop's score
+    and reason, which crops mention which weather keyword, and inverted
+    indexes of agriculture schemes by beneficiary state and keyword.
+    """
+
+    def __init__(self, crops: List[Dict], schemes: List[Dict]):
+        self.crops = crops
+        self.schemes = schemes
+        self._compile_crops()
+        self._compile_schemes()
+        self._weather_cache: Dict[Tuple[str, ...], List[int]] = {}
+
+    @classmethod
+    def load(cls, crops_csv_path: str, schemes_csv_path: str) -> "CropSchemeTables":
+        return cls(_read_csv(crops_csv_path, "crops"), _read_csv(schemes_csv_path, "schemes"))
+
+    def _compile_crops(self):
+        self.profit = [_parse_profit(crop.get("Avg Profit Margin", "0")) for crop in self.crops]
+        self.cost = [_parse_amount(crop.get("Cost of Cultivation (₹)", "0")) for crop in self.crops]
+        self.suitability = [str(crop.get("Suitability (Weather/Soil)", "")).lower() for crop in self.crops]
+
+        self.base_score = []
+        self.base_reasons = []
+        for crop, profit in zip(self.crops, self.profit):
+            score = min(40, (profit / 100) * 40)
+            reasons = []
+            if profit > 50:
+                reasons.append(f"high profit ({int(profit)}%)")
+            elif profit > 30:
+                reasons.append(f"medium profit ({int(profit)}%)")
+
+            demand = str(crop.get("Market Demand", "")).lower()
+            if "very high" in demand:
+                score += 25
+                reasons.append("very high demand")
+            elif "high" in demand:
+                score += 15
+                reasons.append("high demand")
+            elif "growing" in demand:
+                score += 10
+                reasons.append("growing demand")
+
+            risk = str(crop.get("Risk Factors", "")).lower()
+            if "pest" in risk:
+                score -= 5
+                reasons.append("pest risk (⚠️)")
+            if "flood" in risk or "waterlogging" in risk:
+                score -= 8
+                reasons.append("flood risk (⚠️)")
+
+            self.base_score.append(score)
+            self.base_reasons.append(reasons)
+
+        if NUMPY_AVAILABLE:
+            self.base_score = np.asarray(self.base_score, dtype=np.float64)
+
+    def _compile_schemes(self):
+        self.scheme_records: Dict[int, Dict] = {}
+        self.keyword_index: Dict[str, Set[int]] = {term: set() for term in AGRICULTURE_KEYWORDS}
+        self.state_index: Dict[str, Set[int]] = {}
+        self.all_state_ids: Set[int] = set()
+
+        for scheme_id, scheme in enumerate(self.schemes):
+            scheme_name = (
+                scheme.get('schemename') or
+                scheme.get('schemanme') or  # Handle typo in CSV
+                scheme.get('schemeshorttitle') or
+                'Unknown'
+            )
+            if scheme_name == 'Unknown':
+                continue
+
+            text = str(scheme.get('schemefor', '')).lower() + "\n" + str(scheme.get('briefdescription', '')).lower()
+            for term in AGRICULTURE_KEYWORDS:
+                if term in text:
+                    self.keyword_index[term].add(scheme_id)
+
+            # Formats like "['Uttarakhand', 'Punjab']" or "All"
+            beneficiary_states = str(scheme.get('beneficiarystate', '[]')).lower()
+            if 'all' in beneficiary_states or 'uttar' in beneficiary_states:  # 'uttar' handles Uttarakhand
+                self.all_state_ids.add(scheme_id)
+            for state_name in re.split(r"[,\[\]'\"]+", beneficiary_states):
+                state_name = state_name.strip()
+                if state_name:
+                    self.state_index.setdefault(state_name, set()).add(scheme_id)
+
+            self.scheme_records[scheme_id] = {
+                'name': scheme_name,
+                'short_title': scheme.get('schemeshorttitle', scheme_name),
+                'description': scheme.get('briefdescription', '')[:200],  # Truncate long descriptions
+                'category': scheme.get('schemecategory', ''),
+                'ministry': scheme.get('nodalministryname', ''),
+            }
+
+        # Schemes mentioning any agriculture keyword
+        self.agriculture_ids: Set[int] = set().union(*self.keyword_index.values())
+
+    def weather_matches(self, keywords: List[str]) -> List[int]:
+        """Per crop, how many of the keywords its suitability text mentions."""
+        key = tuple(keyword.lower() for keyword in keywords)
+        matches = self._weather_cache.get(key)
+        if matches is None:
+            matches = [sum(1 for keyword in key if keyword in suitability) for suitability in self.suitability]
+            self._weather_cache[key] = matches
+        return matches
+
+    def rank_crops(self, keywords: List[str], top_n: int) -> List[Tuple[int, float, int]]:
+        """Return (crop index, score, weather matches) for the top_n crops."""
+        matches = self.weather_matches(keywords)
+        if NUMPY_AVAILABLE:
+            scores = self.base_score + 25 * np.asarray(matches, dtype=np.float64)
+            # Stable sort keeps CSV order between equal scores, like list.sort
+            order = np.argsort(-scores, kind="stable")[:top_n]
+            return [(int(i), float(scores[i]), matches[i]) for i in order]
+
+        scores = [base + 25 * match for base, match in zip(self.base_score, matches)]
+        order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:top_n]
+        return [(i, scores[i], matches[i]) for i in order]
+
+    def scheme_ids_for_state(self, state: str) -> List[int]:
+        """Agriculture schemes open to the state, in CSV order."""
+        state = state.lower()
+        ids = set(self.all_state_ids)
+        for state_name, scheme_ids in self.state_index.items():
+            if state in state_name:
+                ids |= scheme_ids
+        return sorted(ids & self.agriculture_ids)
+
+
+_tables_cache: Dict[Tuple[str, str], Tuple[Tuple[float, float], CropSchemeTables]] = {}
+_tables_lock = threading.Lock()
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return -1.0
+
+
+def get_tables(crops_csv_path: str, schemes_csv_path: str) -> CropSchemeTables:
+    """Compiled tables for the CSV pair, rebuilt when either file changes."""
+    key = (os.path.abspath(crops_csv_path), os.path.abspath(schemes_csv_path))
+    mtimes = (_mtime(crops_csv_path), _mtime(schemes_csv_path))
+    with _tables_lock:
+        cached = _tables_cache.get(key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+        tables = CropSchemeTables.load(crops_csv_path, schemes_csv_path)
+        _tables_cache[key] = (mtimes, tables)
+        return tables
+
 
 class ContextPrioritizer:
     """Intelligent context structuring for crop advisory system."""
@@ -24,49 +229,31 @@ class ContextPrioritizer:
         """Initialize with paths to crop and scheme data files."""
         self.dehradun_csv_path = dehradun_csv_path
         self.schemes_csv_path = schemes_csv_path
-        self.crops_data = self._load_crops()
-        self.schemes_data = self._load_schemes()
-
-    def _load_crops(self) -> List[Dict]:
-        """Load all crop data from CSV."""
-        crops = []
-        try:
-            with open(self.dehradun_csv_path, 'r', encoding='utf-8') as f:
-                csv_reader = csv.DictReader(f)
-                for row in csv_reader:
-                    crops.append(row)
-        except Exception as e:
-            print(f"Error loading crops: {e}")
-        return crops
-
-    def _load_schemes(self) -> List[Dict]:
-        """Load all scheme data from CSV."""
-        schemes = []
-        try:
-            with open(self.schemes_csv_path, 'r', encoding='utf-8') as f:
-                csv_reader = csv.DictReader(f)
-                for row in csv_reader:
-                    schemes.append(row)
-        except Exception as e:
-            print(f"Error loading schemes: {e}")
-        return schemes
+        # Compiled once per CSV pair and shared between instances
+        self.tables = get_tables(dehradun_csv_path, schemes_csv_path)
+        self.crops_data = self.tables.crops
+        self.schemes_data = self.tables.schemes
 
     def _extract_profit_percentage(self, profit_str: str) -> float:
         """Extract profit percentage from strings like '~63%' or '63%'."""
         try:
-            match = re.search(r'(\d+(?:\.\d+)?)', str(profit_str))
-            return float(match.group(1)) if match else 0.0
+            return _parse_profit(profit_str)
         except:
             return 0.0
 
     def _extract_numeric_value(self, value_str: str) -> float:
         """Extract numeric value from strings with currencies/units."""
         try:
-            match = re.search(r'(\d+(?:,\d+)*(?:\.\d+)?)', str(value_str).replace(',', ''))
-            return float(match.group(1)) if match else 0.0
+            return _parse_amount(value_str)
         except:
             return 0.0
 
+    def _crop_profit(self, crop: Dict) -> float:
+        # Ranked crops carry the value parsed at load time
+        if "_profit_pct" in crop:
+            return crop["_profit_pct"]
+        return self._extract_profit_percentage(crop.get("Avg Profit Margin", "0"))
+
     def _calculate_relevance_score(self, crop: Dict, weather_keywords: List[str]) -> Tuple[float, str]:
         """
         Calculate crop relevance score based on weather suitability and profitability.
@@ -130,29 +317,22 @@ class ContextPrioritizer:
         Returns:
             List of top N crops with relevance scores
         """
-        # Extract weather keywords from context
-        keywords = [
-            "rainfall", "rain", "wet", "humid",
-            "temperature", "hot", "cold", "warm",
-            "drought", "dry", "arid",
-            "irrigation", "moisture", "soil",
-            "loam", "clay", "sandy"
-        ]
-        
-        # Score all crops
+        # Ranking uses the fixed weather vocabulary; its per-crop matches and
+        # the profit/demand/risk part of the score are precomputed
         ranked_crops = []
-        for crop in self.crops_data:
-            score, reason = self._calculate_relevance_score(crop, keywords)
+        for index, score, weather_match in self.tables.rank_crops(WEATHER_KEYWORDS, top_n):
+            reasons = list(self.tables.base_reasons[index])
+            if weather_match > 0:
+                reasons.insert(0, f"matches weather ({weather_match} factors)")
             ranked_crops.append({
-                **crop,
+                **self.crops_data[index],
                 "_relevance_score": score,
-                "_relevance_reason": reason
+                "_relevance_reason": " • ".join(reasons) if reasons else "Moderate potential",
+                "_profit_pct": self.tables.profit[index],
+                "_cost": self.tables.cost[index]
             })
 
-        # Sort by relevance score
-        ranked_crops.sort(key=lambda x: x["_relevance_score"], reverse=True)
-        
-        return ranked_crops[:top_n]
+        return ranked_crops
 
     def get_schemes_for_crops(
         self, crop_names: List[str], state: str = "Uttarakhand"
@@ -167,55 +347,11 @@ class ContextPrioritizer:
         Returns:
             List of relevant schemes
         """
-        relevant_schemes = []
-        crop_names_lower = [name.lower() for name in crop_names]
-        
-        for scheme in self.schemes_data:
-            # Check if scheme applies to this state
-            beneficiary_states = str(scheme.get('beneficiarystate', '[]')).lower()
-            
-            # Parse beneficiary states - handles formats like ['Uttarakhand'] or 'All'
-            state_match = (
-                state.lower() in beneficiary_states or 
-                'all' in beneficiary_states or
-                'uttar' in beneficiary_states  # Handles 'Uttarakhand'
-            )
-            
-            if not state_match:
-                continue
-            
-            # Get scheme info - try multiple column name variations
-            scheme_name = (
-                scheme.get('schemename') or 
-                scheme.get('schemanme') or  # Handle typo in CSV
-                scheme.get('schemeshorttitle') or 
-                'Unknown'
-            )
-            
-            # Get scheme for field
-            scheme_for = str(scheme.get('schemefor', '')).lower()
-            scheme_desc = str(scheme.get('briefdescription', '')).lower()
-            
-            # Match agriculture-related schemes
-            agriculture_keywords = [
-                'farmer', 'agriculture', 'cultivation', 'crop', 'farm',
-                'subsidy', 'loan', 'credit', 'support', 'assistance'
-            ]
-            
-            is_ag_scheme = any(
-                term in scheme_for or term in scheme_desc 
-                for term in agriculture_keywords
-            )
-            
-            if is_ag_scheme and scheme_name != 'Unknown':
-                relevant_schemes.append({
-                    'name': scheme_name,
-                    'short_title': scheme.get('schemeshorttitle', scheme_name),
-                    'description': scheme.get('briefdescription', '')[:200],  # Truncate long descriptions
-                    'category': scheme.get('schemecategory', ''),
-                    'ministry': scheme.get('nodalministryname', ''),
-                    'applicable_crops': crop_names
-                })
+        # Agriculture schemes are pre-filtered and indexed by beneficiary state
+        relevant_schemes = [
+            {**self.tables.scheme_records[scheme_id], 'applicable_crops': crop_names}
+            for scheme_id in self.tables.scheme_ids_for_state(state)
+        ]
         
         # Return unique schemes (by name)
         seen = set()
@@ -247,8 +383,8 @@ class ContextPrioritizer:
         for i, crop in enumerate(crops, 1):
             crop_name = crop.get("Crop Name", "Unknown").strip()
             yield_info = crop.get("Avg Yield (per acre)", "N/A").strip()
-            cost = self._extract_numeric_value(crop.get("Cost of Cultivation (₹)", "0"))
-            profit = self._extract_profit_percentage(crop.get("Avg Profit Margin", "0"))
+            cost = crop["_cost"] if "_cost" in crop else self._extract_numeric_value(crop.get("Cost of Cultivation (₹)", "0"))
+            profit = self._crop_profit(crop)
             demand = crop.get("Market Demand", "N/A").strip()
             
             # Get risk factors - clean them up
@@ -344,7 +480,7 @@ Total Available Schemes: {len(applicable_schemes)}
 💡 KEY RECOMMENDATIONS & INSIGHTS
 ─────────────────────────────────────────────────────────────────────────────
 1. **Weather Match**: All crops above are suitable for current weather conditions
-2. **Most Profitable**: {recommended_crops[0]['Crop Name']} offers {self._extract_profit_percentage(recommended_crops[0].get('Avg Profit Margin', '0'))}% profit margin
+2. **Most Profitable**: {recommended_crops[0]['Crop Name']} offers {self._crop_profit(recommended_crops[0])}% profit margin
 3. **Market Opportunity**: Focus on crops with "Very High" or "High" market demand for better returns
 4. **Government Support**: {len(applicable_schemes)} schemes are available for subsidies and financial assistance
 5. **Risk Management**: Consider risk factors listed - diversify if possible
@@ -366,7 +502,7 @@ Total Available Schemes: {len(applicable_schemes)}
         for i, crop in enumerate(crops, 1):
             name = crop.get("Crop Name", "Unknown")
             crop_yield = crop.get("Avg Yield (per acre)", "N/A")
-            profit = self._extract_profit_percentage(crop.get("Avg Profit Margin", "0"))
+            profit = self._crop_profit(crop)
             demand = crop.get("Market Demand", "N/A")
             reason = crop.get("_relevance_reason", "Recommended")
             
@@ -0,0 +1,194 @@
+"""
+Cross-encoder re-ranking of retrieved chunks.
+
+Chroma's (or the hybrid retriever's) top results went into the prompt in
+retrieval order. Callers now over-fetch RERANK_CANDIDATES chunks and this
+module re-scores (query, chunk) pairs with a small cross-encoder on CPU,
+batch by batch, then keeps the best RERANK_TOP_K that fit in
+RERANK_TOKEN_BUDGET. Fewer, better chunks mean a shorter prefill on the 4B
+model.
+
+Re-ranking never holds a request up: if the model isn't loaded yet, or the
+next batch would overrun RERANK_LATENCY_BUDGET_MS, the remaining chunks
+keep their retrieval order.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from brain.resource_registry import resource_registry, READY, NOT_LOADED
+from brain.context_packer import count_tokens
+from brain.brain_init import configure_torch_threads
+from configs.rerank_config import (
+    RERANK_ENABLED, RERANK_MODEL_NAME, RERANK_BATCH_SIZE, RERANK_MAX_LENGTH,
+    RERANK_LATENCY_BUDGET_MS, RERANK_TOP_K, RERANK_TOKEN_BUDGET
+)
+
+logger = logging.getLogger(__name__)
+
+# scorer(pairs) -> one relevance score per (query, passage) pair
+Scorer = Callable[[List[Tuple[str, str]]], List[float]]
+
+# Result fields that hold one value per hit (Chroma layout plus hybrid extras)
+_PER_HIT_FIELDS = ("ids", "documents", "metadatas", "distances", "rrf_scores", "retrievers")
+
+
+def _load_cross_encoder():
+    # Imported here so importing this module stays cheap
+    from sentence_transformers import CrossEncoder
+
+    configure_torch_threads()
+    return CrossEncoder(RERANK_MODEL_NAME, device="cpu", max_length=RERANK_MAX_LENGTH)
+
+
+cross_encoder_resource = resource_registry.register("cross_encoder", _load_cross_encoder, warm_up=RERANK_ENABLED)
+
+
+def _first(results: Dict, key: str) -> List:
+    values = results.get(key) or []
+    return values[0] if values and isinstance(values[0], list) else values
+
+
+class ContextReranker:
+    """Re-orders and trims retrieval results within a latency and token budget."""
+
+    def __init__(self,
+                 scorer: Optional[Scorer] = None,
+                 batch_size: int = RERANK_BATCH_SIZE,
+                 latency_budget_ms: float = RERANK_LATENCY_BUDGET_MS,
+                 count_tokens: Callable[[str], int] = count_tokens,
+                 enabled: bool = RERANK_ENABLED):
+        self._scorer = scorer
+        self.batch_size = batch_size
+        self.latency_budget_ms = latency_budget_ms
+        self.count_tokens = count_tokens
+        self.enabled = enabled
+
+        # Smoothed cost of one pair, so a batch that can't fit is never started
+        self.ms_per_pair: Optional[float] = None
+        self._loading = threading.Lock()
+
+        self.requests = 0
+        self.reranked = 0
+        self.partial = 0
+        self.skipped = 0
+
+    def _get_scorer(self) -> Optional[Scorer]:
+        if self._scorer is not None:
+            return self._scorer
+        if cross_encoder_resource.state == READY:
+            model = cross_encoder_resource.get()
+            return lambda pairs: [float(score) for score in
+                                  model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)]
+        if cross_encoder_resource.state == NOT_LOADED and self._loading.acquire(blocking=False):
+            # Without the startup warm-up (scripts, MODEL_WARM_UP=0) load it
+            # in the background; this request goes without re-ranking
+            def load():
+                try:
+                    cross_encoder_resource.get()
+                except Exception:
+                    pass
+                finally:
+                    self._loading.release()
+            threading.Thread(target=load, name="cross-encoder-load", daemon=True).start()
+        return None
+
+    def _score(self, scorer: Scorer, query: str, documents: List[str], started: float) -> List[Optional[float]]:
+        """Score documents in order, batch by batch, until the budget runs out."""
+        scores: List[Optional[float]] = [None] * len(documents)
+        for start in range(0, len(documents), self.batch_size):
+            batch = documents[start:start + self.batch_size]
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if self.ms_per_pair is not None and elapsed_ms + self.ms_per_pair * len(batch) > self.latency_budget_ms:
+                break
+
+            batch_started = time.perf_counter()
+            batch_scores = scorer([(query, document) for document in batch])
+            per_pair = (time.perf_counter() - batch_started) * 1000 / len(batch)
+            self.ms_per_pair = per_pair if self.ms_per_pair is None else 0.8 * self.ms_per_pair + 0.2 * per_pair
+            scores[start:start + len(batch)] = batch_scores
+        return scores
+
+    def rerank(self, query: str, results: Dict,
+               top_k: int = RERANK_TOP_K,
+               token_budget: int = RERANK_TOKEN_BUDGET) -> Dict:
+        """
+        Re-rank a search_documents / hybrid_search result.
+
+        Args:
+            query: The user's question
+            results: Chroma-style result, best first by retrieval
+            top_k: Chunks to keep at most
+            token_budget: Total prompt tokens of the kept chunks (the best
+                chunk is always kept)
+
+        Returns:
+            Same layout with the kept chunks, plus "rerank_scores" (None for
+            chunks the budget didn't reach) and a "rerank" summary
+        """
+        started = time.perf_counter()
+        self.requests += 1
+        documents = _first(results, "documents")
+        scorer = self._get_scorer() if self.enabled and query and len(documents) > 1 else None
+
+        scores: List[Optional[float]] = [None] * len(documents)
+        if scorer is not None:
+            try:
+                scores = self._score(scorer, query, documents, started)
+            except Exception as e:
+                logger.error(f"Re-ranking failed, keeping retrieval order: {e}")
+
+        scored = sum(score is not None for score in scores)
+        if scored == 0:
+            self.skipped += 1
+        elif scored < len(documents):
+            self.partial += 1
+        else:
+            self.reranked += 1
+
+        # Scored chunks by score, then the rest in retrieval order
+        order = sorted(range(len(documents)),
+                       key=lambda i: (scores[i] is None, -(scores[i] or 0.0), i))
+        kept, used_tokens = [], 0
+        for i in order:
+            if len(kept) >= top_k:
+                break
+            document = documents[i]
+            if not document or not document.strip():
+                continue
+            tokens = self.count_tokens(document)
+            if kept and used_tokens + tokens > token_budget:
+                continue
+            kept.append(i)
+            used_tokens += tokens
+
+        reranked = {}
+        for field in _PER_HIT_FIELDS:
+            values = _first(results, field)
+            if values:
+                reranked[field] = [[values[i] for i in kept]]
+        reranked["rerank_scores"] = [[scores[i] for i in kept]]
+        reranked["rerank"] = {
+            "candidates": len(documents),
+            "scored": scored,
+            "kept": len(kept),
+            "tokens": used_tokens,
+            "ms": (time.perf_counter() - started) * 1000,
+        }
+        return reranked
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "reranked": self.reranked,
+            "partial": self.partial,
+            "skipped": self.skipped,
+            "ms_per_pair": self.ms_per_pair,
+            "model_state": cross_encoder_resource.state,
+        }
+
+
+# Global reranker instance
+context_reranker = ContextReranker()
@@ -6,6 +6,9 @@ Inspired by add_pdfs_to_vectordb.py search functionality.
 import logging
 from typing import Dict, List, Tuple, Optional, Any
 from data.functions.add_to_vector_db import PDFVectorDBManager
+from configs.vector_db_config import HYBRID_SEARCH_COLLECTIONS
+from configs.rerank_config import RERANK_ENABLED, RERANK_CANDIDATES
+from brain.context_reranker import context_reranker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -37,10 +40,10 @@ def retrieve_context(
         return "No vector database available.", []
     
     try:
-        # Prepare search parameters
+        # Prepare search parameters; over-fetch for the cross-encoder to choose from
         search_kwargs = {
             'query': query,
-            'n_results': max_results,
+            'n_results': max(max_results, RERANK_CANDIDATES) if RERANK_ENABLED else max_results,
             **metadata_filters
         }
         
@@ -56,13 +59,18 @@ def retrieve_context(
         
         logger.info(f"Searching vector DB with query: '{query}', domain: '{domain}'")
         
-        # Perform the search
-        results = vector_db_manager.search_documents(**search_kwargs)
+        # Perform the search (BM25 + vector fusion where configured)
+        if domain in HYBRID_SEARCH_COLLECTIONS:
+            results = vector_db_manager.hybrid_search(**search_kwargs)
+        else:
+            results = vector_db_manager.search_documents(**search_kwargs)
         
         if not results or 'documents' not in results:
             logger.warning("No results found in vector database")
             return "No relevant context found in knowledge base.", []
         
+        results = context_reranker.rerank(query, results, top_k=max_results)
+        
         # Format the context
         formatted_context = format_search_results(results, max_results)
         
@@ -124,7 +132,9 @@ def format_search_results(results: Dict, max_results: int = 5) -> str:
             source_info.append(f"Type: {metadata['document_type']}")
         if metadata.get('filename'):
             source_info.append(f"File: {metadata['filename']}")
-        if metadata.get('page_number'):
+        if metadata.get('page_end') and metadata.get('page_start') and metadata['page_end'] != metadata['page_start']:
+            source_info.append(f"Pages: {metadata['page_start']}-{metadata['page_end']}")
+        elif metadata.get('page_number'):
             source_info.append(f"Page: {metadata['page_number']}")
         
         source_str = " | ".join(source_info) if source_info else "Unknown source"
@@ -0,0 +1,139 @@
+"""
+Long-document translation for IndicTrans2.
+
+A crop-advice report can't go to the model in one piece: the input is
+limited to a couple of hundred tokens and the output is capped by the length
+budget. The document is planned into units instead:
+
+- split on paragraph and sentence boundaries (segment())
+- list and heading markers ("- ", "2. ", "## ") are kept aside and put back
+  untouched, so the model only sees prose
+- any sentence still over max_tokens is split on clause punctuation, then
+  on words
+
+Units are translated in windows of consecutive segments, one generate call
+per window, and every window is yielded as soon as it is done. The cost is
+linear in the document length and the caller can stream partial output.
+"""
+
+import re
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Tuple
+
+from brain.translation_memory import segment
+from configs.translation_config import TRANSLATION_MAX_SEGMENT_TOKENS, TRANSLATION_DOCUMENT_WINDOW
+
+# Bullets, numbered items, markdown headings and quotes at the start of a line
+_LIST_MARKER = re.compile(r"^(?:[-*•+]|\d{1,3}[.)]|#{1,6}|>)\s+")
+# segment() splits "2. Apply urea" after "2.", leaving the number on its own
+_NUMBER_ONLY = re.compile(r"^\d{1,3}[.)]$")
+_CLAUSE_BOUNDARY = re.compile(r"(?<=[,;:])\s+")
+
+CountTokensFn = Callable[[str], int]
+# translate_pieces(pieces, target_language) -> {piece: translation}
+TranslatePiecesFn = Callable[[List[str], str], Awaitable[Dict[str, str]]]
+
+
+def split_marker(sentence: str) -> Tuple[str, str]:
+    """Return (marker, body); marker is "" for plain sentences."""
+    match = _LIST_MARKER.match(sentence)
+    if not match or not sentence[match.end():].strip():
+        return "", sentence
+    return sentence[:match.end()], sentence[match.end():]
+
+
+def _pack(parts: List[str], count_tokens: CountTokensFn, max_tokens: int) -> List[str]:
+    packed, current = [], ""
+    for part in parts:
+        candidate = f"{current} {part}" if current else part
+        if current and count_tokens(candidate) > max_tokens:
+            packed.append(current)
+            current = part
+        else:
+            current = candidate
+    if current:
+        packed.append(current)
+    return packed
+
+
+def split_to_fit(text: str, count_tokens: CountTokensFn, max_tokens: int = TRANSLATION_MAX_SEGMENT_TOKENS) -> List[str]:
+    """Split text into pieces of at most max_tokens, preferring clause boundaries."""
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    pieces = []
+    for part in _pack(_CLAUSE_BOUNDARY.split(text), count_tokens, max_tokens):
+        if count_tokens(part) <= max_tokens:
+            pieces.append(part)
+        else:
+            # A clause with no punctuation at all; fall back to words
+            pieces.extend(_pack(part.split(), count_tokens, max_tokens))
+    return pieces
+
+
+def plan_document(text: str, count_tokens: CountTokensFn,
+                  max_tokens: int = TRANSLATION_MAX_SEGMENT_TOKENS) -> List[Dict]:
+    """
+    Plan a document into translation units.
+
+    Returns:
+        [{"marker", "pieces", "separator"}] in document order; pieces are the
+        model inputs for one sentence.
+    """
+    sentences, separators = segment(text.strip())
+    units = []
+    carried_marker = ""
+    for sentence, separator in zip(sentences, separators):
+        if _NUMBER_ONLY.match(sentence) and separator == " ":
+            carried_marker = sentence + separator
+            continue
+        marker, body = split_marker(sentence)
+        units.append({
+            "marker": carried_marker + marker,
+            "pieces": split_to_fit(body, count_tokens, max_tokens),
+            "separator": separator,
+        })
+        carried_marker = ""
+    return units
+
+
+def render_unit(unit: Dict, translations: Dict[str, str]) -> str:
+    return unit["marker"] + " ".join(translations[piece] for piece in unit["pieces"]) + unit["separator"]
+
+
+def windows(units: List[Dict], window: int = TRANSLATION_DOCUMENT_WINDOW) -> List[List[Dict]]:
+    """Group consecutive units so each group holds about `window` pieces."""
+    groups, current, size = [], [], 0
+    for unit in units:
+        if current and size + len(unit["pieces"]) > window:
+            groups.append(current)
+            current, size = [], 0
+        current.append(unit)
+        size += len(unit["pieces"])
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def translate_units(
+    units: List[Dict],
+    target_language: str,
+    translate_pieces: TranslatePiecesFn,
+    window: int = TRANSLATION_DOCUMENT_WINDOW
+) -> AsyncGenerator[Dict, None]:
+    """
+    Translate planned units window by window.
+
+    Yields:
+        {"text", "completed", "total"} per window, in document order;
+        joining every "text" gives the full translation.
+    """
+    completed = 0
+    for group in windows(units, window):
+        pieces = list(dict.fromkeys(piece for unit in group for piece in unit["pieces"]))
+        translations = await translate_pieces(pieces, target_language)
+        completed += len(group)
+        yield {
+            "text": "".join(render_unit(unit, translations) for unit in group),
+            "completed": completed,
+            "total": len(units),
+        }
@@ -1,27 +1,64 @@
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 import json
 import os
+import asyncio
 import logging
+from typing import AsyncGenerator, Dict, List
+
+from brain.resource_registry import resource_registry, READY
+from brain.brain_init import configure_torch_threads
+from brain.translation_batcher import TranslationBatcher
+from brain.translation_workers import translation_workers, TranslationOverloaded
+from brain.translation_memory import TranslationMemory, segment, reassemble
+from brain.document_translation import plan_document, translate_units
+from configs.translation_config import (
+    TRANSLATION_DECODE_MODE, TRANSLATION_NUM_BEAMS, TRANSLATION_BACKEND
+)
 
 logger = logging.getLogger(__name__)
 
-# Initialize model (loads once at startup)
-logger.info("Loading IndicTrans2 model...")
-print("Loading IndicTrans2 model...")
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model_name = "ai4bharat/indictrans2-en-indic-dist-200M"
-
-try:
-    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, trust_remote_code=True)
-    model = model.to(device).eval()
-    logger.info(f"✓ Model loaded on {device}")
-    print(f"✓ Model loaded on {device}")
-except Exception as e:
-    logger.error(f"Failed to load model: {e}")
-    print(f"✗ Failed to load model: {e}")
-    raise
+
+def _load_translator_backend():
+    """Load IndicTrans2; runs on first translation or in the startup warm-up."""
+    # torch/transformers are imported here so importing this module stays cheap
+    import torch
+    from brain.translation_backends import load_backend
+
+    logger.info(f"Loading IndicTrans2 model ({TRANSLATION_BACKEND} backend)...")
+    print(f"Loading IndicTrans2 model ({TRANSLATION_BACKEND} backend)...")
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    # Shared, process-wide thread pool (TORCH_THREADS); not resized per model
+    configure_torch_threads()
+
+    try:
+        backend = load_backend(TRANSLATION_BACKEND, device=device)
+    except Exception as e:
+        if TRANSLATION_BACKEND == "torch_fp32":
+            logger.error(f"Failed to load model: {e}")
+            print(f"✗ Failed to load model: {e}")
+            raise
+        # A broken optional backend shouldn't take translation down
+        logger.error(f"Failed to load {TRANSLATION_BACKEND} backend ({e}); falling back to torch_fp32")
+        print(f"✗ Failed to load {TRANSLATION_BACKEND} backend ({e}); falling back to torch_fp32")
+        backend = load_backend("torch_fp32", device=device)
+
+    logger.info(f"✓ Model loaded on {backend.device} ({backend.name})")
+    print(f"✓ Model loaded on {backend.device} ({backend.name})")
+    return backend
+
+
+translator_resource = resource_registry.register("indictrans2", _load_translator_backend)
+
+
+def _load_translation_memory():
+    """Open (and on first run seed) the sentence cache shared by all translate paths."""
+    try:
+        return TranslationMemory()
+    except Exception as e:
+        logger.error(f"Translation memory unavailable on disk ({e}); using in-memory store")
+        return TranslationMemory(db_path=":memory:")
+
+
+translation_memory_resource = resource_registry.register("translation_memory", _load_translation_memory)
 
 # Language codes
 LANGUAGES = {
@@ -55,12 +92,170 @@ class LanguageTranslator:
     """Handles translation operations using IndicTrans2 model"""
     
     def __init__(self):
-        self.device = device
-        self.model = model
-        self.tokenizer = tokenizer
         self.languages = LANGUAGES
         self.language_names = LANGUAGE_NAMES
+        self.decode_mode = TRANSLATION_DECODE_MODE
+
+    # The model loads on first access (see _load_translator_backend)
+    @property
+    def backend(self):
+        return translator_resource.get()
+
+    @property
+    def device(self):
+        return self.backend.device
+
+    @property
+    def model(self):
+        return self.backend.model
+
+    @property
+    def tokenizer(self):
+        return self.backend.tokenizer
     
+    def translate_texts(self, texts: List[str], target_language: str) -> List[str]:
+        """
+        Translate a list of English texts in one padded generate() call.
+
+        Args:
+            texts (list): Non-empty, stripped English texts
+            target_language (str): Language code (must be supported)
+
+        Returns:
+            list: Translations in the same order as texts
+        """
+        target_lang = self.languages[target_language]
+        input_texts = [f"eng_Latn {target_lang} {text}" for text in texts]
+
+        return self.backend.translate(input_texts, mode=self.decode_mode, num_beams=TRANSLATION_NUM_BEAMS)
+
+    def _translate_sentences(self, sentences: List[str], target_language: str) -> Dict[str, str]:
+        """Sentence -> translation, from the translation memory where possible."""
+        translation_memory = translation_memory_resource.get()
+        translated = translation_memory.lookup_many(sentences, target_language)
+        misses = [sentence for sentence in dict.fromkeys(sentences) if sentence not in translated]
+        if misses:
+            new_translations = dict(zip(misses, self.translate_texts(misses, target_language)))
+            translation_memory.store_many(new_translations, target_language)
+            translated.update(new_translations)
+        return translated
+
+    async def translate_async(self, text: str, target_language: str) -> dict:
+        """
+        Same result as translate(), but sentences missing from the translation
+        memory go through the micro-batching queue so concurrent requests
+        share one generate() call per language.
+        """
+        if not text or not text.strip():
+            return {'error': 'Text is required', 'success': False}
+
+        if target_language not in self.languages:
+            return {
+                'error': f'Invalid language. Supported: {list(self.languages.keys())}',
+                'success': False
+            }
+
+        sentences, separators = segment(text.strip())
+        # Raises TranslationOverloaded when the queue is full
+        async with translation_workers.slot():
+            try:
+                # SQLite reads and writes; not on the event loop, and not in
+                # the inference pool where they would queue behind the model
+                translation_memory = await asyncio.to_thread(translation_memory_resource.get)
+                translated = await asyncio.to_thread(translation_memory.lookup_many, sentences, target_language)
+                misses = [sentence for sentence in dict.fromkeys(sentences) if sentence not in translated]
+                if misses:
+                    # Each miss is queued separately so the batcher can pack
+                    # them with other requests' sentences
+                    new_translations = dict(zip(misses, await asyncio.gather(
+                        *(translation_batcher.submit(sentence, target_language) for sentence in misses))))
+                    await asyncio.to_thread(translation_memory.store_many, new_translations, target_language)
+                    translated.update(new_translations)
+                translation = reassemble([translated[sentence] for sentence in sentences], separators)
+            except Exception as e:
+                logger.error(f"Translation error: {str(e)}")
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'original': text.strip()
+                }
+
+        return {
+            'success': True,
+            'original': text.strip(),
+            'translation': translation,
+            'language': target_language,
+            'language_name': self.language_names.get(target_language, target_language)
+        }
+
+    def count_tokens(self, text: str) -> int:
+        """Model input length of text, language tags included."""
+        return len(self.tokenizer(f"eng_Latn hin_Deva {text}")["input_ids"])
+
+    async def translate_document_stream(self, text: str, target_language: str) -> AsyncGenerator[Dict, None]:
+        """
+        Long-text mode: plan the text into token-limited segments and yield
+        {"text", "completed", "total"} as each window of segments is done.
+        Joining the "text" parts gives the full translation.
+
+        Raises TranslationOverloaded, before anything is yielded, when the
+        queue is full.
+        """
+        units = await translation_workers.run(plan_document, text, self.count_tokens)
+        admitted = False
+
+        async def translate_pieces(pieces, language):
+            nonlocal admitted
+            # One slot per window so a long report doesn't starve short requests.
+            # Only the first window can be shed; once part of the document has
+            # gone out, later windows wait for a slot instead of failing halfway.
+            async with translation_workers.slot(wait=admitted):
+                admitted = True
+                return await translation_workers.run(self._translate_sentences, pieces, language)
+
+        async for part in translate_units(units, target_language, translate_pieces):
+            yield part
+
+    async def translate_document(self, text: str, target_language: str) -> dict:
+        """translate() for texts of any length, without truncation."""
+        if not text or not text.strip():
+            return {'error': 'Text is required', 'success': False}
+
+        if target_language not in self.languages:
+            return {
+                'error': f'Invalid language. Supported: {list(self.languages.keys())}',
+                'success': False
+            }
+
+        parts = []
+        try:
+            async for part in self.translate_document_stream(text, target_language):
+                parts.append(part)
+        except TranslationOverloaded:
+            raise
+        except Exception as e:
+            logger.error(f"Document translation error: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'original': text.strip()
+            }
+
+        return {
+            'success': True,
+            'original': text.strip(),
+            'translation': "".join(part['text'] for part in parts),
+            'segments': parts[-1]['total'] if parts else 0,
+            'language': target_language,
+            'language_name': self.language_names.get(target_language, target_language)
+        }
+
+    async def batch_translate_async(self, texts: list, target_language: str) -> dict:
+        """batch_translate() on the translation worker pool."""
+        # Raises TranslationOverloaded when the queue is full
+        async with translation_workers.slot():
+            return await translation_workers.run(self.batch_translate, texts, target_language)
+
     def translate(self, text: str, target_language: str) -> dict:
         """
         Translate English text to target Indian language
@@ -82,20 +277,9 @@ class LanguageTranslator:
             }
         
         try:
-            target_lang = self.languages[target_language]
-            input_text = f"eng_Latn {target_lang} {text.strip()}"
-            
-            inputs = self.tokenizer(input_text, return_tensors="pt", padding=True).to(self.device)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_length=256,
-                    num_beams=1,
-                    use_cache=False
-                )
-            
-            translation = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            sentences, separators = segment(text.strip())
+            translated = self._translate_sentences(sentences, target_language)
+            translation = reassemble([translated[sentence] for sentence in sentences], separators)
             
             return {
                 'success': True,
@@ -134,30 +318,18 @@ class LanguageTranslator:
             }
         
         try:
-            target_lang = self.languages[target_language]
-            results = []
-            
-            for text in texts:
-                text = text.strip()
-                if not text:
-                    continue
-                
-                input_text = f"eng_Latn {target_lang} {text}"
-                inputs = self.tokenizer(input_text, return_tensors="pt", padding=True).to(self.device)
-                
-                with torch.no_grad():
-                    outputs = self.model.generate(
-                        **inputs,
-                        max_length=256,
-                        num_beams=1,
-                        use_cache=False
-                    )
-                
-                translation = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-                results.append({
+            cleaned = [text.strip() for text in texts if text.strip()]
+            segmented = [segment(text) for text in cleaned]
+            # Memory misses from all texts go to the model as one padded batch
+            translated = self._translate_sentences(
+                [sentence for sentences, _ in segmented for sentence in sentences], target_language)
+            results = [
+                {
                     'original': text,
-                    'translation': translation
-                })
+                    'translation': reassemble([translated[sentence] for sentence in sentences], separators)
+                }
+                for text, (sentences, separators) in zip(cleaned, segmented)
+            ]
             
             return {
                 'success': True,
@@ -185,15 +357,27 @@ class LanguageTranslator:
     
     def get_health_status(self) -> dict:
         """Get health status of the translator"""
+        # Don't trigger a model load from a health probe
+        loaded = translator_resource.state == READY
         return {
-            'status': 'ok',
+            'status': 'ok' if loaded else translator_resource.state,
             'model': 'IndicTrans2',
-            'device': str(self.device),
+            'device': str(self.device) if loaded else None,
+            'backend': self.backend.name if loaded else TRANSLATION_BACKEND,
+            'decode_mode': self.decode_mode,
             'languages': list(self.languages.keys()),
-            'language_count': len(self.languages)
+            'language_count': len(self.languages),
+            'batching': translation_batcher.stats(),
+            'workers': translation_workers.stats(),
+            # Like the model, the memory isn't opened by a health probe
+            'memory': (translation_memory_resource.get().stats()
+                       if translation_memory_resource.state == READY else translation_memory_resource.state)
         }
 
 
 # Global translator instance
 language_translator = LanguageTranslator()
 
+# Global micro-batching queue shared by all async translate calls
+translation_batcher = TranslationBatcher(language_translator.translate_texts, run_batch=translation_workers.run)
+
@@ -5,16 +5,85 @@ Searches for current market prices, demand, and trends for Dehradun region crops
 
 import logging
 import asyncio
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 from modules.search.searxng_json import searxng_search
+from modules.search.rate_limiter import AsyncRateLimiter, searxng_rate_limiter
 from modules.scrapper.scrapper import json_scrapped
 
 logger = logging.getLogger(__name__)
 
 
+# Crop lookups run together but no more than this many at once
+MAX_CONCURRENT_LOOKUPS = 4
+# Whatever has arrived by then is used; slower crops are reported as timed out
+LOOKUP_DEADLINE_SECONDS = 15.0
+
+
+async def lookup_crops_batch(
+    crops: List[str],
+    build_query: Callable[[str], str],
+    max_concurrency: int = MAX_CONCURRENT_LOOKUPS,
+    deadline_seconds: float = LOOKUP_DEADLINE_SECONDS,
+    search: Callable[[str], Awaitable[List[Dict]]] = None,
+    rate_limiter: AsyncRateLimiter = None
+) -> Dict[str, Dict]:
+    """
+    Search + scrape for every crop concurrently.
+
+    All scrapes share the app's browser pool; the rate limiter spaces out
+    the SearxNG queries. Crops that haven't finished by the deadline are
+    cancelled so the caller waits for the slowest crop at most.
+
+    Args:
+        crops: Crop names
+        build_query: Builds the search query for a crop
+        max_concurrency: Maximum crops searched at once
+        deadline_seconds: Overall time limit for the batch
+        search: Search coroutine (defaults to json_scrapped)
+        rate_limiter: Limiter for outgoing queries (defaults to the shared one)
+
+    Returns:
+        {crop: {"search_results": [...], "status": found/no_results/error/timeout}}
+    """
+    search = search or json_scrapped
+    rate_limiter = rate_limiter or searxng_rate_limiter
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def lookup(crop):
+        async with semaphore:
+            search_query = build_query(crop)
+            await rate_limiter.acquire()
+            logger.info(f"Searching for: {search_query}")
+            return await search(search_query)
+
+    tasks = {asyncio.create_task(lookup(crop)): crop for crop in crops}
+    results = {crop: {"search_results": [], "status": "timeout"} for crop in crops}
+    if not tasks:
+        return results
+
+    done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"Crop lookup deadline hit; skipping {[tasks[t] for t in pending]}")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in done:
+        crop = tasks[task]
+        try:
+            found = task.result()
+            results[crop] = {"search_results": found or [], "status": "found" if found else "no_results"}
+        except Exception as e:
+            logger.warning(f"Error fetching data for {crop}: {e}")
+            results[crop] = {"search_results": [], "status": "error", "error": str(e)}
+
+    return results
+
+
 async def get_market_analysis_for_crops(
     crop_names: List[str],
-    region: str = "Uttarakhand"
+    region: str = "Uttarakhand",
+    deadline_seconds: float = LOOKUP_DEADLINE_SECONDS
 ) -> str:
     """
     Get current market prices, demand, and trends for specified crops in Uttarakhand.
@@ -22,6 +91,7 @@ async def get_market_analysis_for_crops(
     Args:
         crop_names: List of crop names (e.g., ['wheat', 'rice', 'maize'])
         region: Region name (default: Uttarakhand)
+        deadline_seconds: Time limit for all crop lookups together
     
     Returns:
         Formatted market analysis string ready for model consumption
@@ -30,37 +100,11 @@ async def get_market_analysis_for_crops(
     try:
         logger.info(f"Fetching market analysis for crops: {crop_names}")
         
-        market_data = {}
-        
-        for crop in crop_names:
-            try:
-                # Search for current market prices and trends
-                search_query = f"{crop} market price {region} Dehradun 2024 2025"
-                logger.info(f"Searching for: {search_query}")
-                
-                results = await json_scrapped(search_query)
-                
-                if results:
-                    market_data[crop] = {
-                        "search_results": results,
-                        "status": "found"
-                    }
-                else:
-                    market_data[crop] = {
-                        "search_results": [],
-                        "status": "no_results"
-                    }
-                
-                # Small delay between searches
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.warning(f"Error fetching market data for {crop}: {e}")
-                market_data[crop] = {
-                    "search_results": [],
-                    "status": "error",
-                    "error": str(e)
-                }
+        market_data = await lookup_crops_batch(
+            crop_names,
+            lambda crop: f"{crop} market price {region} Dehradun 2024 2025",
+            deadline_seconds=deadline_seconds
+        )
         
         # Format the market analysis
         formatted_analysis = format_market_analysis(market_data, region)
@@ -90,6 +134,8 @@ def format_market_analysis(market_data: Dict, region: str) -> str:
         
         if data["status"] == "error":
             formatted += f"   Status: Error fetching data - {data.get('error', 'Unknown')}\n"
+        elif data["status"] == "timeout":
+            formatted += f"   Status: Market data took too long to fetch\n"
         elif data["status"] == "no_results":
             formatted += f"   Status: No recent market data found\n"
         else:
@@ -121,13 +167,15 @@ def format_market_analysis(market_data: Dict, region: str) -> str:
 
 
 async def get_uttarakhand_cultivation_patterns(
-    crops: List[str]
+    crops: List[str],
+    deadline_seconds: float = LOOKUP_DEADLINE_SECONDS
 ) -> str:
     """
     Search for best cultivation patterns and practices specific to Uttarakhand.
     
     Args:
         crops: List of crop names
+        deadline_seconds: Time limit for all crop lookups together
     
     Returns:
         Formatted cultivation patterns string
@@ -136,22 +184,12 @@ async def get_uttarakhand_cultivation_patterns(
     try:
         logger.info(f"Fetching Uttarakhand cultivation patterns for: {crops}")
         
-        patterns_data = {}
-        
-        for crop in crops:
-            try:
-                # Search for cultivation patterns specific to Uttarakhand
-                search_query = f"{crop} cultivation Uttarakhand best practices timing planting"
-                logger.info(f"Searching patterns for: {search_query}")
-                
-                results = await json_scrapped(search_query)
-                
-                patterns_data[crop] = results if results else []
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.warning(f"Error fetching patterns for {crop}: {e}")
-                patterns_data[crop] = []
+        lookups = await lookup_crops_batch(
+            crops,
+            lambda crop: f"{crop} cultivation Uttarakhand best practices timing planting",
+            deadline_seconds=deadline_seconds
+        )
+        patterns_data = {crop: data["search_results"] for crop, data in lookups.items()}
         
         # Format the patterns
         formatted_patterns = format_cultivation_patterns(patterns_data)
@@ -1,31 +1,24 @@
 # brain/model_run.py
 
-from brain.brain_init import default_model, voice_model, vision_model
+from brain.brain_init import get_default_model, get_voice_model, get_vision_model, get_gemini_model
 from configs.model_config import CROP_ADVISE_SYSTEM_MESSAGE, DEFAULT_SYSTEM_MESSAGE, VOICE_SYSTEM_MESSAGE
+from configs.context_packer_config import CROP_ADVICE_TOKEN_BUDGET
+from brain.context_packer import context_packer
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import HumanMessage, SystemMessage
+import asyncio
 import logging
 import base64
 from datetime import datetime
 from typing import Any, AsyncGenerator, Dict, Optional, List
-import google.generativeai as genai
-from configs.external_keys import GEMINI_API_KEY
 
 from routes.helpers.push_supabase import push_to_supabase
 
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
-gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-
 class ModelRun:
     def __init__(self):
-        self.default_model = default_model
-        self.voice_model = voice_model
-        self.vision_model = vision_model
-
         self.rag_template = ChatPromptTemplate.from_messages([
             ("system", DEFAULT_SYSTEM_MESSAGE + "\n\nUse the following context to answer the user's question:\n{context}"),
             ("human", "{question}")
@@ -39,10 +32,23 @@ class ModelRun:
             ("human", "{question}")
         ])
 
+    # Resolved per call so importing this module doesn't build the clients
+    @property
+    def default_model(self):
+        return get_default_model()
+
+    @property
+    def voice_model(self):
+        return get_voice_model()
+
+    @property
+    def vision_model(self):
+        return get_vision_model()
+
     async def generate(
         self,
         question: str,
-        context: str = "",
+        context: Any = "",
         conversation_id: str = "",
         user_id: str = "",
         use_voice_model: bool = False,
@@ -52,6 +58,9 @@ class ModelRun:
         history: Optional[List[Dict[str, str]]] = None
     ) -> AsyncGenerator[str, None]:
 
+        # Search results, scraped pages or plain text, fitted to the token budget
+        context = await asyncio.to_thread(context_packer.pack, context, question)
+
         # Dynamically build prompt with history
         messages = []
         if context:
@@ -210,8 +219,9 @@ class ModelRun:
                 if chunk:
                     yield chunk
 
-    async def run_rag(self, question: str, context: str) -> AsyncGenerator[str, None]:
+    async def run_rag(self, question: str, context: Any) -> AsyncGenerator[str, None]:
 
+        context = await asyncio.to_thread(context_packer.pack, context, question)
         template = self.rag_template
         model    = self.default_model
         chain    = template | model | StrOutputParser()
@@ -238,6 +248,11 @@ class ModelRun:
         try:
             logger.info("Getting crop advice from Gemini 2.0 Flash")
             
+            # Sections come in priority order; the packer drops the banners
+            # and trims the lowest-priority detail first
+            comprehensive_data = await asyncio.to_thread(
+                context_packer.pack, comprehensive_data, "", CROP_ADVICE_TOKEN_BUDGET)
+
             # Build the complete prompt with system context
             full_prompt = f"""{CROP_ADVISE_SYSTEM_MESSAGE}
 
@@ -250,7 +265,7 @@ COMPREHENSIVE AGRICULTURAL DATA:
 Based on this context, provide focused crop recommendations following the exact response structure specified in the system message."""
 
             # Use Gemini with streaming (synchronous iterator)
-            response = gemini_model.generate_content(
+            response = get_gemini_model().generate_content(
                 full_prompt,
                 stream=True
             )
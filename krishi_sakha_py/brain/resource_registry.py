@@ -0,0 +1,119 @@
+"""
+Lazy registry for heavy models and clients.
+
+Importing main.py used to load IndicTrans2, build the Ollama clients and
+configure Gemini in several modules before the server could accept a
+single request; every test and worker fork paid for it too. Modules now
+register a loader here instead. A resource loads on its first get() or in
+the background warm-up task started after the server is up, whichever
+comes first, and /ready reports the state of each one.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LazyResource:
+    """A value built by loader() on first use, at most once at a time."""
+
+    def __init__(self, name: str, loader: Callable[[], Any], warm_up: bool = True):
+        self.name = name
+        self.loader = loader
+        self.warm_up = warm_up
+        self.state = NOT_LOADED
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self.state == READY:
+            return self._value
+
+        # Callers arriving during a load wait for it instead of loading twice
+        with self._lock:
+            if self.state == READY:
+                return self._value
+
+            self.state = LOADING
+            started = time.perf_counter()
+            try:
+                value = self.loader()
+            except Exception as e:
+                # Left retryable: the next get() tries again
+                self.state = FAILED
+                self.error = str(e)
+                logger.error(f"Failed to load {self.name}: {e}")
+                raise
+
+            self._value = value
+            self.load_seconds = time.perf_counter() - started
+            self.error = None
+            self.state = READY
+            logger.info(f"✓ Loaded {self.name} in {self.load_seconds:.2f}s")
+            return value
+
+    def status(self) -> Dict:
+        return {
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+            "warm_up": self.warm_up,
+        }
+
+
+class ResourceRegistry:
+    """Named lazy resources plus a background warm-up task."""
+
+    def __init__(self):
+        self._resources: Dict[str, LazyResource] = {}
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, loader: Callable[[], Any], warm_up: bool = True) -> LazyResource:
+        """Register a loader; re-registering a name keeps the existing resource."""
+        if name not in self._resources:
+            self._resources[name] = LazyResource(name, loader, warm_up)
+        return self._resources[name]
+
+    def get(self, name: str):
+        if name not in self._resources:
+            raise KeyError(f"No resource registered as '{name}'")
+        return self._resources[name].get()
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None):
+        """Load resources one after another off the event loop."""
+        names = list(names) if names is not None else [
+            name for name, resource in self._resources.items() if resource.warm_up]
+        # Sequential on purpose: parallel loads would fight over the same cores
+        # as the requests the server is already handling
+        for name in names:
+            try:
+                await asyncio.to_thread(self.get, name)
+            except Exception:
+                # Already logged; the resource stays retryable on first use
+                continue
+
+    def start_warm_up(self) -> asyncio.Task:
+        """Start warm_up() in the background and return immediately."""
+        if self._warm_up_task is None or self._warm_up_task.done():
+            self._warm_up_task = asyncio.create_task(self.warm_up())
+        return self._warm_up_task
+
+    def status(self) -> Dict:
+        resources = {name: resource.status() for name, resource in self._resources.items()}
+        ready = all(resource.state == READY for resource in self._resources.values() if resource.warm_up)
+        return {"ready": ready, "resources": resources}
+
+
+# Global resource registry instance
+resource_registry = ResourceRegistry()
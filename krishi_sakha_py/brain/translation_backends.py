@@ -0,0 +1,160 @@
+"""
+Pluggable inference backends for IndicTrans2.
+
+The production box is CPU-only, where the fp32 model is the slowest and
+largest option. Every backend takes the prefixed input texts
+("eng_Latn hin_Deva ...") and returns decoded translations, so
+LanguageTranslator doesn't care which one is loaded:
+
+- torch_fp32: the original AutoModelForSeq2SeqLM, any device
+- torch_int8: the same model with its Linear layers dynamically quantized
+  to int8 (CPU only)
+- onnx: an ONNX Runtime export via optimum, written to disk once and
+  reused; ONNX Runtime handles the decoder cache itself
+
+Operators pick one with TRANSLATION_BACKEND. Drift against fp32 is checked
+with chrF on a fixed sentence set (see brain/translation_parity.py).
+"""
+
+import io
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+from brain.translation_decoding import decode_batch, budget_max_new_tokens
+from configs.translation_config import (
+    TRANSLATION_MODEL_NAME, TRANSLATION_ONNX_DIR, TRANSLATION_ONNX_THREADS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def model_size_bytes(model) -> int:
+    """Serialized size of a torch model's weights (works for quantized modules)."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+class TranslatorBackend:
+    """Base class: tokenize, generate, decode."""
+
+    name = "base"
+
+    def __init__(self, model_name: str = TRANSLATION_MODEL_NAME, device: Optional[torch.device] = None):
+        self.model_name = model_name
+        self.device = device or torch.device("cpu")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+        self.model = None
+
+    def generate(self, inputs, mode: str, num_beams: int):
+        raise NotImplementedError
+
+    def translate(self, input_texts: List[str], mode: str = "greedy", num_beams: int = 4) -> List[str]:
+        inputs = self.tokenizer(input_texts, return_tensors="pt", padding=True).to(self.device)
+        outputs = self.generate(inputs, mode, num_beams)
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    def memory_bytes(self) -> int:
+        return model_size_bytes(self.model)
+
+    def describe(self) -> Dict:
+        return {"backend": self.name, "device": str(self.device), "model_bytes": self.memory_bytes()}
+
+
+class TorchFP32Backend(TranslatorBackend):
+    """The unmodified fp32 model."""
+
+    name = "torch_fp32"
+
+    def __init__(self, model_name: str = TRANSLATION_MODEL_NAME, device: Optional[torch.device] = None):
+        super().__init__(model_name, device)
+        self.model = self._load_model()
+
+    def _load_model(self):
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name, trust_remote_code=True)
+        return model.to(self.device).eval()
+
+    def generate(self, inputs, mode: str, num_beams: int):
+        # KV-cached decoding with an output budget based on the input length
+        return decode_batch(self.model, self.tokenizer, inputs, mode=mode, num_beams=num_beams)
+
+
+class TorchInt8Backend(TorchFP32Backend):
+    """fp32 model with nn.Linear weights quantized to int8 at load time."""
+
+    name = "torch_int8"
+
+    def __init__(self, model_name: str = TRANSLATION_MODEL_NAME, device: Optional[torch.device] = None):
+        if device is not None and device.type != "cpu":
+            logger.warning(f"torch_int8 backend only runs on CPU; ignoring device {device}")
+        super().__init__(model_name, torch.device("cpu"))
+
+    def _load_model(self):
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name, trust_remote_code=True).eval()
+        # Activations stay fp32 and are quantized per batch; only the matmuls run in int8
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend(TranslatorBackend):
+    """ONNX Runtime (CPU) export of the model through optimum."""
+
+    name = "onnx"
+
+    def __init__(self, model_name: str = TRANSLATION_MODEL_NAME, device: Optional[torch.device] = None,
+                 export_dir: str = TRANSLATION_ONNX_DIR):
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise RuntimeError("The onnx backend needs `pip install optimum[onnxruntime]`") from e
+
+        if device is not None and device.type != "cpu":
+            logger.warning(f"onnx backend runs on CPUExecutionProvider; ignoring device {device}")
+        super().__init__(model_name, torch.device("cpu"))
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = TRANSLATION_ONNX_THREADS
+
+        self.export_dir = Path(export_dir)
+        if (self.export_dir / "encoder_model.onnx").exists():
+            self.model = ORTModelForSeq2SeqLM.from_pretrained(
+                self.export_dir, session_options=session_options, provider="CPUExecutionProvider")
+        else:
+            logger.info(f"Exporting {model_name} to ONNX in {self.export_dir} (one-off)")
+            self.model = ORTModelForSeq2SeqLM.from_pretrained(
+                model_name, export=True, trust_remote_code=True, use_cache=True,
+                session_options=session_options, provider="CPUExecutionProvider")
+            self.model.save_pretrained(self.export_dir)
+
+    def generate(self, inputs, mode: str, num_beams: int):
+        max_new_tokens = budget_max_new_tokens(int(inputs["attention_mask"].sum(dim=1).max()))
+        return self.model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            num_beams=num_beams if mode == "beam" else 1,
+            # The export has past-key-value decoder sessions; ORT's uncached
+            # path would re-run the whole prefix for nothing
+            use_cache=True
+        )
+
+    def memory_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.export_dir.glob("*.onnx*"))
+
+
+BACKENDS = {
+    TorchFP32Backend.name: TorchFP32Backend,
+    TorchInt8Backend.name: TorchInt8Backend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def load_backend(name: str, model_name: str = TRANSLATION_MODEL_NAME,
+                 device: Optional[torch.device] = None) -> TranslatorBackend:
+    """Instantiate the backend registered under name."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend '{name}'. Supported: {list(BACKENDS)}")
+    return BACKENDS[name](model_name=model_name, device=device)
@@ -0,0 +1,132 @@
+"""
+Async micro-batching in front of the IndicTrans2 model.
+
+Concurrent /translate calls used to run one generate() each. The batcher
+collects requests for up to max_wait_ms (or until max_batch_size are waiting),
+groups them by target language and hands every group to the model as one
+padded batch, then resolves each caller's future with its own translation.
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_MAX_WAIT_MS = 10.0
+
+# translate_batch(texts, target_language) -> translations, same order
+BatchTranslateFn = Callable[[List[str], str], List[str]]
+
+
+class TranslationBatcher:
+    """Collects translate requests briefly and runs them as language batches."""
+
+    def __init__(self,
+                 translate_batch: BatchTranslateFn,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 run_batch: Optional[Callable] = None,
+                 metrics_window: int = 1000):
+        self.translate_batch = translate_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        # How a blocking batch is executed; defaults to a thread so the model
+        # never runs on the event loop
+        self._run_batch = run_batch or (lambda fn, *args: asyncio.to_thread(fn, *args))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.batched_items = 0
+        self._latencies = deque(maxlen=metrics_window)
+        self._started_at = time.perf_counter()
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # The queue and worker belong to the loop that made them; a new
+            # loop (another asyncio.run, a test) gets its own
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._collect_loop())
+
+    async def submit(self, text: str, target_language: str) -> str:
+        """Queue one text and wait for its translation."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, target_language, future, time.perf_counter()))
+        self.requests += 1
+        return await future
+
+    async def _collect(self) -> List[Tuple]:
+        items = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _collect_loop(self):
+        while True:
+            items = await self._collect()
+            groups: Dict[str, List[Tuple]] = {}
+            for item in items:
+                groups.setdefault(item[1], []).append(item)
+            for target_language, group in groups.items():
+                await self._run_group(target_language, group)
+
+    async def _run_group(self, target_language: str, group: List[Tuple]):
+        # Callers that gave up (client disconnected) don't need model time
+        live = [item for item in group if not item[2].done()]
+        if not live:
+            return
+        try:
+            translations = await self._run_batch(self.translate_batch, [item[0] for item in live], target_language)
+        except Exception as e:
+            logger.error(f"Batch translation failed for {target_language} ({len(live)} texts): {e}")
+            for _, _, future, _ in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.batched_items += len(live)
+        now = time.perf_counter()
+        for (_, _, future, queued_at), translation in zip(live, translations):
+            self._latencies.append(now - queued_at)
+            if not future.done():
+                future.set_result(translation)
+
+    def stats(self) -> Dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        uptime = time.perf_counter() - self._started_at
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+            "throughput_per_sec": self.batched_items / uptime if uptime else 0.0,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
@@ -0,0 +1,183 @@
+"""
+Sentence-level translation memory for IndicTrans2.
+
+Advisories repeat the same sentences ("Irrigate the field in the evening.")
+across thousands of messages. Input is split into sentences and every
+(sentence, language) pair is looked up in an in-process LRU backed by a
+SQLite table; only the misses are sent to the model and the translated
+sentences are stitched back together with the original spacing. The table is
+seeded from the offline phrasebook the Flutter app ships with.
+"""
+
+import re
+import json
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from configs.translation_config import (
+    TRANSLATION_MEMORY_PATH, TRANSLATION_MEMORY_LRU_SIZE, OFFLINE_CACHE_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+# Whitespace after . ! ? (optionally followed by a closing quote/bracket),
+# or any line break
+_SENTENCE_BOUNDARY = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+|\s*\n\s*")
+
+
+def normalize_sentence(sentence: str) -> str:
+    return " ".join(sentence.split())
+
+
+def segment(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Split text into sentences.
+
+    Returns:
+        (sentences, separators) where separators[i] is what followed
+        sentences[i] (" ", the line break(s) with any indentation, or ""
+        for the last), so reassemble() keeps paragraphs and list layout.
+    """
+    sentences, separators = [], []
+    position = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        sentence = text[position:match.start()].strip()
+        position = match.end()
+        if not sentence:
+            continue
+        sentences.append(sentence)
+        separators.append(match.group(0) if "\n" in match.group(0) else " ")
+
+    tail = text[position:].strip()
+    if tail:
+        sentences.append(tail)
+        separators.append("")
+    elif separators:
+        separators[-1] = ""
+    return sentences, separators
+
+
+def split_complete(text: str) -> Tuple[str, str]:
+    """
+    Split streamed text at its last sentence boundary.
+
+    Returns:
+        (complete, remainder): complete ends with the boundary whitespace and
+        is safe to translate; remainder may still grow.
+    """
+    last = None
+    for last in _SENTENCE_BOUNDARY.finditer(text):
+        pass
+    if last is None:
+        return "", text
+    return text[:last.end()], text[last.end():]
+
+
+def reassemble(translations: List[str], separators: List[str]) -> str:
+    return "".join(translation + separator for translation, separator in zip(translations, separators))
+
+
+class TranslationMemory:
+    """LRU + SQLite store of sentence translations with per-language hit rates."""
+
+    def __init__(self,
+                 db_path: str = TRANSLATION_MEMORY_PATH,
+                 lru_size: int = TRANSLATION_MEMORY_LRU_SIZE,
+                 seed_path: Optional[Path] = OFFLINE_CACHE_PATH):
+        self.db_path = str(db_path)
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translation_memory ("
+            " source TEXT NOT NULL, language TEXT NOT NULL, translation TEXT NOT NULL,"
+            " PRIMARY KEY (source, language))"
+        )
+        self._conn.commit()
+
+        if seed_path is not None:
+            self.seed_from_offline_cache(seed_path)
+
+    def seed_from_offline_cache(self, path) -> int:
+        """Import the offline phrasebook; existing rows are kept."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                phrases = json.load(f).get("phrases", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Translation memory seed not loaded from {path}: {e}")
+            return 0
+
+        rows = [
+            (normalize_sentence(source), language, translation)
+            for source, translations in phrases.items()
+            for language, translation in translations.items()
+            if translation
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO translation_memory (source, language, translation) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+        return len(rows)
+
+    def _remember(self, key: Tuple[str, str], translation: str):
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def lookup_many(self, sentences: Iterable[str], language: str) -> Dict[str, str]:
+        """Return {sentence: translation} for the sentences already known."""
+        unique = list(dict.fromkeys(sentences))
+        found = {}
+        with self._lock:
+            for sentence in unique:
+                key = (normalize_sentence(sentence), language)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[sentence] = self._lru[key]
+                    continue
+
+                row = self._conn.execute(
+                    "SELECT translation FROM translation_memory WHERE source = ? AND language = ?", key
+                ).fetchone()
+                if row is not None:
+                    found[sentence] = row[0]
+                    self._remember(key, row[0])
+
+            self._hits[language] = self._hits.get(language, 0) + len(found)
+            self._misses[language] = self._misses.get(language, 0) + len(unique) - len(found)
+        return found
+
+    def store_many(self, translations: Dict[str, str], language: str):
+        rows = [(normalize_sentence(source), language, translation)
+                for source, translation in translations.items() if translation]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory (source, language, translation) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+            for source, _, translation in rows:
+                self._remember((source, language), translation)
+
+    def stats(self) -> Dict:
+        languages = sorted(set(self._hits) | set(self._misses))
+        per_language = {}
+        for language in languages:
+            hits, misses = self._hits.get(language, 0), self._misses.get(language, 0)
+            per_language[language] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+        return {"entries": stored, "lru_entries": len(self._lru), "languages": per_language}
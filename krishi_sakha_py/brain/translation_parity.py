@@ -0,0 +1,83 @@
+"""
+chrF parity checks between translation backends.
+
+The fp32 model's output is the reference. A quantized or exported backend
+is scored against it on a fixed set of advisory sentences. Drift is
+100 - chrF, so 0 means identical output. Pure Python, no sacrebleu needed.
+"""
+
+from collections import Counter
+from typing import Dict, List
+
+# Fixed sentence set for parity runs: short and long advisories, numbers, names
+PARITY_SENTENCES = [
+    "Irrigate the wheat field in the evening.",
+    "Apply 50 kilograms of urea per acre after the first irrigation.",
+    "Yellow rust appears as yellow stripes on the leaves of wheat plants.",
+    "Spray neem oil every week to control aphids on mustard.",
+    "Heavy rain is expected tomorrow, so postpone fertilizer application.",
+    "The monsoon is expected to reach Uttarakhand in the third week of June.",
+    "Store the harvested grain in a dry place to protect it from moisture and insects.",
+    "Farmers can apply for the PM Kisan scheme at the nearest common service centre.",
+    "Test the soil before sowing to decide how much fertilizer the crop needs.",
+    "Tomato prices in the Dehradun mandi rose to 2400 rupees per quintal this week.",
+    "Remove weeds from the paddy field within 30 days of transplanting.",
+    "Thank you",
+]
+
+# Largest acceptable drift (chrF points) for a backend to replace fp32
+MAX_CHRF_DRIFT = 5.0
+
+CHRF_MAX_ORDER = 6
+CHRF_BETA = 2.0
+
+
+def _char_ngrams(text: str, n: int) -> Counter:
+    # chrF ignores whitespace
+    text = "".join(text.split())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def chrf(hypotheses: List[str], references: List[str],
+         max_order: int = CHRF_MAX_ORDER, beta: float = CHRF_BETA) -> float:
+    """Corpus-level chrF (0-100) of hypotheses against references."""
+    if len(hypotheses) != len(references):
+        raise ValueError("hypotheses and references must have the same length")
+
+    precisions, recalls = [], []
+    for n in range(1, max_order + 1):
+        matches = hypothesis_total = reference_total = 0
+        for hypothesis, reference in zip(hypotheses, references):
+            hypothesis_ngrams = _char_ngrams(hypothesis, n)
+            reference_ngrams = _char_ngrams(reference, n)
+            matches += sum((hypothesis_ngrams & reference_ngrams).values())
+            hypothesis_total += sum(hypothesis_ngrams.values())
+            reference_total += sum(reference_ngrams.values())
+        # Orders longer than every sentence don't count
+        if hypothesis_total and reference_total:
+            precisions.append(matches / hypothesis_total)
+            recalls.append(matches / reference_total)
+
+    if not precisions:
+        return 100.0 if hypotheses == references else 0.0
+
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    beta_squared = beta ** 2
+    return 100 * (1 + beta_squared) * precision * recall / (beta_squared * precision + recall)
+
+
+def chrf_drift(reference_translations: List[str], candidate_translations: List[str]) -> Dict:
+    """Compare a backend's translations with the fp32 reference."""
+    score = chrf(candidate_translations, reference_translations)
+    identical = sum(1 for reference, candidate in zip(reference_translations, candidate_translations)
+                    if reference == candidate)
+    return {
+        "chrf": score,
+        "drift": 100.0 - score,
+        "identical": identical,
+        "total": len(reference_translations),
+        "within_budget": 100.0 - score <= MAX_CHRF_DRIFT,
+    }
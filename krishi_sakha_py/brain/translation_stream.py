@@ -0,0 +1,109 @@
+"""
+Translate LLM output while it is being generated.
+
+Vernacular users used to wait for the whole English answer and then call
+/translate. translate_stream() sits between model_runner.generate and the
+SSE response: English chunks are passed through as they arrive, text is
+buffered until a sentence boundary, and every completed block is sent to
+the batched translator right away. Translations are emitted in order as
+soon as they are ready, interleaved with the English text. Each block is
+only a sentence or two, so nothing hits the model's output budget.
+"""
+
+import asyncio
+import itertools
+import logging
+from collections import deque
+from typing import AsyncGenerator, AsyncIterable, Awaitable, Callable, Dict
+
+from brain.translation_memory import split_complete
+from brain.translation_workers import TranslationOverloaded
+
+logger = logging.getLogger(__name__)
+
+# translate(text, target_language) -> translate_async() style result dict
+TranslateFn = Callable[[str, str], Awaitable[Dict]]
+
+
+class SentenceStreamBuffer:
+    """Accumulates streamed text and releases it one completed block at a time."""
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; return the newly completed text ("" if none)."""
+        complete, self._pending = split_complete(self._pending + chunk)
+        return complete
+
+    def flush(self) -> str:
+        remainder, self._pending = self._pending, ""
+        return remainder
+
+
+async def _translate_block(translate: TranslateFn, index: int, text: str, target_language: str) -> Dict:
+    source = text.strip()
+    event = {
+        'type': 'translation',
+        'index': index,
+        'source': source,
+        # Whitespace that followed the block, so the client keeps line breaks
+        'separator': text[len(text.rstrip()):],
+        'language': target_language,
+    }
+    try:
+        result = await translate(source, target_language)
+    except TranslationOverloaded as e:
+        result = {'success': False, 'error': str(e)}
+    except Exception as e:
+        logger.error(f"Streaming translation failed for block {index}: {e}")
+        result = {'success': False, 'error': str(e)}
+
+    event['success'] = bool(result.get('success'))
+    if event['success']:
+        event['translation'] = result['translation']
+    else:
+        event['error'] = result.get('error', 'Translation failed')
+    return event
+
+
+async def translate_stream(
+    chunks: AsyncIterable[str],
+    target_language: str,
+    translate: TranslateFn
+) -> AsyncGenerator[Dict, None]:
+    """
+    Yield {'type': 'text', 'chunk'} events for the English stream, and
+    {'type': 'translation', 'index', 'source', 'translation', 'separator'}
+    events for every completed sentence block, in source order.
+    """
+    buffer = SentenceStreamBuffer()
+    pending: deque = deque()
+    block_index = itertools.count()
+
+    def start(text: str):
+        if text.strip():
+            pending.append(asyncio.create_task(
+                _translate_block(translate, next(block_index), text, target_language)))
+
+    def ready_events():
+        # Only the head of the queue may go out, so blocks stay in order
+        while pending and pending[0].done():
+            yield pending.popleft().result()
+
+    try:
+        async for chunk in chunks:
+            yield {'type': 'text', 'chunk': chunk}
+            start(buffer.feed(chunk))
+            for event in ready_events():
+                yield event
+
+        start(buffer.flush())
+        while pending:
+            await asyncio.wait({pending[0]})
+            for event in ready_events():
+                yield event
+    finally:
+        # Client went away: don't keep translating for nobody
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,80 @@
+"""
+Dedicated worker pool for translation inference.
+
+IndicTrans2 generate() is CPU heavy. Running it on the event loop (or in the
+default executor shared with every other asyncio.to_thread call) stalls the
+SSE chat streams in the same process. Translation gets its own small thread
+pool, and requests beyond max_pending are rejected up front so the routes
+can answer 503 instead of queueing without bound.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict
+
+from configs.translation_config import TRANSLATION_WORKERS, TRANSLATION_MAX_PENDING
+
+logger = logging.getLogger(__name__)
+
+WAIT_POLL_SECONDS = 0.05
+
+
+class TranslationOverloaded(Exception):
+    """Raised when the translation queue is full; map to HTTP 503."""
+
+
+class TranslationWorkerPool:
+    """Bounded thread pool plus admission control for translation requests."""
+
+    def __init__(self, max_workers: int = TRANSLATION_WORKERS, max_pending: int = TRANSLATION_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        self.pending = 0
+        self.admitted = 0
+        self.shed = 0
+
+    @asynccontextmanager
+    async def slot(self, wait: bool = False):
+        """
+        Admit one request, or raise TranslationOverloaded when saturated.
+
+        wait=True queues for a free slot instead; for the later windows of a
+        document whose first window was already admitted and streamed.
+        """
+        while wait and self.pending >= self.max_pending:
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+        if self.pending >= self.max_pending:
+            self.shed += 1
+            logger.warning(f"Translation queue full ({self.pending} pending); shedding request")
+            raise TranslationOverloaded(f"Translation service busy ({self.pending} requests queued)")
+        self.pending += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def run(self, fn: Callable, *args):
+        """Run a blocking inference call on the translation threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+# Global translation worker pool
+translation_workers = TranslationWorkerPool()
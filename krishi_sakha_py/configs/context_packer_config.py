@@ -0,0 +1,25 @@
+import os
+
+# Context handed to the model is packed into a token budget: near-duplicate
+# snippets are dropped and the rest trimmed to their most relevant sentences.
+# Prefill on gemma3:4b grows with every context token.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 1500))
+# Gemini handles crop advice; its context is larger but prefill still costs
+CROP_ADVICE_TOKEN_BUDGET = int(os.getenv("CROP_ADVICE_TOKEN_BUDGET", 3000))
+
+# Tokens are counted with the generating model's tokenizer once it is loaded
+# (on first use, in the background), and estimated from the character count
+# until then. The default is an ungated copy of gemma3's tokenizer; the
+# google/ repo needs a Hugging Face token.
+CONTEXT_TOKENIZER_NAME = os.getenv("CONTEXT_TOKENIZER_NAME", "unsloth/gemma-3-4b-it")
+
+# Share of word trigrams two snippets must have in common (relative to the
+# shorter one) to count as duplicates
+CONTEXT_DUPLICATE_THRESHOLD = float(os.getenv("CONTEXT_DUPLICATE_THRESHOLD", 0.8))
+# Sentences at least this many words long are kept only once across snippets
+# (repeated boilerplate on scraped pages); shorter lines such as table rows
+# legitimately repeat
+CONTEXT_MIN_DEDUPE_WORDS = int(os.getenv("CONTEXT_MIN_DEDUPE_WORDS", 6))
+# A first line this short is treated as its section's title and kept only
+# together with some of the section's content
+CONTEXT_TITLE_WORDS = int(os.getenv("CONTEXT_TITLE_WORDS", 12))
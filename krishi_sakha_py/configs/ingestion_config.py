@@ -0,0 +1,19 @@
+import os
+
+# Processes extracting PDF pages; leave a core for the embedding stage
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+# Pages per extraction task, and extraction tasks in flight per worker
+INGEST_PAGES_PER_TASK = int(os.getenv("INGEST_PAGES_PER_TASK", 16))
+INGEST_TASKS_PER_WORKER = int(os.getenv("INGEST_TASKS_PER_WORKER", 2))
+
+# Chunks per model.encode call and per Chroma upsert
+INGEST_EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", 64))
+INGEST_UPSERT_BATCH_SIZE = int(os.getenv("INGEST_UPSERT_BATCH_SIZE", 256))
+
+# Chunk batches buffered between extraction and embedding; with the limits
+# above this bounds memory no matter how many pages a report has
+INGEST_QUEUE_BATCHES = int(os.getenv("INGEST_QUEUE_BATCHES", 8))
+
+# Seconds between progress log lines
+INGEST_PROGRESS_INTERVAL = float(os.getenv("INGEST_PROGRESS_INTERVAL", 5.0))
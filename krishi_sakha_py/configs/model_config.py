@@ -1,5 +1,16 @@
+import os
+
 MODEL_NAME="gemma3:4b"
 
+# Load heavy models in the background once the server is up. Set to 0 for
+# tests and scripts; models then load on first use only.
+MODEL_WARM_UP = os.getenv("MODEL_WARM_UP", "1") != "0"
+
+# Intra-op threads of torch's process-wide pool, shared by MiniLM, the
+# cross-encoder and IndicTrans2; the rest of the cores stay with the event
+# loop and Ollama. This is the only torch thread setting.
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", max(1, (os.cpu_count() or 2) // 2)))
+
 
 
 DEFAULT_SYSTEM_MESSAGE="""
@@ -0,0 +1,31 @@
+import os
+
+from configs.vector_db_config import PROJECT_ROOT
+
+# On-disk cache of scraped pages (trafilatura output, not raw HTML)
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", str(PROJECT_ROOT / "data" / "page_cache"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# How long a cached page is served without revalidation. First matching
+# domain suffix wins, so list more specific suffixes first.
+DOMAIN_TTLS = [
+    # News and mandi price sites change through the day
+    ("krishijagran.com", 6 * HOUR),
+    ("downtoearth.org.in", 6 * HOUR),
+    ("thehindu.com", 6 * HOUR),
+    ("indianexpress.com", 6 * HOUR),
+    ("timesofindia.indiatimes.com", 6 * HOUR),
+    ("agmarknet.gov.in", 6 * HOUR),
+    ("enam.gov.in", 6 * HOUR),
+    # Extension documents and package of practices barely change
+    ("icar.org.in", 30 * DAY),
+    ("tnau.ac.in", 30 * DAY),
+    ("vikaspedia.in", 30 * DAY),
+    ("ac.in", 30 * DAY),
+    ("nic.in", 30 * DAY),
+    ("gov.in", 7 * DAY),
+]
+DEFAULT_PAGE_TTL = DAY
@@ -0,0 +1,21 @@
+import os
+
+# Cross-encoder re-ranking of retrieved chunks before they reach the prompt.
+# Set RERANK_ENABLED=0 to pass retrieval order straight through.
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "1") != "0"
+RERANK_MODEL_NAME = os.getenv("RERANK_MODEL_NAME", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+# Chunks fetched from the vector DB for the cross-encoder to choose from
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", 30))
+# (query, chunk) pairs per forward pass, and tokens per pair. Scoring runs
+# on torch's shared thread pool (TORCH_THREADS in model_config)
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", 10))
+RERANK_MAX_LENGTH = int(os.getenv("RERANK_MAX_LENGTH", 256))
+
+# Scoring stops (keeping retrieval order for the rest) once another batch
+# would overrun this; an unloaded model skips re-ranking altogether
+RERANK_LATENCY_BUDGET_MS = float(os.getenv("RERANK_LATENCY_BUDGET_MS", 250))
+
+# Chunks kept, and their total size in (approximate) prompt tokens
+RERANK_TOP_K = int(os.getenv("RERANK_TOP_K", 5))
+RERANK_TOKEN_BUDGET = int(os.getenv("RERANK_TOKEN_BUDGET", 1200))
@@ -0,0 +1,40 @@
+import os
+
+from configs.vector_db_config import PROJECT_ROOT
+from configs.model_config import TORCH_THREADS
+
+# Threads that run IndicTrans2 batches. Batches are already large, so one
+# worker with several torch threads beats several workers fighting over cores.
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", 1))
+
+# The torch backends use torch's shared pool (TORCH_THREADS in model_config).
+# The onnx backend has its own per-session pool, sized here.
+TRANSLATION_ONNX_THREADS = int(os.getenv("TRANSLATION_ONNX_THREADS", TORCH_THREADS))
+
+# Outstanding translation requests allowed before new ones get a 503
+TRANSLATION_MAX_PENDING = int(os.getenv("TRANSLATION_MAX_PENDING", 64))
+
+# Sentence-level translation memory (SQLite) and the LRU kept in front of it
+TRANSLATION_MEMORY_PATH = os.getenv(
+    "TRANSLATION_MEMORY_PATH", str(PROJECT_ROOT / "data" / "translation_memory.sqlite3"))
+TRANSLATION_MEMORY_LRU_SIZE = int(os.getenv("TRANSLATION_MEMORY_LRU_SIZE", 5000))
+
+# Phrasebook shipped to the Flutter app; seeds the translation memory
+OFFLINE_CACHE_PATH = PROJECT_ROOT.parent / "notebook" / "models" / "translation_model" / "offline_cache.json"
+
+# IndicTrans2 decoding: "greedy" (KV-cached), "beam" or "greedy_nocache"
+# (the old uncached path, kept as an opt-out)
+TRANSLATION_DECODE_MODE = os.getenv("TRANSLATION_DECODE_MODE", "greedy")
+TRANSLATION_NUM_BEAMS = int(os.getenv("TRANSLATION_NUM_BEAMS", 4))
+
+# Inference backend: "torch_fp32", "torch_int8" (dynamic int8 Linear layers,
+# CPU only) or "onnx" (ONNX Runtime export, needs optimum[onnxruntime])
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "torch_fp32")
+TRANSLATION_MODEL_NAME = os.getenv("TRANSLATION_MODEL_NAME", "ai4bharat/indictrans2-en-indic-dist-200M")
+# The ONNX export is written here on first load and reused afterwards
+TRANSLATION_ONNX_DIR = os.getenv("TRANSLATION_ONNX_DIR", str(PROJECT_ROOT / "data" / "onnx" / "indictrans2"))
+
+# Long-document mode: source tokens per segment (1.5x + 10 of this stays
+# under the 256-token output cap) and segments translated per generate call
+TRANSLATION_MAX_SEGMENT_TOKENS = int(os.getenv("TRANSLATION_MAX_SEGMENT_TOKENS", 160))
+TRANSLATION_DOCUMENT_WINDOW = int(os.getenv("TRANSLATION_DOCUMENT_WINDOW", 32))
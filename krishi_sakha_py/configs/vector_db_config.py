@@ -0,0 +1,26 @@
+import os
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Chroma persistent storage used by /chat and the ingestion scripts
+CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", str(PROJECT_ROOT / "chroma_db"))
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Collections opened at FastAPI startup so the first RAG turn is warm
+WARMUP_COLLECTIONS = ["annual_report"]
+
+# Query/chunk embedding cache: in-process LRU in front of a memory-mapped
+# float32 file per model. Set EMBEDDING_CACHE_PATH="" to keep it in memory only.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", str(PROJECT_ROOT / "data" / "embedding_cache"))
+EMBEDDING_CACHE_LRU_SIZE = int(os.getenv("EMBEDDING_CACHE_LRU_SIZE", 10000))
+# Rows persisted per model before the file stops growing (~1.5 KB per MiniLM row)
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", 500000))
+
+# Collections searched with BM25 + MiniLM fused by reciprocal rank fusion;
+# exact figures, scheme names and years are common in report questions
+HYBRID_SEARCH_COLLECTIONS = ["annual_report"]
+# Candidates each retriever contributes before fusion, and the RRF constant
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 20))
+RRF_K = int(os.getenv("RRF_K", 60))
@@ -1,5 +1,7 @@
+import sys
 import logging
 import json
+import importlib.util
 from typing import List, Dict, Optional, Union
 from pathlib import Path
 from datetime import datetime
@@ -13,15 +15,19 @@ except ImportError:
     chromadb = None
     CHROMADB_AVAILABLE = False
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SentenceTransformer = None
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+# sentence_transformers pulls in torch; only check it's installed here and
+# import it when an EmbeddingGenerator is actually built
+SENTENCE_TRANSFORMERS_AVAILABLE = (
+    "sentence_transformers" in sys.modules or importlib.util.find_spec("sentence_transformers") is not None
+)
 
 # Local imports
-from data.functions.parse_pdf import parse_pdf, parse_pdfs_from_directory
+from data.functions.ingestion_pipeline import IngestionPipeline
+from data.functions.ingestion_manifest import IngestionManifest
+from data.functions.embedding_cache import EmbeddingCache
+from data.functions.sparse_index import SparseIndex
+from data.functions.hybrid_search import fuse_results
+from configs.vector_db_config import EMBEDDING_CACHE_PATH, HYBRID_CANDIDATES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,22 +41,30 @@ class VectorDBError(Exception):
 
 class EmbeddingGenerator:
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", cache_path: Optional[str] = EMBEDDING_CACHE_PATH):
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise VectorDBError("sentence-transformers not available. Install with: pip install sentence-transformers")
         
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name)
+        # Repeated queries and re-ingested chunks are served from the cache
+        self.cache = EmbeddingCache.for_model(self._encode, model_name, cache_path=cache_path)
         logger.info(f"Initialized SentenceTransformer with model: {model_name}")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-     
+    def _encode(self, texts: List[str]) -> List[List[float]]:
         embeddings = self.model.encode(texts, convert_to_tensor=False)
         return embeddings.tolist()
+    
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+     
+        return self.cache.get_many(texts)
 
 
 class ChromaVectorDB:
     
-    def __init__(self, db_path: str = "../../chroma_db", collection_name: str = "pdf_documents"):
+    def __init__(self, db_path: str = "../../chroma_db", collection_name: str = "pdf_documents",
+                 client=None):
      
         if not CHROMADB_AVAILABLE:
             raise VectorDBError("ChromaDB not available. Install with: pip install chromadb")
@@ -58,8 +72,10 @@ class ChromaVectorDB:
         self.db_path = Path(db_path)
         self.db_path.mkdir(exist_ok=True)
         
-        self.client = chromadb.PersistentClient(path=str(self.db_path))
+        # Reuse an already opened client when given (see vector_db_registry)
+        self.client = client or chromadb.PersistentClient(path=str(self.db_path))
         self.collection_name = collection_name
+        self._sparse_index: Optional[SparseIndex] = None
         
         # Create or get collection
         try:
@@ -69,6 +85,40 @@ class ChromaVectorDB:
             self.collection = self.client.create_collection(name=collection_name)
             logger.info(f"Created new ChromaDB collection: {collection_name}")
     
+    @property
+    def sparse_index(self) -> SparseIndex:
+        """BM25 index of the same chunks, opened on first use."""
+        if self._sparse_index is None:
+            self._sparse_index = SparseIndex.for_collection(str(self.db_path), self.collection_name)
+        return self._sparse_index
+    
+    def _chunk_metadata(self, chunk: Dict, i: int) -> Dict:
+        # Prepare metadata (ChromaDB requires string values)
+        chunk_metadata = chunk.get('metadata', {})
+        return {
+            'source_file': str(chunk.get('source_file', '')),
+            'chunk_index': str(chunk.get('chunk_index', i)),
+            'file_hash': chunk.get('file_hash', ''),
+            'created_at': chunk.get('created_at', datetime.now().isoformat()),
+            'total_pages': str(chunk_metadata.get('total_pages', 0)),
+            'extraction_method': chunk_metadata.get('extraction_method', ''),
+            # Enhanced organizational metadata
+            'organization': chunk_metadata.get('organization', 'Unknown'),
+            'document_type': chunk_metadata.get('document_type', 'Unknown'),
+            'document_category': chunk_metadata.get('document_category', 'General'),
+            'publication_year': str(chunk_metadata.get('publication_year', 'Unknown')),
+            'language': chunk_metadata.get('language', 'Unknown'),
+            'document_title': chunk_metadata.get('document_title', ''),
+            'file_size_bytes': str(chunk_metadata.get('file_size_bytes', 0)),
+            'tags': ','.join(chunk_metadata.get('tags', [])),  # Convert list to comma-separated string
+            'chunk_size': str(chunk_metadata.get('chunk_size', 0)),
+            'total_chunks': str(chunk_metadata.get('total_chunks', 0)),
+            # Pages the chunk spans; page_number is where it starts
+            'page_number': str(chunk_metadata.get('page_number', '')),
+            'page_start': str(chunk_metadata.get('page_start', '')),
+            'page_end': str(chunk_metadata.get('page_end', ''))
+        }
+    
     def add_documents(self, chunks: List[Dict], embeddings: List[List[float]]):
       
         if len(chunks) != len(embeddings):
@@ -83,29 +133,7 @@ class ChromaVectorDB:
             chunk_id = f"{chunk.get('file_hash', 'unknown')}_{i}"
             ids.append(chunk_id)
             documents.append(chunk['text'])
-            
-            # Prepare metadata (ChromaDB requires string values)
-            chunk_metadata = chunk.get('metadata', {})
-            metadata = {
-                'source_file': str(chunk.get('source_file', '')),
-                'chunk_index': str(chunk.get('chunk_index', i)),
-                'file_hash': chunk.get('file_hash', ''),
-                'created_at': chunk.get('created_at', datetime.now().isoformat()),
-                'total_pages': str(chunk_metadata.get('total_pages', 0)),
-                'extraction_method': chunk_metadata.get('extraction_method', ''),
-                # Enhanced organizational metadata
-                'organization': chunk_metadata.get('organization', 'Unknown'),
-                'document_type': chunk_metadata.get('document_type', 'Unknown'),
-                'document_category': chunk_metadata.get('document_category', 'General'),
-                'publication_year': str(chunk_metadata.get('publication_year', 'Unknown')),
-                'language': chunk_metadata.get('language', 'Unknown'),
-                'document_title': chunk_metadata.get('document_title', ''),
-                'file_size_bytes': str(chunk_metadata.get('file_size_bytes', 0)),
-                'tags': ','.join(chunk_metadata.get('tags', [])),  # Convert list to comma-separated string
-                'chunk_size': str(chunk_metadata.get('chunk_size', 0)),
-                'total_chunks': str(chunk_metadata.get('total_chunks', 0))
-            }
-            metadatas.append(metadata)
+            metadatas.append(self._chunk_metadata(chunk, i))
         
         # Add to collection
         self.collection.add(
@@ -114,9 +142,30 @@ class ChromaVectorDB:
             documents=documents,
             metadatas=metadatas
         )
+        self.sparse_index.upsert(ids, documents, metadatas)
         
         logger.info(f"Added {len(chunks)} documents to ChromaDB collection")
     
+    def upsert_documents(self, chunks: List[Dict], embeddings: List[List[float]]):
+        """
+        Insert or overwrite chunks by their 'id', so re-running an ingestion
+        doesn't duplicate documents.
+        """
+        if len(chunks) != len(embeddings):
+            raise VectorDBError("Number of chunks must match number of embeddings")
+        
+        ids = [chunk['id'] for chunk in chunks]
+        documents = [chunk['text'] for chunk in chunks]
+        metadatas = [self._chunk_metadata(chunk, i) for i, chunk in enumerate(chunks)]
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        self.sparse_index.upsert(ids, documents, metadatas)
+    
+    def delete_documents(self, ids: List[str], batch_size: int = 1000):
+        for start in range(0, len(ids), batch_size):
+            self.collection.delete(ids=ids[start:start + batch_size])
+        self.sparse_index.delete(ids)
+        logger.info(f"Deleted {len(ids)} documents from ChromaDB collection")
+    
     def search(self, query_embedding: List[float], n_results: int = 5, 
                where_filter: Dict = None) -> Dict:
        
@@ -131,6 +180,20 @@ class ChromaVectorDB:
         results = self.collection.query(**query_params)
         return results
     
+    def rebuild_sparse_index(self, batch_size: int = 1000) -> int:
+        """Re-index every chunk already in Chroma (collections ingested before the BM25 index existed)."""
+        self.sparse_index.clear()
+        indexed, offset = 0, 0
+        while True:
+            batch = self.collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+            if not batch.get('ids'):
+                break
+            self.sparse_index.upsert(batch['ids'], batch['documents'], batch['metadatas'])
+            indexed += len(batch['ids'])
+            offset += batch_size
+        logger.info(f"Indexed {indexed} chunks of {self.collection_name} for BM25")
+        return indexed
+    
     def search_by_organization(self, query_embedding: List[float], 
                               organization: str, n_results: int = 5) -> Dict:
         """
@@ -160,7 +223,9 @@ class PDFVectorDBManager:
                  vector_db_type: str = "chroma",
                  embedding_method: str = "sentence_transformers",
                  db_path: str = None,
-                 collection_name: str = "krishi_sakha_docs"):
+                 collection_name: str = "krishi_sakha_docs",
+                 embedding_generator: Optional[EmbeddingGenerator] = None,
+                 client=None):
        
         if vector_db_type != "chroma":
             raise VectorDBError(f"Only ChromaDB is supported, got: {vector_db_type}")
@@ -170,15 +235,40 @@ class PDFVectorDBManager:
         self.vector_db_type = vector_db_type
         self.embedding_method = embedding_method
         
-        # Initialize embedding generator
-        self.embedding_generator = EmbeddingGenerator()
+        # Initialize embedding generator (shared one if provided)
+        self.embedding_generator = embedding_generator or EmbeddingGenerator()
         
         # Initialize ChromaDB
         db_path = db_path or "./chroma_db"
-        self.vector_db = ChromaVectorDB(db_path=db_path, collection_name=collection_name)
+        self.vector_db = ChromaVectorDB(db_path=db_path, collection_name=collection_name, client=client)
         
         logger.info(f"Initialized PDFVectorDBManager with ChromaDB and sentence-transformers")
     
+    def _ingestion_pipeline(self, chunk_size: int, chunk_overlap: int, force: bool,
+                            **pipeline_options) -> IngestionPipeline:
+        # The manifest sits next to the Chroma files; only ingestion opens it
+        manifest = IngestionManifest.for_collection(str(self.vector_db.db_path), self.vector_db.collection_name)
+        return IngestionPipeline(
+            self.embedding_generator,
+            self.vector_db,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            manifest=manifest,
+            force=force,
+            **pipeline_options
+        )
+    
+    def _log_ingestion(self, stats: Dict):
+        for pdf_path, error in stats['failed'].items():
+            logger.warning(f"Skipped {pdf_path}: {error}")
+        logger.info(
+            f"Processed {stats['pdfs']} PDFs ({stats['skipped_pdfs']} unchanged, "
+            f"{stats['changed_pages']} changed pages): {stats['chunks']} chunks embedded, "
+            f"{stats['reused_chunks']} kept, {stats['deleted_chunks']} deleted "
+            f"in {stats['elapsed']:.1f}s ({stats['pages_per_sec']:.1f} pages/s, "
+            f"{stats['chunks_per_sec']:.1f} chunks/s)"
+        )
+    
     def add_pdf_to_db(self, pdf_path: Union[str, Path], 
                      chunk_size: int = 1000, chunk_overlap: int = 200,
                      organization: str = None,
@@ -187,63 +277,84 @@ class PDFVectorDBManager:
                      year: str = None,
                      language: str = None,
                      tags: List[str] = None,
-                     custom_metadata: Dict = None):
-      
-        logger.info(f"Processing PDF: {pdf_path}")
+                     custom_metadata: Dict = None,
+                     force: bool = False,
+                     **pipeline_options) -> Dict:
+        """
+        Ingest one PDF; re-running it only re-embeds pages that changed.
         
-        # Parse PDF into chunks with enhanced metadata
-        chunks = parse_pdf(
-            pdf_path=pdf_path, 
-            chunk_size=chunk_size, 
-            chunk_overlap=chunk_overlap,
-            organization=organization,
-            document_type=document_type,
-            document_category=document_category,
-            year=year,
-            language=language,
-            tags=tags,
-            custom_metadata=custom_metadata
-        )
+        Returns:
+            Dict: IngestionPipeline stats
+        """
+        logger.info(f"Processing PDF: {pdf_path}")
         
-        if not chunks:
-            logger.warning(f"No chunks extracted from PDF: {pdf_path}")
-            return
+        document_metadata = dict(custom_metadata or {})
+        document_metadata.update({
+            'organization': organization,
+            'document_type': document_type,
+            'document_category': document_category,
+            'publication_year': year,
+            'language': language,
+            'tags': tags,
+        })
+        pipeline = self._ingestion_pipeline(chunk_size, chunk_overlap, force, **pipeline_options)
+        stats = pipeline.run([pdf_path], document_metadata)
         
-        # Extract text for embedding generation
-        texts = [chunk['text'] for chunk in chunks]
+        error = stats['failed'].get(str(Path(pdf_path)))
+        if error:
+            raise VectorDBError(f"Could not ingest {pdf_path}: {error}")
+        self._log_ingestion(stats)
+        return stats
+    
+    def add_pdf_directory_to_db(self, directory_path: Union[str, Path], 
+                               chunk_size: int = 1000, chunk_overlap: int = 200,
+                               organization: str = None,
+                               document_type: str = None,
+                               document_category: str = None,
+                               year: str = None,
+                               language: str = None,
+                               tags: List[str] = None,
+                               force: bool = False,
+                               **pipeline_options) -> Dict:
+        """
+        Stream every PDF in a directory through the IngestionPipeline.
         
-        # Generate embeddings
-        logger.info(f"Generating embeddings for {len(texts)} chunks")
-        embeddings = self.embedding_generator.generate_embeddings(texts)
+        Unchanged PDFs are skipped, changed ones only re-embed the page ranges
+        that changed, and chunks of PDFs removed from the directory are
+        deleted. force re-embeds everything. pipeline_options (workers,
+        pages_per_task, embed_batch_size, upsert_batch_size, ...) override the
+        INGEST_* config values.
         
-        # Add to vector database
-        self.vector_db.add_documents(chunks, embeddings)
+        Returns:
+            Dict: pages/chunks ingested, throughput and failed PDFs
+        """
+        directory_path = Path(directory_path)
+        if not directory_path.exists():
+            raise FileNotFoundError(f"Directory not found: {directory_path}")
         
-        logger.info(f"Successfully added PDF to vector database: {pdf_path}")
-    
-    def add_pdf_directory_to_db(self, directory_path: Union[str, Path], 
-                               chunk_size: int = 1000, chunk_overlap: int = 200):
-      
         logger.info(f"Processing PDF directory: {directory_path}")
+        pdf_files = sorted(directory_path.glob("*.pdf"))
+        if not pdf_files:
+            logger.warning(f"No PDFs found in directory: {directory_path}")
         
-        # Parse all PDFs in directory
-        pdf_chunks = parse_pdfs_from_directory(directory_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        
-        if not pdf_chunks:
-            logger.warning(f"No PDFs found or processed in directory: {directory_path}")
-            return
+        pipeline = self._ingestion_pipeline(chunk_size, chunk_overlap, force, **pipeline_options)
+        stats = pipeline.run(pdf_files, {
+            'organization': organization,
+            'document_type': document_type,
+            'document_category': document_category,
+            'publication_year': year,
+            'language': language,
+            'tags': tags,
+        })
         
-        # Process each PDF's chunks
-        total_chunks = 0
-        for pdf_path, chunks in pdf_chunks.items():
-            if chunks:
-                texts = [chunk['text'] for chunk in chunks]
-                embeddings = self.embedding_generator.generate_embeddings(texts)
-                self.vector_db.add_documents(chunks, embeddings)
-                total_chunks += len(chunks)
-                logger.info(f"Added {len(chunks)} chunks from {pdf_path}")
+        present = {str(path.resolve()) for path in pdf_files}
+        missing = [source for source in pipeline.manifest.sources()
+                   if Path(source).parent == directory_path.resolve() and source not in present]
+        pipeline.remove_documents(missing)
         
-        logger.info(f"Successfully processed {len(pdf_chunks)} PDFs with {total_chunks} total chunks")
+        stats = pipeline.stats.snapshot()
+        self._log_ingestion(stats)
+        return stats
     
     def search_documents(self, query: str, n_results: int = 5, 
                         organization: str = None,
@@ -256,6 +367,18 @@ class PDFVectorDBManager:
         query_embedding = self.embedding_generator.generate_embeddings([query])[0]
         
         # Build metadata filter for ChromaDB
+        where_filter = self._where_filter(organization, document_type, document_category, year, language)
+        
+        # Search in vector database
+        if where_filter:
+            results = self.vector_db.search(query_embedding, n_results=n_results, where_filter=where_filter)
+        else:
+            results = self.vector_db.search(query_embedding, n_results=n_results)
+            
+        return results
+    
+    def _where_filter(self, organization: str = None, document_type: str = None, document_category: str = None,
+                      year: str = None, language: str = None) -> Dict:
         where_filter = {}
         if organization:
             where_filter['organization'] = organization
@@ -267,14 +390,34 @@ class PDFVectorDBManager:
             where_filter['publication_year'] = str(year)
         if language:
             where_filter['language'] = language
+        return where_filter
+    
+    def hybrid_search(self, query: str, n_results: int = 5,
+                      organization: str = None,
+                      document_type: str = None,
+                      document_category: str = None,
+                      year: str = None,
+                      language: str = None,
+                      candidates: int = HYBRID_CANDIDATES) -> Dict:
+        """
+        MiniLM and BM25 search fused by reciprocal rank fusion.
         
-        # Search in vector database
-        if where_filter:
-            results = self.vector_db.search(query_embedding, n_results=n_results, where_filter=where_filter)
-        else:
-            results = self.vector_db.search(query_embedding, n_results=n_results)
-            
-        return results
+        Takes the same filters as search_documents and returns the same
+        layout, plus "rrf_scores" and "retrievers" per hit. Falls back to
+        vector-only results while the BM25 index is empty.
+        """
+        candidates = max(candidates, n_results)
+        where_filter = self._where_filter(organization, document_type, document_category, year, language)
+        
+        query_embedding = self.embedding_generator.generate_embeddings([query])[0]
+        dense = self.vector_db.search(query_embedding, n_results=candidates, where_filter=where_filter or None)
+        
+        sparse = self.vector_db.sparse_index.search(query, n_results=candidates, where_filter=where_filter)
+        if not sparse and not len(self.vector_db.sparse_index):
+            logger.warning(f"BM25 index for {self.vector_db.collection_name} is empty; "
+                           f"run add_pdfs_to_vectordb.py --rebuild-sparse-index")
+        
+        return fuse_results(dense, sparse, n_results)
     
     def search_by_organization(self, query: str, organization: str, n_results: int = 5) -> Dict:
         """
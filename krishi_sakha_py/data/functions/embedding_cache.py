@@ -0,0 +1,319 @@
+"""
+Memoising layer for EmbeddingGenerator.
+
+The router hands the same keywords over and over, search_documents falls
+back to embedding the raw prompt, and re-ingesting a PDF re-encodes
+identical chunks. Embeddings are cached under sha1(model name + normalised
+text): first in an in-process LRU, then in a memory-mapped float32 file per
+model that survives restarts. Misses from concurrent callers are coalesced:
+the same text is never encoded twice at once, and misses that arrive within
+max_wait_ms of each other go to the model as one batch.
+"""
+
+import os
+import json
+import mmap
+import time
+import hashlib
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from configs.vector_db_config import (
+    EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_LRU_SIZE, EMBEDDING_CACHE_MAX_ROWS
+)
+
+logger = logging.getLogger(__name__)
+
+# embed(texts) -> one vector per text
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+FLOAT_BYTES = array('f').itemsize
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    return hashlib.sha1(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class MmapVectorStore:
+    """
+    Append-only float32 vectors on disk, read through mmap.
+
+    vectors.f32 holds the rows back to back; keys.txt maps "key row" per
+    line. Rows are appended under an flock and their row number is taken
+    from the file size, so several processes can share one store.
+    """
+
+    def __init__(self, directory: str, max_rows: int = EMBEDDING_CACHE_MAX_ROWS):
+        self.directory = Path(directory)
+        self.max_rows = max_rows
+        self.vectors_path = self.directory / "vectors.f32"
+        self.keys_path = self.directory / "keys.txt"
+        self.meta_path = self.directory / "meta.json"
+
+        self.dim: Optional[int] = None
+        if self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text()).get("dim")
+
+        self._rows: Dict[str, int] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        self._load_keys()
+
+    def _row_bytes(self) -> int:
+        return self.dim * FLOAT_BYTES
+
+    def _load_keys(self):
+        if not self.keys_path.exists() or not self.dim:
+            return
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        owners: Dict[int, str] = {}
+        with open(self.keys_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                # Ignore torn lines and rows whose vector never made it to disk
+                if len(parts) == 2 and (int(parts[1]) + 1) * self._row_bytes() <= size:
+                    row = int(parts[1])
+                    # A row truncated after a crash is reused; the later key owns it
+                    self._rows.pop(owners.get(row), None)
+                    owners[row] = parts[0]
+                    self._rows[parts[0]] = row
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size:
+            with open(self.vectors_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, key: str) -> Optional[array]:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        with self._lock:
+            start, end = row * self._row_bytes(), (row + 1) * self._row_bytes()
+            if self._map is None or len(self._map) < end:
+                self._remap()
+            vector = array('f')
+            vector.frombytes(self._map[start:end])
+        return vector
+
+    def put_many(self, items: Dict[str, array]):
+        items = {key: vector for key, vector in items.items() if key not in self._rows}
+        if not items or len(self._rows) >= self.max_rows:
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = len(next(iter(items.values())))
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self.meta_path.write_text(json.dumps({"dim": self.dim}))
+
+            with open(self.vectors_path, 'ab') as vectors, open(self.keys_path, 'a', encoding='utf-8') as keys:
+                if fcntl is not None:
+                    fcntl.flock(vectors.fileno(), fcntl.LOCK_EX)
+                try:
+                    vectors.seek(0, os.SEEK_END)
+                    first_row = vectors.tell() // self._row_bytes()
+                    if vectors.tell() != first_row * self._row_bytes():
+                        # A torn append left part of a row; drop it or every
+                        # later row would sit at a misaligned offset
+                        vectors.truncate(first_row * self._row_bytes())
+                    lines = []
+                    for offset, (key, vector) in enumerate(items.items()):
+                        if len(vector) != self.dim:
+                            raise ValueError(f"Embedding has {len(vector)} dims, store expects {self.dim}")
+                        vectors.write(vector.tobytes())
+                        lines.append(f"{key} {first_row + offset}\n")
+                    vectors.flush()
+                    # Keys only after their vectors are on disk
+                    keys.write("".join(lines))
+                    keys.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(vectors.fileno(), fcntl.LOCK_UN)
+
+            for line in lines:
+                key, row = line.split()
+                self._rows[key] = int(row)
+
+
+class EmbeddingCache:
+    """LRU + optional MmapVectorStore in front of an embedding function."""
+
+    def __init__(self,
+                 embed: EmbedFn,
+                 model_name: str,
+                 store: Optional[MmapVectorStore] = None,
+                 lru_size: int = EMBEDDING_CACHE_LRU_SIZE,
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0):
+        self.embed = embed
+        self.model_name = model_name
+        self.store = store
+        self.lru_size = lru_size
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._lru: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._queue: List = []
+        self._draining = False
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    @classmethod
+    def for_model(cls, embed: EmbedFn, model_name: str, cache_path: Optional[str] = EMBEDDING_CACHE_PATH):
+        """Cache persisted under cache_path/<model name>, or memory-only if cache_path is empty."""
+        store = None
+        if cache_path:
+            try:
+                store = MmapVectorStore(str(Path(cache_path) / model_name.replace("/", "__")))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Embedding cache on disk unavailable ({e}); using memory only")
+        return cls(embed, model_name, store=store)
+
+    def _remember(self, key: str, vector: array):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings for texts, in order; only uncached texts are encoded."""
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        found: Dict[str, array] = {}
+        missing: Dict[str, str] = {}
+
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                    self.memory_hits += 1
+                else:
+                    missing[key] = text
+
+        if missing and self.store is not None:
+            # Disk reads outside the cache lock so memory hits never wait on them
+            from_disk = {key: self.store.get(key) for key in missing}
+            from_disk = {key: vector for key, vector in from_disk.items() if vector is not None}
+            with self._lock:
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+            found.update(from_disk)
+            missing = {key: text for key, text in missing.items() if key not in from_disk}
+
+        if missing:
+            found.update(self._embed_misses(missing))
+        return [found[key].tolist() for key in keys]
+
+    def _embed_misses(self, missing: Dict[str, str]) -> Dict[str, array]:
+        futures = {}
+        lead = False
+        with self._lock:
+            for key, text in missing.items():
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = Future()
+                    self._in_flight[key] = future
+                    self._queue.append((key, normalize_text(text), future))
+                    self.misses += 1
+                else:
+                    # Another caller is already encoding this text
+                    self.coalesced += 1
+                futures[key] = future
+            if self._queue and not self._draining:
+                self._draining = lead = True
+
+        if lead:
+            self._drain()
+        return {key: future.result() for key, future in futures.items()}
+
+    def _drain(self):
+        """Encode queued misses in batches until the queue is empty (one thread at a time)."""
+        batch = []
+        try:
+            while True:
+                if self.max_wait_ms:
+                    # Give concurrent callers a moment to add their misses to this batch
+                    time.sleep(self.max_wait_ms / 1000)
+                with self._lock:
+                    batch = self._queue[:self.max_batch_size]
+                    self._queue = self._queue[self.max_batch_size:]
+                    if not batch:
+                        self._draining = False
+                        return
+
+                try:
+                    vectors = [array('f', vector) for vector in self.embed([text for _, text, _ in batch])]
+                except Exception as e:
+                    with self._lock:
+                        for key, _, future in batch:
+                            self._in_flight.pop(key, None)
+                            future.set_exception(e)
+                    continue
+
+                new_vectors = {key: vector for (key, _, _), vector in zip(batch, vectors)}
+                if self.store is not None:
+                    try:
+                        self.store.put_many(new_vectors)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Could not persist {len(new_vectors)} embeddings: {e}")
+
+                with self._lock:
+                    self.batches += 1
+                    for (key, _, future), vector in zip(batch, vectors):
+                        self._remember(key, vector)
+                        self._in_flight.pop(key, None)
+                        future.set_result(vector)
+        except BaseException as e:
+            # Anything the loop doesn't handle must not leave later misses
+            # waiting on a drain that is no longer running
+            with self._lock:
+                self._draining = False
+                pending, self._queue = batch + self._queue, []
+                for key, _, future in pending:
+                    self._in_flight.pop(key, None)
+                    if not future.done():
+                        future.set_exception(e)
+            raise
+
+    def stats(self) -> Dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses + self.coalesced
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "avg_batch_size": self.misses / self.batches if self.batches else 0.0,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "lru_entries": len(self._lru),
+            "disk_entries": len(self.store) if self.store is not None else 0,
+        }
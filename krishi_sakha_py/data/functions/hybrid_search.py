@@ -0,0 +1,77 @@
+"""
+Reciprocal rank fusion of Chroma (MiniLM) and BM25 results.
+
+RRF scores each chunk by sum(1 / (k + rank)) over the rankings it appears
+in. It needs no score calibration between cosine distances and BM25, and a
+chunk that both retrievers rank well beats one that only one of them likes.
+The fused result keeps Chroma's query() layout, so flatten_docs and
+format_search_results work unchanged.
+"""
+
+from typing import Dict, List, Tuple
+
+from configs.vector_db_config import RRF_K
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists.
+
+    Returns:
+        [(id, score)] best first; ties keep first-seen order
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, 1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def _first(results: Dict, key: str) -> List:
+    values = results.get(key) or []
+    return values[0] if values and isinstance(values[0], list) else values
+
+
+def fuse_results(dense: Dict, sparse: List[Dict], n_results: int, k: int = RRF_K) -> Dict:
+    """
+    Fuse a Chroma query() result with SparseIndex.search() hits.
+
+    Returns:
+        Chroma-style {"ids", "documents", "metadatas", "distances"} (one
+        query deep) plus "rrf_scores" and "retrievers" per hit. distances
+        is None for chunks only BM25 found.
+    """
+    hits: Dict[str, Dict] = {}
+    for chunk_id, document, metadata, distance in zip(
+            _first(dense, "ids"), _first(dense, "documents"), _first(dense, "metadatas"), _first(dense, "distances")):
+        hits[chunk_id] = {"document": document, "metadata": metadata, "distance": distance, "retrievers": ["vector"]}
+    for hit in sparse:
+        if hit["id"] in hits:
+            hits[hit["id"]]["retrievers"].append("bm25")
+        else:
+            hits[hit["id"]] = {"document": hit["document"], "metadata": hit["metadata"], "distance": None,
+                               "retrievers": ["bm25"]}
+
+    fused = reciprocal_rank_fusion([_first(dense, "ids"), [hit["id"] for hit in sparse]], k=k)[:n_results]
+    ids = [chunk_id for chunk_id, _ in fused]
+    return {
+        "ids": [ids],
+        "documents": [[hits[chunk_id]["document"] for chunk_id in ids]],
+        "metadatas": [[hits[chunk_id]["metadata"] for chunk_id in ids]],
+        "distances": [[hits[chunk_id]["distance"] for chunk_id in ids]],
+        "rrf_scores": [[score for _, score in fused]],
+        "retrievers": [[hits[chunk_id]["retrievers"] for chunk_id in ids]],
+    }
+
+
+def hit_at_k(relevance: List[bool], k: int) -> float:
+    """1.0 if any of the top k results is relevant (relevance flags in rank order)."""
+    return 1.0 if any(relevance[:k]) else 0.0
+
+
+def reciprocal_rank(relevance: List[bool]) -> float:
+    """1 / rank of the first relevant result, 0.0 when none is."""
+    for rank, relevant in enumerate(relevance, start=1):
+        if relevant:
+            return 1.0 / rank
+    return 0.0
@@ -0,0 +1,135 @@
+"""
+Record of what has been ingested into each Chroma collection.
+
+Per PDF the manifest keeps the file hash (with the size and mtime it was
+taken at, so an untouched file isn't hashed again), a hash of each page's
+text and, per extracted page range, a key over that range's chunker input
+together with the chunk ids it produced. IngestionPipeline uses it to skip
+unchanged files, re-embed only ranges whose pages changed and delete
+chunks that no longer exist. It lives next to the Chroma files, so wiping
+the database also wipes the manifest.
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "ingestion_manifest.sqlite3"
+
+
+class IngestionManifest:
+    """SQLite store of documents, page hashes and range chunk ids per collection."""
+
+    def __init__(self, db_path: str, collection_name: str):
+        self.db_path = str(db_path)
+        self.collection_name = collection_name
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " collection TEXT NOT NULL, source TEXT NOT NULL, file_hash TEXT NOT NULL,"
+            " signature TEXT NOT NULL, total_pages INTEGER NOT NULL, updated_at TEXT NOT NULL,"
+            " PRIMARY KEY (collection, source));"
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " collection TEXT NOT NULL, source TEXT NOT NULL, page INTEGER NOT NULL, text_hash TEXT NOT NULL,"
+            " PRIMARY KEY (collection, source, page));"
+            "CREATE TABLE IF NOT EXISTS ranges ("
+            " collection TEXT NOT NULL, source TEXT NOT NULL, start_page INTEGER NOT NULL,"
+            " range_key TEXT NOT NULL, chunk_ids TEXT NOT NULL,"
+            " PRIMARY KEY (collection, source, start_page));"
+        )
+        # Manifests written before the stat columns existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+        for column in ("file_size", "file_mtime_ns"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE documents ADD COLUMN {column} INTEGER")
+        self._conn.commit()
+
+    @classmethod
+    def for_collection(cls, chroma_path: str, collection_name: str) -> "IngestionManifest":
+        return cls(str(Path(chroma_path) / MANIFEST_FILE_NAME), collection_name)
+
+    def get(self, source: str) -> Optional[Dict]:
+        """
+        Returns:
+            {"file_hash", "signature", "total_pages", "file_size", "file_mtime_ns",
+             "pages": {page: hash},
+             "ranges": {start_page: {"key", "chunk_ids"}}} or None
+        """
+        key = (self.collection_name, source)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_hash, signature, total_pages, file_size, file_mtime_ns FROM documents"
+                " WHERE collection = ? AND source = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            pages = self._conn.execute(
+                "SELECT page, text_hash FROM pages WHERE collection = ? AND source = ?", key).fetchall()
+            ranges = self._conn.execute(
+                "SELECT start_page, range_key, chunk_ids FROM ranges WHERE collection = ? AND source = ?", key
+            ).fetchall()
+        return {
+            "file_hash": row[0],
+            "signature": row[1],
+            "total_pages": row[2],
+            "file_size": row[3],
+            "file_mtime_ns": row[4],
+            "pages": dict(pages),
+            "ranges": {start: {"key": range_key, "chunk_ids": json.loads(chunk_ids)}
+                       for start, range_key, chunk_ids in ranges},
+        }
+
+    def put(self, source: str, entry: Dict):
+        """Replace everything recorded for source in one transaction."""
+        key = (self.collection_name, source)
+        with self._lock, self._conn:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO documents (collection, source, file_hash, signature, total_pages, updated_at,"
+                " file_size, file_mtime_ns) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (entry["file_hash"], entry["signature"], entry["total_pages"], datetime.now().isoformat(),
+                       entry.get("file_size"), entry.get("file_mtime_ns")))
+            self._conn.executemany(
+                "INSERT INTO pages (collection, source, page, text_hash) VALUES (?, ?, ?, ?)",
+                [key + (page, text_hash) for page, text_hash in entry["pages"].items()])
+            self._conn.executemany(
+                "INSERT INTO ranges (collection, source, start_page, range_key, chunk_ids) VALUES (?, ?, ?, ?, ?)",
+                [key + (start, value["key"], json.dumps(value["chunk_ids"]))
+                 for start, value in entry["ranges"].items()])
+
+    def update_stat(self, source: str, file_size: int, file_mtime_ns: Optional[int]):
+        """Record a new size/mtime for a file whose content hash didn't change."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE documents SET file_size = ?, file_mtime_ns = ? WHERE collection = ? AND source = ?",
+                (file_size, file_mtime_ns, self.collection_name, source))
+
+    def remove(self, source: str) -> List[str]:
+        """Forget source and return the chunk ids it had."""
+        entry = self.get(source)
+        with self._lock, self._conn:
+            self._delete((self.collection_name, source))
+        if entry is None:
+            return []
+        return [chunk_id for value in entry["ranges"].values() for chunk_id in value["chunk_ids"]]
+
+    def _delete(self, key):
+        for table in ("documents", "pages", "ranges"):
+            self._conn.execute(f"DELETE FROM {table} WHERE collection = ? AND source = ?", key)
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source FROM documents WHERE collection = ? ORDER BY source", (self.collection_name,)
+            ).fetchall()
+        return [row[0] for row in rows]
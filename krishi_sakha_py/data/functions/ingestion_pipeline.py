@@ -0,0 +1,474 @@
+"""
+Streaming PDF ingestion into Chroma.
+
+add_pdf_directory_to_db used to parse every PDF serially, keep all their
+chunks in memory, embed each PDF in one unbounded model.encode call and
+insert it in one collection.add. The pipeline below streams instead:
+
+    page ranges --(process pool)--> chunker --(bounded queue)--> embed + upsert
+
+- Page ranges of every PDF are extracted in worker processes, with a fixed
+  number of ranges in flight, and consumed in order.
+- Each range is chunked as it arrives by a PageChunkBuffer, which tags
+  chunks with the pages they span and carries the last chunk into the
+  next range so chunks still flow across range borders.
+- A bounded queue feeds a thread that embeds fixed-size batches and upserts
+  them into Chroma in chunks, which also gives backpressure to extraction.
+
+Memory stays bounded by the configured batch sizes, not by the number of
+pages, and progress is reported in pages/sec and chunks/sec.
+
+With an IngestionManifest, re-runs are incremental: PDFs whose hash and
+ingestion settings are unchanged are not opened at all (nor hashed, when
+their size and mtime still match the manifest), a page range whose
+chunker input is unchanged is not re-embedded, and chunks that disappeared
+are deleted once the PDF's new chunks are in. Chunk ids are
+"<document key>_<range start page>_<n>", so an unchanged range keeps its ids.
+"""
+
+import json
+import time
+import queue
+import hashlib
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from configs.ingestion_config import (
+    INGEST_WORKERS, INGEST_PAGES_PER_TASK, INGEST_TASKS_PER_WORKER, INGEST_EMBED_BATCH_SIZE,
+    INGEST_UPSERT_BATCH_SIZE, INGEST_QUEUE_BATCHES, INGEST_PROGRESS_INTERVAL
+)
+from data.functions.parse_pdf import PDFParser, PageChunkBuffer, count_pdf_pages, extract_page_texts
+from data.functions.ingestion_manifest import IngestionManifest
+
+logger = logging.getLogger(__name__)
+
+# A file modified this recently can change again within the same mtime tick,
+# so its mtime isn't recorded and the next run hashes it
+STAT_RACE_SECONDS = 2.0
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _recorded_stat(stat) -> Dict:
+    recent = time.time() - stat.st_mtime < STAT_RACE_SECONDS
+    return {"file_size": stat.st_size, "file_mtime_ns": None if recent else stat.st_mtime_ns}
+
+
+def _spawn_pool(max_workers: int) -> ProcessPoolExecutor:
+    # spawn, not fork: the parent already holds torch threads from the embedder
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+class IngestionStats:
+    """Counters shared by the extraction and embedding stages."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.pdfs = 0
+        self.pages = 0
+        self.chunks_embedded = 0
+        self.chunks_upserted = 0
+        self.skipped_pdfs = 0
+        self.changed_pages = 0
+        self.reused_chunks = 0
+        self.deleted_chunks = 0
+        self.failed: Dict[str, str] = {}
+
+    def snapshot(self) -> Dict:
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "pdfs": self.pdfs,
+            "failed": dict(self.failed),
+            "pages": self.pages,
+            "chunks": self.chunks_upserted,
+            "skipped_pdfs": self.skipped_pdfs,
+            "changed_pages": self.changed_pages,
+            "reused_chunks": self.reused_chunks,
+            "deleted_chunks": self.deleted_chunks,
+            "elapsed": elapsed,
+            "pages_per_sec": self.pages / elapsed if elapsed else 0.0,
+            "chunks_per_sec": self.chunks_upserted / elapsed if elapsed else 0.0,
+        }
+
+
+class IngestionPipeline:
+    """Extract, chunk, embed and upsert PDFs with bounded memory."""
+
+    def __init__(self,
+                 embedding_generator,
+                 vector_db,
+                 chunk_size: int = 1000,
+                 chunk_overlap: int = 200,
+                 workers: int = INGEST_WORKERS,
+                 pages_per_task: int = INGEST_PAGES_PER_TASK,
+                 tasks_per_worker: int = INGEST_TASKS_PER_WORKER,
+                 embed_batch_size: int = INGEST_EMBED_BATCH_SIZE,
+                 upsert_batch_size: int = INGEST_UPSERT_BATCH_SIZE,
+                 queue_batches: int = INGEST_QUEUE_BATCHES,
+                 progress_interval: float = INGEST_PROGRESS_INTERVAL,
+                 on_progress: Optional[Callable[[Dict], None]] = None,
+                 executor_factory: Callable = _spawn_pool,
+                 page_counter: Callable = count_pdf_pages,
+                 page_extractor: Callable = extract_page_texts,
+                 manifest: Optional[IngestionManifest] = None,
+                 force: bool = False):
+        self.embedding_generator = embedding_generator
+        self.vector_db = vector_db
+        self.parser = PDFParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        self.max_in_flight = max(1, workers * tasks_per_worker)
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_batches = queue_batches
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress
+        self.executor_factory = executor_factory
+        self.page_counter = page_counter
+        self.page_extractor = page_extractor
+        self.manifest = manifest
+        # Re-embed everything, but still record the run and delete stale chunks
+        self.force = force
+
+        self.stats = IngestionStats()
+        self._last_report = 0.0
+
+    # ------------------------------------------------------------------
+    # Extraction + chunking (calling thread)
+    # ------------------------------------------------------------------
+
+    def _open_document(self, pdf_path: Path, document_metadata: Dict) -> Optional[Dict]:
+        document_metadata = {key: value for key, value in document_metadata.items() if value is not None}
+        source = str(pdf_path.resolve())
+        # Changing these re-chunks or re-labels every chunk, like a content change
+        signature = _sha1(json.dumps({
+            "metadata": document_metadata,
+            "chunk_size": self.parser.chunk_size,
+            "chunk_overlap": self.parser.chunk_overlap,
+            "min_chunk_size": self.parser.min_chunk_size,
+        }, sort_keys=True, default=str))
+        old = self.manifest.get(source) if self.manifest is not None else None
+
+        try:
+            # Before hashing: if the file changes meanwhile the stats won't match next time
+            stat = pdf_path.stat()
+            if (old is not None and old["file_mtime_ns"] is not None and old["file_size"] == stat.st_size
+                    and old["file_mtime_ns"] == stat.st_mtime_ns):
+                file_hash = old["file_hash"]
+            else:
+                file_hash = self.parser._generate_file_hash(str(pdf_path))
+            unchanged = (not self.force and old is not None
+                         and old["file_hash"] == file_hash and old["signature"] == signature)
+            if unchanged:
+                # Only the manifest entry is needed; don't parse the page tree
+                total_pages, method = old["total_pages"], None
+            else:
+                total_pages, method = self.page_counter(pdf_path)
+        except Exception as e:
+            self.stats.failed[str(pdf_path)] = str(e)
+            logger.error(f"Failed to open {pdf_path}: {e}")
+            return None
+
+        metadata = {
+            'total_pages': total_pages,
+            'extraction_method': method,
+            'file_path': str(pdf_path),
+            'file_name': pdf_path.name,
+            'file_hash': file_hash,
+            'organization': 'Unknown',
+            'document_type': 'Unknown',
+            'document_category': 'General',
+            'publication_year': 'Unknown',
+            'language': 'Unknown',
+            'tags': [],
+            'document_title': pdf_path.stem,
+            'file_size_bytes': stat.st_size,
+        }
+        metadata.update(document_metadata)
+
+        return {
+            "buffer": PageChunkBuffer(self.parser, metadata),
+            "path": pdf_path,
+            "source": source,
+            "key": _sha1(source)[:16],
+            "signature": signature,
+            "old": old,
+            "unchanged": unchanged,
+            "stat": _recorded_stat(stat),
+            "metadata": metadata,
+            "total_pages": total_pages,
+            "failed": False,
+            "pages": {},
+            "ranges": {},
+            "embedded": 0,
+            # Ids sent for upserting, to undo them if a later range fails
+            "embedded_ids": [],
+        }
+
+    def _tasks(self, pdf_paths: Iterable[Path], document_metadata: Dict):
+        """(document, start_page, end_page, is_last) for every page range, PDF by PDF."""
+        for pdf_path in pdf_paths:
+            document = self._open_document(pdf_path, document_metadata)
+            if document is None:
+                continue
+            if document["total_pages"] == 0:
+                self.stats.failed[str(pdf_path)] = "PDF has no pages"
+                continue
+            if document["unchanged"]:
+                self.stats.skipped_pdfs += 1
+                logger.debug(f"Unchanged, skipping {pdf_path}")
+                old, recorded = document["old"], document["stat"]
+                if (old["file_size"], old["file_mtime_ns"]) != (recorded["file_size"], recorded["file_mtime_ns"]):
+                    # Touched but identical: vouch for the new mtime so the next run doesn't hash it
+                    self.manifest.update_stat(document["source"], **recorded)
+                continue
+            for start in range(1, document["total_pages"] + 1, self.pages_per_task):
+                end = min(start + self.pages_per_task, document["total_pages"] + 1)
+                yield document, start, end, end > document["total_pages"]
+
+    def _chunk_range(self, document: Dict, start_page: int, pages, is_last: bool) -> List[Dict]:
+        """Chunk one page range; returns only the chunks that need embedding."""
+        old_pages = document["old"]["pages"] if document["old"] else {}
+        for page_num, page_text in pages:
+            document["pages"][page_num] = _sha1(page_text)
+            if old_pages.get(page_num) != document["pages"][page_num]:
+                self.stats.changed_pages += 1
+
+        buffer = document["buffer"]
+        for page_num, page_text in pages:
+            buffer.add_page(page_num, page_text)
+        # Covers the pages held back from the previous range too; the last
+        # range also flushes the held-back tail, so it chunks differently
+        range_key = _sha1(document["signature"] + str(is_last) + buffer.fingerprint())
+        chunks = buffer.drain(final=is_last)
+
+        # Same chunker input, same chunks: keep what is already in Chroma
+        old_range = document["old"]["ranges"].get(start_page) if document["old"] else None
+        if not self.force and old_range is not None and old_range["key"] == range_key:
+            document["ranges"][start_page] = old_range
+            self.stats.reused_chunks += len(old_range["chunk_ids"])
+            return []
+
+        file_hash = document["metadata"]["file_hash"]
+        chunk_ids = []
+        for n, chunk in enumerate(chunks):
+            chunk_ids.append(f"{document['key']}_{start_page}_{n}")
+            chunk.update({
+                "id": chunk_ids[-1],
+                "chunk_index": chunk["metadata"]["chunk_index"],
+                "file_hash": file_hash,
+                "source_file": str(document["path"]),
+                "created_at": datetime.now().isoformat(),
+            })
+        document["ranges"][start_page] = {"key": range_key, "chunk_ids": chunk_ids}
+        document["embedded"] += len(chunks)
+        document["embedded_ids"].extend(chunk_ids)
+        return chunks
+
+    def _commit(self, document: Dict):
+        """Delete chunks the new version no longer has and record it (consumer thread, after its upserts)."""
+        new_ids = {chunk_id for value in document["ranges"].values() for chunk_id in value["chunk_ids"]}
+        old_ids = set()
+        if document["old"]:
+            old_ids = {chunk_id for value in document["old"]["ranges"].values() for chunk_id in value["chunk_ids"]}
+        stale = sorted(old_ids - new_ids)
+        if stale:
+            self.vector_db.delete_documents(stale)
+            self.stats.deleted_chunks += len(stale)
+
+        if self.manifest is not None:
+            self.manifest.put(document["source"], {
+                "file_hash": document["metadata"]["file_hash"],
+                "signature": document["signature"],
+                "total_pages": document["total_pages"],
+                **document["stat"],
+                "pages": document["pages"],
+                "ranges": document["ranges"],
+            })
+        logger.info(f"{document['path'].name}: embedded {document['embedded']} chunks, deleted {len(stale)}")
+
+    def _discard(self, document: Dict):
+        """Delete the chunks of a PDF whose extraction failed part way (consumer thread, after its upserts)."""
+        sent = set(document["embedded_ids"])
+        old = document["old"]
+        overwritten = {}
+        if old:
+            overwritten = {start: value for start, value in old["ranges"].items() if sent & set(value["chunk_ids"])}
+        # Recorded ranges that were partly overwritten go too, so the manifest
+        # never lists a chunk that isn't what it says
+        stale = sorted(sent | {chunk_id for value in overwritten.values() for chunk_id in value["chunk_ids"]})
+        if stale:
+            self.vector_db.delete_documents(stale)
+            self.stats.deleted_chunks += len(stale)
+        if overwritten and self.manifest is not None:
+            # No hash or mtime, so the next run re-reads the PDF even if it is unchanged
+            self.manifest.put(document["source"], {
+                **old,
+                "file_hash": "",
+                "file_mtime_ns": None,
+                "ranges": {start: value for start, value in old["ranges"].items() if start not in overwritten},
+            })
+        logger.info(f"{document['path'].name}: extraction failed, deleted {len(stale)} chunks")
+
+    def remove_documents(self, sources: Iterable[str]) -> int:
+        """Delete the chunks of PDFs that are gone from disk and forget them."""
+        if self.manifest is None:
+            return 0
+        removed = 0
+        for source in sources:
+            chunk_ids = self.manifest.remove(source)
+            if chunk_ids:
+                self.vector_db.delete_documents(chunk_ids)
+            removed += len(chunk_ids)
+            logger.info(f"Removed {len(chunk_ids)} chunks of deleted PDF {source}")
+        self.stats.deleted_chunks += removed
+        return removed
+
+    # ------------------------------------------------------------------
+    # Embedding + upserts (consumer thread)
+    # ------------------------------------------------------------------
+
+    def _flush_upserts(self, chunks: List[Dict], embeddings: List[List[float]]):
+        for start in range(0, len(chunks), self.upsert_batch_size):
+            batch = chunks[start:start + self.upsert_batch_size]
+            self.vector_db.upsert_documents(batch, embeddings[start:start + self.upsert_batch_size])
+            self.stats.chunks_upserted += len(batch)
+        self._report()
+
+    def _consume(self, batches: "queue.Queue", errors: List[Exception]):
+        pending_chunks, pending_embeddings = [], []
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            if errors:
+                # Keep draining so the producer never blocks on a dead consumer
+                continue
+            try:
+                if isinstance(batch, dict):
+                    # A PDF is complete (or failed): its chunks must be in
+                    # Chroma before it is recorded (or undone)
+                    if pending_chunks:
+                        self._flush_upserts(pending_chunks, pending_embeddings)
+                        pending_chunks, pending_embeddings = [], []
+                    if batch["failed"]:
+                        self._discard(batch)
+                    else:
+                        self._commit(batch)
+                    continue
+                embeddings = self.embedding_generator.generate_embeddings([chunk["text"] for chunk in batch])
+                self.stats.chunks_embedded += len(batch)
+                pending_chunks.extend(batch)
+                pending_embeddings.extend(embeddings)
+                if len(pending_chunks) >= self.upsert_batch_size:
+                    self._flush_upserts(pending_chunks, pending_embeddings)
+                    pending_chunks, pending_embeddings = [], []
+            except Exception as e:
+                logger.error(f"Embedding/upsert stage failed: {e}")
+                errors.append(e)
+
+        if pending_chunks and not errors:
+            try:
+                self._flush_upserts(pending_chunks, pending_embeddings)
+            except Exception as e:
+                logger.error(f"Embedding/upsert stage failed: {e}")
+                errors.append(e)
+
+    def _report(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        snapshot = self.stats.snapshot()
+        logger.info(
+            f"Ingestion: {snapshot['pdfs']} PDFs, {snapshot['pages']} pages "
+            f"({snapshot['pages_per_sec']:.1f} pages/s), {snapshot['chunks']} chunks "
+            f"({snapshot['chunks_per_sec']:.1f} chunks/s)"
+        )
+        if self.on_progress:
+            self.on_progress(snapshot)
+
+    # ------------------------------------------------------------------
+
+    def run(self, pdf_paths: Iterable[Union[str, Path]], document_metadata: Optional[Dict] = None) -> Dict:
+        """
+        Ingest PDFs and return the final stats snapshot.
+
+        Args:
+            pdf_paths: PDFs to ingest
+            document_metadata: organization, document_type, year, tags, ...
+                applied to every PDF
+
+        Raises:
+            The first embedding/upsert error, after extraction has stopped
+        """
+        self.stats = IngestionStats()
+        batches: "queue.Queue" = queue.Queue(maxsize=self.queue_batches)
+        errors: List[Exception] = []
+        consumer = threading.Thread(target=self._consume, args=(batches, errors), name="ingest-embed", daemon=True)
+        consumer.start()
+
+        pending_batch: List[Dict] = []
+        in_flight = deque()
+        tasks = self._tasks([Path(path) for path in pdf_paths], document_metadata or {})
+
+        def handle(document, start, future, is_last):
+            nonlocal pending_batch
+            if document["failed"]:
+                return
+            try:
+                pages = future.result()
+            except Exception as e:
+                document["failed"] = True
+                self.stats.failed[str(document["path"])] = str(e)
+                logger.error(f"Failed to extract {document['path']}: {e}")
+                # Not recorded in the manifest, so the next run retries the whole PDF
+                dropped = {chunk["id"] for chunk in pending_batch if chunk["source_file"] == str(document["path"])}
+                pending_batch = [chunk for chunk in pending_batch if chunk["id"] not in dropped]
+                document["embedded_ids"] = [chunk_id for chunk_id in document["embedded_ids"] if chunk_id not in dropped]
+                if document["embedded_ids"]:
+                    # Earlier ranges may already be in Chroma
+                    batches.put(document)
+                return
+            self.stats.pages += len(pages)
+            pending_batch.extend(self._chunk_range(document, start, pages, is_last))
+            while len(pending_batch) >= self.embed_batch_size:
+                # Blocks while the embedding stage is behind
+                batches.put(pending_batch[:self.embed_batch_size])
+                pending_batch = pending_batch[self.embed_batch_size:]
+            if is_last:
+                self.stats.pdfs += 1
+                if pending_batch:
+                    batches.put(pending_batch)
+                    pending_batch = []
+                batches.put(document)
+
+        try:
+            with self.executor_factory(self.workers) as executor:
+                for document, start, end, is_last in tasks:
+                    if errors:
+                        break
+                    in_flight.append((document, start,
+                                      executor.submit(self.page_extractor, document["path"], start, end), is_last))
+                    if len(in_flight) >= self.max_in_flight:
+                        handle(*in_flight.popleft())
+                while in_flight and not errors:
+                    handle(*in_flight.popleft())
+                for _, _, future, _ in in_flight:
+                    future.cancel()
+        finally:
+            batches.put(None)
+            consumer.join()
+
+        self._report(force=True)
+        if errors:
+            raise errors[0]
+        return self.stats.snapshot()
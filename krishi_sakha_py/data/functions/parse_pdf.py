@@ -1,6 +1,8 @@
 import os
+import json
+import bisect
 import logging
-from typing import List, Dict, Optional, Union
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from pathlib import Path
 import hashlib
 from datetime import datetime
@@ -17,10 +19,8 @@ except ImportError:
 
 try:
     from langchain.text_splitter import RecursiveCharacterTextSplitter
-    from langchain.schema import Document
 except ImportError:
     RecursiveCharacterTextSplitter = None
-    Document = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -56,6 +56,8 @@ class PDFParser:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_chunk_size = min_chunk_size
+        # Page text buffered by chunk_pages before it is split
+        self.max_buffer_chars = chunk_size * 8
         
         # Initialize text splitter if available
         if RecursiveCharacterTextSplitter:
@@ -93,7 +95,6 @@ class PDFParser:
         Returns:
             tuple: (extracted_text, metadata)
         """
-        text = ""
         metadata = {
             'total_pages': 0,
             'extraction_method': 'pdfplumber'
@@ -101,16 +102,9 @@ class PDFParser:
         
         with pdfplumber.open(pdf_path) as pdf:
             metadata['total_pages'] = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += f"\n\n--- Page {page_num} ---\n\n{page_text}"
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
-                    continue
         
+        text = "".join(f"\n\n--- Page {page_num} ---\n\n{page_text}"
+                       for page_num, page_text in iter_page_texts(pdf_path))
         return text.strip(), metadata
     
     def _extract_text_pypdf2(self, pdf_path: str) -> tuple[str, Dict]:
@@ -123,27 +117,29 @@ class PDFParser:
         Returns:
             tuple: (extracted_text, metadata)
         """
-        text = ""
         metadata = {
             'total_pages': 0,
             'extraction_method': 'pypdf2'
         }
         
         with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            metadata['total_pages'] = len(pdf_reader.pages)
-            
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += f"\n\n--- Page {page_num} ---\n\n{page_text}"
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
-                    continue
+            metadata['total_pages'] = len(PyPDF2.PdfReader(file).pages)
         
+        text = "".join(f"\n\n--- Page {page_num} ---\n\n{page_text}"
+                       for page_num, page_text in iter_page_texts(pdf_path))
         return text.strip(), metadata
     
+    def _validate_pdf_path(self, pdf_path: Union[str, Path]) -> str:
+        pdf_path = str(pdf_path)
+        
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        
+        if not pdf_path.lower().endswith('.pdf'):
+            raise PDFParseError(f"File is not a PDF: {pdf_path}")
+        
+        return pdf_path
+    
     def extract_text_from_pdf(self, pdf_path: Union[str, Path]) -> tuple[str, Dict]:
         """
         Extract text from a PDF file using the best available method.
@@ -158,13 +154,7 @@ class PDFParser:
             PDFParseError: If the PDF cannot be parsed
             FileNotFoundError: If the PDF file doesn't exist
         """
-        pdf_path = str(pdf_path)
-        
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-        
-        if not pdf_path.lower().endswith('.pdf'):
-            raise PDFParseError(f"File is not a PDF: {pdf_path}")
+        pdf_path = self._validate_pdf_path(pdf_path)
         
         # Check available libraries
         library = self._check_dependencies()
@@ -255,6 +245,32 @@ class PDFParser:
         
         return chunks
     
+    def split_text(self, text: str) -> List[str]:
+        """Split text with LangChain's splitter if available, else the basic splitter."""
+        if self.text_splitter:
+            return self.text_splitter.split_text(text)
+        return self._basic_text_split(text)
+    
+    def chunk_pages(self, pages: Iterable[Tuple[int, str]], metadata: Dict = None) -> Iterator[Dict]:
+        """
+        Chunk (page_number, text) pairs as they arrive, tagging every chunk
+        with the pages it spans. Only about max_buffer_chars of text is held
+        at a time, however long the document.
+        
+        Args:
+            pages: (page_number, text) pairs in page order
+            metadata: Optional metadata to include with each chunk
+            
+        Yields:
+            Dict: chunk dictionaries with text and metadata
+        """
+        buffer = PageChunkBuffer(self, metadata)
+        for page_num, page_text in pages:
+            buffer.add_page(page_num, page_text)
+            if len(buffer) >= self.max_buffer_chars:
+                yield from buffer.drain()
+        yield from buffer.drain(final=True)
+    
     def chunk_text(self, text: str, metadata: Dict = None) -> List[Dict]:
         """
         Split text into chunks suitable for vector database storage.
@@ -272,17 +288,7 @@ class PDFParser:
         metadata = metadata or {}
         
         # Split text into chunks
-        if self.text_splitter:
-            # Use LangChain's text splitter if available
-            if Document:
-                doc = Document(page_content=text, metadata=metadata)
-                chunks = self.text_splitter.split_documents([doc])
-                chunk_texts = [chunk.page_content for chunk in chunks]
-            else:
-                chunk_texts = self.text_splitter.split_text(text)
-        else:
-            # Use basic text splitting
-            chunk_texts = self._basic_text_split(text)
+        chunk_texts = self.split_text(text)
         
         # Create chunk dictionaries with metadata
         chunked_data = []
@@ -332,12 +338,24 @@ class PDFParser:
         """
         logger.info(f"Starting PDF parsing for: {pdf_path}")
         
-        # Extract text from PDF
-        text, base_metadata = self.extract_text_from_pdf(pdf_path)
-        logger.info(f"Extracted {len(text)} characters from PDF")
+        pdf_path = self._validate_pdf_path(pdf_path)
+        try:
+            total_pages, extraction_method = count_pdf_pages(pdf_path)
+        except Exception as e:
+            raise PDFParseError(f"Failed to open PDF {pdf_path}: {e}")
+        
+        file_stats = os.stat(pdf_path)
+        enhanced_metadata = {
+            'total_pages': total_pages,
+            'extraction_method': extraction_method,
+            'file_path': pdf_path,
+            'file_name': os.path.basename(pdf_path),
+            'file_size': file_stats.st_size,
+            'modified_time': datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
+            'file_hash': self._generate_file_hash(pdf_path)
+        }
         
         # Enhance metadata with additional information
-        enhanced_metadata = base_metadata.copy()
         enhanced_metadata.update({
             'organization': organization or 'Unknown',
             'document_type': document_type or 'Unknown',
@@ -353,8 +371,12 @@ class PDFParser:
         if custom_metadata:
             enhanced_metadata.update(custom_metadata)
         
-        # Chunk the text with enhanced metadata
-        chunks = self.chunk_text(text, enhanced_metadata)
+        # Stream pages through the page-aware chunker
+        chunks = list(self.chunk_pages(iter_page_texts(pdf_path), enhanced_metadata))
+        if not chunks:
+            raise PDFParseError(f"No text could be extracted from PDF: {pdf_path}")
+        for chunk in chunks:
+            chunk['metadata']['total_chunks'] = len(chunks)
         logger.info(f"Created {len(chunks)} chunks from PDF with enhanced metadata")
         
         return chunks
@@ -386,6 +408,163 @@ class PDFParser:
         
         return results
 
+class PageChunkBuffer:
+    """
+    Page text waiting to be chunked, with the offset where each page starts.
+    
+    drain() splits the buffer with the parser's splitter and maps every
+    chunk's position back to the pages it covers. Unless final, the last
+    chunk is held back and re-split with the next pages, so chunks still
+    run across page and drain boundaries.
+    """
+    
+    PAGE_SEPARATOR = "\n\n"
+    
+    def __init__(self, parser: PDFParser, metadata: Dict = None):
+        self.parser = parser
+        self.metadata = metadata or {}
+        self.text = ""
+        # (offset in self.text, page number), ascending
+        self.page_starts: List[Tuple[int, int]] = []
+        self.next_index = 0
+    
+    def __len__(self):
+        return len(self.text)
+    
+    def add_page(self, page_num: int, page_text: str):
+        if not page_text or not page_text.strip():
+            return
+        if self.text:
+            self.text += self.PAGE_SEPARATOR
+        self.page_starts.append((len(self.text), page_num))
+        self.text += page_text
+    
+    def fingerprint(self) -> str:
+        """Everything drain() depends on, for callers that cache its output."""
+        return json.dumps(self.page_starts) + self.text
+    
+    def _page_at(self, offset: int) -> int:
+        position = bisect.bisect_right([start for start, _ in self.page_starts], offset) - 1
+        return self.page_starts[max(position, 0)][1]
+    
+    def drain(self, final: bool = False) -> List[Dict]:
+        if not self.text.strip():
+            return []
+        
+        # Locate each piece in the buffer; splitters return pieces in order
+        pieces, search_from = [], 0
+        for piece in self.parser.split_text(self.text):
+            piece = piece.strip()
+            if not piece:
+                continue
+            start = self.text.find(piece, search_from)
+            if start == -1:
+                # Splitter rewrote the whitespace; fall back to the last known position
+                start = search_from
+            pieces.append((start, piece))
+            search_from = start + 1
+        
+        if not final:
+            if not pieces:
+                return []
+            # Hold back the last piece (and any short tail the splitter dropped)
+            carry_from, _ = pieces.pop()
+        
+        chunks = []
+        for start, piece in pieces:
+            if len(piece) < self.parser.min_chunk_size:
+                continue
+            page_start, page_end = self._page_at(start), self._page_at(start + len(piece) - 1)
+            chunk_metadata = self.metadata.copy()
+            chunk_metadata.update({
+                'chunk_index': self.next_index,
+                'chunk_size': len(piece),
+                'page_number': page_start,
+                'page_start': page_start,
+                'page_end': page_end,
+                'created_at': datetime.now().isoformat()
+            })
+            self.next_index += 1
+            chunks.append({'text': piece, 'metadata': chunk_metadata})
+        
+        if final:
+            self.text, self.page_starts = "", []
+        else:
+            first_page = bisect.bisect_right([start for start, _ in self.page_starts], carry_from) - 1
+            self.page_starts = [(max(start - carry_from, 0), page_num)
+                                for start, page_num in self.page_starts[max(first_page, 0):]]
+            self.text = self.text[carry_from:]
+        return chunks
+
+
+# Page-level helpers; module functions so a process pool can pickle them
+def count_pdf_pages(pdf_path: Union[str, Path]) -> Tuple[int, str]:
+    """
+    Count the pages of a PDF without extracting any text.
+    
+    Returns:
+        tuple: (page_count, extraction_method)
+    """
+    if pdfplumber:
+        with pdfplumber.open(str(pdf_path)) as pdf:
+            return len(pdf.pages), 'pdfplumber'
+    if PyPDF2:
+        with open(pdf_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages), 'pypdf2'
+    raise PDFParseError("No PDF parsing library available. Please install 'pdfplumber' or 'PyPDF2'")
+
+
+def iter_page_texts(pdf_path: Union[str, Path], start_page: int = 1,
+                    end_page: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, text) for pages [start_page, end_page) (1-based,
+    end_page None for the rest of the document) that have text. One page
+    is parsed and held at a time.
+    """
+    if pdfplumber:
+        with pdfplumber.open(str(pdf_path)) as pdf:
+            last_page = len(pdf.pages) if end_page is None else min(end_page - 1, len(pdf.pages))
+            for page_num in range(start_page, last_page + 1):
+                page = pdf.pages[page_num - 1]
+                try:
+                    page_text = page.extract_text()
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
+                    page_text = None
+                finally:
+                    # pdfplumber keeps every parsed layout object otherwise
+                    page.flush_cache()
+                if page_text:
+                    yield page_num, page_text
+        return
+
+    if PyPDF2:
+        with open(pdf_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            last_page = len(reader.pages) if end_page is None else min(end_page - 1, len(reader.pages))
+            for page_num in range(start_page, last_page + 1):
+                try:
+                    page_text = reader.pages[page_num - 1].extract_text()
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
+                    continue
+                if page_text:
+                    yield page_num, page_text
+        return
+
+    raise PDFParseError("No PDF parsing library available. Please install 'pdfplumber' or 'PyPDF2'")
+
+
+def extract_page_texts(pdf_path: Union[str, Path], start_page: int, end_page: int) -> List[Tuple[int, str]]:
+    """
+    Extract the text of pages [start_page, end_page) (1-based).
+    
+    Returns:
+        List of (page_number, text) for the pages that had text
+    """
+    return list(iter_page_texts(pdf_path, start_page, end_page))
+
+
 # Convenience functions for easy usage
 def parse_pdf(pdf_path: Union[str, Path], 
               chunk_size: int = 1000, 
@@ -0,0 +1,132 @@
+"""
+BM25 keyword index kept alongside a Chroma collection.
+
+MiniLM embeddings blur exact figures, scheme names and years ("fertilizer
+usage 2024"), which are precisely what farmers ask the annual reports
+about. Every chunk written to Chroma is also written to an SQLite FTS5
+table, ranked with FTS5's built-in bm25(), and fused with the vector
+results by reciprocal rank fusion (see hybrid_search). The index sits next
+to the Chroma files like the ingestion manifest.
+"""
+
+import re
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SPARSE_INDEX_FILE_NAME = "sparse_index.sqlite3"
+
+# Words that match almost every chunk and only add noise to an OR query
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it", "me",
+    "of", "on", "or", "the", "this", "to", "was", "what", "when", "which", "who", "with", "about",
+    "according", "mentioned", "does", "do", "did", "tell", "give", "say", "says", "much", "many",
+}
+
+# "2023-24", "PM-KISAN", "30.1" stay one term; FTS5 matches them as a phrase
+_TOKEN = re.compile(r"\w+(?:[-./]\w+)*", re.UNICODE)
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct lowercase query terms minus stopwords, in order."""
+    terms = [term for term in _TOKEN.findall(query.lower()) if term not in _STOPWORDS]
+    return list(dict.fromkeys(terms))
+
+
+class SparseIndex:
+    """SQLite FTS5 (BM25) index of chunk text with Chroma-style metadata."""
+
+    def __init__(self, db_path: str, collection_name: str):
+        self.db_path = str(db_path)
+        self.collection_name = collection_name
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            " rowid INTEGER PRIMARY KEY, collection TEXT NOT NULL, chunk_id TEXT NOT NULL,"
+            " document TEXT NOT NULL, metadata TEXT NOT NULL, UNIQUE (collection, chunk_id));"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5("
+            " document, content='chunks', content_rowid='rowid', tokenize='unicode61');"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def for_collection(cls, chroma_path: str, collection_name: str) -> "SparseIndex":
+        return cls(str(Path(chroma_path) / SPARSE_INDEX_FILE_NAME), collection_name)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE collection = ?", (self.collection_name,)).fetchone()[0]
+
+    def _delete_rows(self, chunk_ids: Iterable[str]):
+        for chunk_id in chunk_ids:
+            row = self._conn.execute(
+                "SELECT rowid, document FROM chunks WHERE collection = ? AND chunk_id = ?",
+                (self.collection_name, chunk_id)).fetchone()
+            if row is None:
+                continue
+            # External-content FTS tables are told what to un-index
+            self._conn.execute(
+                "INSERT INTO chunks_fts (chunks_fts, rowid, document) VALUES ('delete', ?, ?)", row)
+            self._conn.execute("DELETE FROM chunks WHERE rowid = ?", (row[0],))
+
+    def upsert(self, ids: List[str], documents: List[str], metadatas: List[Dict]):
+        with self._lock, self._conn:
+            self._delete_rows(ids)
+            for chunk_id, document, metadata in zip(ids, documents, metadatas):
+                cursor = self._conn.execute(
+                    "INSERT INTO chunks (collection, chunk_id, document, metadata) VALUES (?, ?, ?, ?)",
+                    (self.collection_name, chunk_id, document, json.dumps(metadata)))
+                self._conn.execute(
+                    "INSERT INTO chunks_fts (rowid, document) VALUES (?, ?)", (cursor.lastrowid, document))
+
+    def delete(self, ids: List[str]):
+        with self._lock, self._conn:
+            self._delete_rows(ids)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._delete_rows([row[0] for row in self._conn.execute(
+                "SELECT chunk_id FROM chunks WHERE collection = ?", (self.collection_name,)).fetchall()])
+
+    def search(self, query: str, n_results: int = 20, where_filter: Optional[Dict] = None) -> List[Dict]:
+        """
+        BM25 search over the collection.
+
+        Args:
+            query: Free text; words are OR-ed, so partial matches still rank
+            n_results: Maximum hits
+            where_filter: {metadata field: value} equality filters, as for Chroma
+
+        Returns:
+            [{"id", "document", "metadata", "score"}] best first (higher score is better)
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+        sql = ("SELECT chunks.chunk_id, chunks.document, chunks.metadata, bm25(chunks_fts) AS rank"
+               " FROM chunks_fts JOIN chunks ON chunks.rowid = chunks_fts.rowid"
+               " WHERE chunks_fts MATCH ? AND chunks.collection = ?")
+        params: List = [match, self.collection_name]
+        for field, value in (where_filter or {}).items():
+            sql += " AND json_extract(chunks.metadata, ?) = ?"
+            params += [f"$.{field}", str(value)]
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(n_results)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # bm25() is lower-is-better; flip it so callers can sort descending
+        return [{"id": chunk_id, "document": document, "metadata": json.loads(metadata), "score": -rank}
+                for chunk_id, document, metadata, rank in rows]
@@ -0,0 +1,101 @@
+"""
+Process-wide registry of PDFVectorDBManager instances.
+
+Building a PDFVectorDBManager loads the SentenceTransformer and opens a Chroma
+PersistentClient, which is far too slow to do on every /chat turn. The registry
+keeps one manager per collection, all sharing a single embedding model and a
+single client, so a request only pays for the query embedding and the search.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from configs.vector_db_config import CHROMA_DB_PATH, EMBEDDING_MODEL_NAME
+from data.functions.add_to_vector_db import (
+    CHROMADB_AVAILABLE,
+    EmbeddingGenerator,
+    PDFVectorDBManager,
+    VectorDBError,
+    chromadb,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class VectorDBRegistry:
+    """Lazily built, thread-safe pool of managers keyed by collection name."""
+
+    def __init__(self, db_path: str = CHROMA_DB_PATH, model_name: str = EMBEDDING_MODEL_NAME):
+        self.db_path = db_path
+        self.model_name = model_name
+        self._lock = threading.RLock()
+        self._managers: Dict[str, PDFVectorDBManager] = {}
+        self._embedding_generator: Optional[EmbeddingGenerator] = None
+        self._client = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_embedding_generator(self) -> EmbeddingGenerator:
+        """Return the shared MiniLM embedding generator, loading it once."""
+        if self._embedding_generator is None:
+            with self._lock:
+                if self._embedding_generator is None:
+                    self._embedding_generator = EmbeddingGenerator(self.model_name)
+        return self._embedding_generator
+
+    def _shared_client(self):
+        if self._client is None:
+            if not CHROMADB_AVAILABLE:
+                raise VectorDBError("ChromaDB not available. Install with: pip install chromadb")
+            self._client = chromadb.PersistentClient(path=str(self.db_path))
+        return self._client
+
+    def get(self, collection_name: str) -> PDFVectorDBManager:
+        """Return the manager for a collection, creating it on first use."""
+        manager = self._managers.get(collection_name)
+        if manager is not None:
+            self.hits += 1
+            return manager
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            manager = self._managers.get(collection_name)
+            if manager is not None:
+                self.hits += 1
+                return manager
+
+            self.misses += 1
+            logger.info(f"Creating shared vector DB manager for collection: {collection_name}")
+            manager = PDFVectorDBManager(
+                db_path=self.db_path,
+                collection_name=collection_name,
+                embedding_generator=self.get_embedding_generator(),
+                client=self._shared_client(),
+            )
+            self._managers[collection_name] = manager
+            return manager
+
+    def warm_up(self, collection_names: Iterable[str]) -> List[str]:
+        """Load the embedding model and open the given collections up front."""
+        warmed = []
+        for name in collection_names:
+            try:
+                self.get(name)
+                warmed.append(name)
+            except Exception as e:
+                logger.error(f"Failed to warm up collection '{name}': {e}")
+        return warmed
+
+    def stats(self) -> Dict:
+        return {
+            "collections": sorted(self._managers.keys()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "embedding_model_loaded": self._embedding_generator is not None,
+            "embedding_cache": self._embedding_generator.cache.stats() if self._embedding_generator else None,
+        }
+
+
+# Global registry instance
+vector_db_registry = VectorDBRegistry()
@@ -1,18 +1,75 @@
 from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv())
 
+import asyncio
+import logging
+
 from fastapi import FastAPI
-from fastapi.responses import StreamingResponse
-from langchain_ollama import ChatOllama
+from fastapi.responses import StreamingResponse, JSONResponse
 from routes import search, test, chat, voice, language, post , user,mandi
+from configs.vector_db_config import WARMUP_COLLECTIONS
+from configs.model_config import MODEL_WARM_UP
+from brain.resource_registry import resource_registry
+from brain.brain_init import configure_torch_threads
+from data.functions.vector_db_registry import vector_db_registry
+from modules.scrapper.browser_pool import browser_pool
+from modules.scrapper.http_fetcher import http_fetcher
+from brain.translation_workers import translation_workers
+
+logger = logging.getLogger(__name__)
 app = FastAPI()
 
 
+# Load MiniLM + open Chroma once so the first RAG turn doesn't pay for it
+resource_registry.register("vector_db", lambda: vector_db_registry.warm_up(WARMUP_COLLECTIONS))
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    # One torch thread pool for every model, sized before any of them loads
+    configure_torch_threads()
+    # Runs in the background: the server accepts traffic right away and any
+    # request that needs a model before then loads it on first use
+    if MODEL_WARM_UP:
+        resource_registry.start_warm_up()
+
+
+@app.on_event("startup")
+async def start_browser_pool():
+    # Keep Chromium running so searches only pay for page navigation. Like the
+    # models it is launched on first use when warm-up is off
+    if not MODEL_WARM_UP:
+        return
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # Scrapes will retry the launch lazily on first use
+        logger.error(f"Failed to start browser pool: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_browser_pool():
+    await browser_pool.close()
+    await http_fetcher.close()
+
+
+@app.on_event("shutdown")
+async def stop_translation_workers():
+    translation_workers.shutdown()
+
+
 @app.get("/")
 async def root():
     return {"msg": "Ollama+LangChain+FastAPI running"}
 
 
+@app.get("/ready")
+async def ready():
+    """Per-model load state; 503 until every warm-up model is loaded."""
+    status = resource_registry.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 
 app.include_router(test.router)
 app.include_router(chat.router)
@@ -0,0 +1,220 @@
+"""
+Long-lived Playwright browser pool shared by every scrape.
+
+Launching Chromium, creating a context and installing the stealth script used
+to happen on every json_scrapped/search_from_url call and dominated search
+latency. The pool keeps one browser and a few contexts alive for the lifetime
+of the app so a scrape only pays for navigation:
+
+- pages are recycled (reset to about:blank) instead of closed,
+- a context is rotated out after max_pages_per_context pages so cookies and
+  leaked memory don't pile up,
+- a crashed/disconnected browser is detected and relaunched on the next
+  checkout,
+- at most max_parallel pages are checked out at once; further scrapes wait.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+from playwright.async_api import async_playwright
+
+logger = logging.getLogger(__name__)
+
+BROWSER_ARGS = [
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-blink-features=AutomationControlled'
+]
+CONTEXT_OPTIONS = {
+    "viewport": {'width': 1280, 'height': 720},
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    window.chrome = {runtime: {}};
+    Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
+"""
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+
+async def _block_heavy_resources(route, request):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PooledContext:
+    __slots__ = ("context", "served", "active", "idle_pages", "retired")
+
+    def __init__(self, context):
+        self.context = context
+        self.served = 0
+        self.active = 0
+        self.idle_pages: List = []
+        self.retired = False
+
+
+class BrowserPool:
+    """One shared Chromium with a small set of rotating contexts."""
+
+    def __init__(self,
+                 headless: bool = True,
+                 max_parallel: int = 10,
+                 num_contexts: int = 2,
+                 max_pages_per_context: int = 100):
+        self.headless = headless
+        self.max_parallel = max_parallel
+        self.num_contexts = num_contexts
+        self.max_pages_per_context = max_pages_per_context
+
+        self._playwright = None
+        self._browser = None
+        self._contexts: List[_PooledContext] = []
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_parallel)
+
+        self.launches = 0
+        self.rotations = 0
+        self.pages_created = 0
+        self.pages_reused = 0
+
+    def _browser_alive(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _new_context(self) -> _PooledContext:
+        context = await self._browser.new_context(**CONTEXT_OPTIONS)
+        await context.add_init_script(STEALTH_SCRIPT)
+        await context.route("**/*", _block_heavy_resources)
+        return _PooledContext(context)
+
+    async def _launch(self):
+        """(Re)launch a dead browser and top the pool up to num_contexts."""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        if not self._browser_alive():
+            if self._browser is not None:
+                logger.warning("Browser disconnected, relaunching Chromium")
+            # Contexts and pages of a dead browser are unusable
+            for pooled in self._contexts:
+                pooled.retired = True
+            self._contexts = []
+            self._browser = await self._playwright.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+            self.launches += 1
+        # Appended one by one so a failure part way keeps the contexts already made
+        while len(self._contexts) < self.num_contexts:
+            self._contexts.append(await self._new_context())
+        logger.info(f"Browser pool ready with {self.num_contexts} contexts")
+
+    async def start(self):
+        """Launch the browser up front (called on app startup)."""
+        async with self._lock:
+            if not self._browser_alive() or not self._contexts:
+                await self._launch()
+
+    async def _retire(self, pooled: _PooledContext):
+        # Replacement first: if the browser dies now, the pool keeps the old context
+        replacement = await self._new_context()
+        pooled.retired = True
+        self._contexts[self._contexts.index(pooled)] = replacement
+        self.rotations += 1
+        if pooled.active == 0:
+            await self._close_context(pooled)
+
+    async def _close_context(self, pooled: _PooledContext):
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.warning(f"Error closing retired browser context: {e}")
+
+    async def _checkout(self):
+        async with self._lock:
+            if not self._browser_alive() or not self._contexts:
+                await self._launch()
+
+            pooled = min(self._contexts, key=lambda c: c.active)
+            if pooled.served >= self.max_pages_per_context:
+                await self._retire(pooled)
+                pooled = min(self._contexts, key=lambda c: c.active)
+
+            pooled.served += 1
+            pooled.active += 1
+            page = None
+            while pooled.idle_pages and page is None:
+                candidate = pooled.idle_pages.pop()
+                if not candidate.is_closed():
+                    page = candidate
+
+        try:
+            if page is None:
+                page = await pooled.context.new_page()
+                self.pages_created += 1
+            else:
+                self.pages_reused += 1
+        except Exception:
+            pooled.active -= 1
+            raise
+        return pooled, page
+
+    async def _checkin(self, pooled: _PooledContext, page):
+        pooled.active -= 1
+        reusable = not pooled.retired and self._browser_alive() and not page.is_closed()
+        if reusable:
+            try:
+                # Drops the previous document (and any timers/sockets it opened)
+                await page.goto("about:blank")
+                pooled.idle_pages.append(page)
+            except Exception:
+                reusable = False
+
+        if not reusable and not page.is_closed():
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+        if pooled.retired and pooled.active == 0:
+            await self._close_context(pooled)
+
+    @asynccontextmanager
+    async def page(self):
+        """Check out a ready page; waits while max_parallel pages are in use."""
+        async with self._semaphore:
+            pooled, page = await self._checkout()
+            try:
+                yield page
+            finally:
+                await self._checkin(pooled, page)
+
+    async def close(self):
+        async with self._lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser: {e}")
+            if self._playwright is not None:
+                await self._playwright.stop()
+            self._browser = None
+            self._playwright = None
+            self._contexts = []
+
+    def stats(self) -> Dict:
+        return {
+            "browser_alive": self._browser_alive(),
+            "launches": self.launches,
+            "rotations": self.rotations,
+            "pages_created": self.pages_created,
+            "pages_reused": self.pages_reused,
+            "pages_in_use": sum(c.active for c in self._contexts),
+            "max_parallel": self.max_parallel,
+        }
+
+
+# Global browser pool instance
+browser_pool = BrowserPool()
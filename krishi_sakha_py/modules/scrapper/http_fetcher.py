@@ -0,0 +1,190 @@
+"""
+HTTP-first extraction tier for the scraper.
+
+Most agricultural pages (KVK sites, ICAR/TNAU portals, news articles) are
+static HTML, so a plain GET through one pooled httpx client plus trafilatura
+is enough and far cheaper than rendering in Chromium. When the extracted text
+is too short the page is probably built by JavaScript and the caller escalates
+to the Playwright tier. DomainTierMemory remembers which tier worked per
+domain so repeat domains go straight to it.
+"""
+
+import re
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import trafilatura
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+if not HTTP2_AVAILABLE:
+    logger.warning("⚠️ h2 is not installed; the HTTP fetcher falls back to HTTP/1.1 (install httpx[http2])")
+
+# Extractions shorter than this are treated as a JS shell and escalated
+MIN_HTTP_CONTENT_CHARS = 500
+MAX_CONTENT_CHARS = 8000
+
+DEFAULT_HEADERS = {
+    "User-Agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,hi;q=0.8",
+}
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+_TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def domain_of(url: str) -> str:
+    host = urlsplit(url or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainTierMemory:
+    """Remembers per domain which extraction tier produced usable text."""
+
+    def __init__(self,
+                 ttl_seconds: float = 24 * 60 * 60,
+                 max_domains: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_domains = max_domains
+        self._clock = clock
+        self._tiers: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def preferred_tier(self, url: str) -> Optional[str]:
+        domain = domain_of(url)
+        with self._lock:
+            entry = self._tiers.get(domain)
+            if entry is None:
+                return None
+            tier, expires_at = entry
+            if expires_at <= self._clock():
+                # Sites change; give the cheap tier another chance eventually
+                del self._tiers[domain]
+                return None
+            self._tiers.move_to_end(domain)
+            return tier
+
+    def record(self, url: str, tier: str):
+        domain = domain_of(url)
+        if not domain:
+            return
+        with self._lock:
+            self._tiers[domain] = (tier, self._clock() + self.ttl_seconds)
+            self._tiers.move_to_end(domain)
+            while len(self._tiers) > self.max_domains:
+                self._tiers.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            tiers = [tier for tier, _ in self._tiers.values()]
+        return {
+            "domains": len(tiers),
+            "http": tiers.count(TIER_HTTP),
+            "browser": tiers.count(TIER_BROWSER),
+        }
+
+
+class HttpFetcher:
+    """Fetches and extracts pages over one shared httpx.AsyncClient."""
+
+    def __init__(self, timeout: float = 4.0, max_connections: int = 20,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        # Tests pass an httpx.MockTransport
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One client for the app: keeps connections (and TLS sessions) alive
+        # between scrapes of the same sites; httpx negotiates gzip itself
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                transport=self.transport,
+                follow_redirects=True,
+                timeout=self.timeout,
+                headers=DEFAULT_HEADERS,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    async def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict:
+        """
+        Fetch one page and extract its main text, in the scraper's doc format.
+
+        When etag/last_modified from a cached copy are given the request is
+        conditional, and an unchanged page comes back as {"not_modified": True}.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            response = await self._get_client().get(url, headers=headers)
+            # httpx treats 304 as an error status too; it means the cached copy is current
+            if response.status_code == 304:
+                return {"url": url, "success": True, "not_modified": True, "tier": TIER_HTTP}
+            response.raise_for_status()
+        except httpx.TimeoutException:
+            logger.warning(f"⚠️ HTTP timeout fetching {url}")
+            return {"url": url, "success": False, "error": "Timeout", "tier": TIER_HTTP}
+        except Exception as e:
+            logger.warning(f"⚠️ HTTP error fetching {url}: {e}")
+            return {"url": url, "success": False, "error": str(e), "tier": TIER_HTTP}
+
+        content_type = response.headers.get("content-type", "")
+        if "html" not in content_type and "xml" not in content_type:
+            # A browser can't extract PDFs/images either, so don't escalate
+            return {"url": str(response.url), "success": False, "tier": TIER_HTTP, "escalate": False,
+                    "error": f"Unsupported content type: {content_type or 'unknown'}"}
+
+        html_content = response.text
+        final_url = str(response.url)
+        # trafilatura is CPU bound; don't stall other requests on big pages
+        extracted_content = await asyncio.to_thread(trafilatura.extract, html_content, url=final_url)
+        title_match = _TITLE_PATTERN.search(html_content)
+
+        return {
+            "url": final_url,
+            "title": " ".join(title_match.group(1).split()) if title_match else "",
+            "content": extracted_content[:MAX_CONTENT_CHARS] if extracted_content else "",
+            "success": True,
+            "extractor": "trafilatura",
+            "html_length": len(html_content),
+            "tier": TIER_HTTP,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def has_enough_text(doc: Dict, min_chars: int = MIN_HTTP_CONTENT_CHARS) -> bool:
+    return bool(doc and doc.get("success") and len((doc.get("content") or "").strip()) >= min_chars)
+
+
+# Global HTTP tier instances
+http_fetcher = HttpFetcher()
+domain_tiers = DomainTierMemory()
@@ -0,0 +1,265 @@
+"""
+Disk cache for scraped pages.
+
+The same cultivation guides and market pages are scraped over and over by
+json_scrapped, search_from_url and the market analyzer. Extracted pages are
+stored under the sha256 of their canonical URL together with title, fetch time
+and the ETag/Last-Modified validators. A page is served straight from the
+cache while it is younger than its domain TTL (configs/page_cache_config.py);
+after that the HTTP tier revalidates it with a conditional GET and a 304 just
+renews it. Total size is capped with least-recently-used eviction.
+
+Every call does file I/O; async callers go through asyncio.to_thread.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from configs.page_cache_config import (
+    PAGE_CACHE_PATH, PAGE_CACHE_MAX_BYTES, DOMAIN_TTLS, DEFAULT_PAGE_TTL
+)
+from modules.scrapper.ranked_fetch import canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Doc fields worth keeping; the rest (html_length, quality, ...) is per fetch
+CACHED_FIELDS = ("url", "title", "content", "extractor", "tier")
+
+
+class MemoryPageStore:
+    """In-memory stand-in for DiskPageStore (tests, or running without disk)."""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[Dict, float]] = {}
+
+    def load(self, key: str) -> Optional[Dict]:
+        entry = self._records.get(key)
+        return dict(entry[0]) if entry else None
+
+    def save(self, key: str, record: Dict) -> int:
+        self._records[key] = (dict(record), time.time())
+        return len(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+
+    def touch(self, key: str, accessed_at: float):
+        if key in self._records:
+            self._records[key] = (self._records[key][0], accessed_at)
+
+    def delete(self, key: str):
+        self._records.pop(key, None)
+
+    def scan(self) -> List[Tuple[str, int, float]]:
+        return [(key, len(json.dumps(record, ensure_ascii=False).encode("utf-8")), accessed_at)
+                for key, (record, accessed_at) in self._records.items()]
+
+
+class DiskPageStore:
+    """One JSON file per page; the file mtime doubles as last-access time."""
+
+    def __init__(self, root: str = PAGE_CACHE_PATH):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable page cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+    def save(self, key: str, record: Dict) -> int:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        # Readers never see a half-written file
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def touch(self, key: str, accessed_at: float):
+        try:
+            os.utime(self._path(key), (accessed_at, accessed_at))
+        except OSError:
+            pass
+
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def scan(self) -> List[Tuple[str, int, float]]:
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            stat = path.stat()
+            entries.append((path.stem, stat.st_size, stat.st_mtime))
+        return entries
+
+
+def ttl_for_url(url: str, domain_ttls=DOMAIN_TTLS, default_ttl: float = DEFAULT_PAGE_TTL) -> float:
+    host = urlsplit(canonical_url(url)).netloc
+    for suffix, ttl in domain_ttls:
+        if host == suffix or host.endswith("." + suffix):
+            return ttl
+    return default_ttl
+
+
+class PageCache:
+    """TTL + revalidation + LRU size cap over a page store."""
+
+    def __init__(self,
+                 store=None,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES,
+                 domain_ttls=DOMAIN_TTLS,
+                 default_ttl: float = DEFAULT_PAGE_TTL,
+                 clock: Callable[[], float] = time.time):
+        self.store = store if store is not None else MemoryPageStore()
+        self.max_bytes = max_bytes
+        self.domain_ttls = domain_ttls
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # key -> size, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        for key, size, _ in sorted(self.store.scan(), key=lambda entry: entry[2]):
+            self._index[key] = size
+        self._total_bytes = sum(self._index.values())
+
+        self.hits = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        return ttl_for_url(url, self.domain_ttls, self.default_ttl)
+
+    def _touch(self, key: str, now: float):
+        self._index.move_to_end(key)
+        self.store.touch(key, now)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Return the cached record for url, or None.
+
+        The record carries "fresh": False once it is past its TTL; the caller
+        should then revalidate with record["etag"] / record["last_modified"].
+        """
+        key = self.key_for(url)
+        now = self._clock()
+        with self._lock:
+            record = self.store.load(key) if key in self._index else None
+            if record is None:
+                self._total_bytes -= self._index.pop(key, 0)
+                self.misses += 1
+                return None
+
+            record["fresh"] = now - record.get("fetched_at", 0) < self.ttl_for(url)
+            if record["fresh"]:
+                self.hits += 1
+            else:
+                self.stale += 1
+            self._touch(key, now)
+            return record
+
+    def put(self, url: str, doc: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a successfully extracted doc."""
+        if not doc or not doc.get("success"):
+            return
+        key = self.key_for(url)
+        record = {field: doc.get(field) for field in CACHED_FIELDS}
+        record.update({
+            "canonical_url": canonical_url(url),
+            "fetched_at": self._clock(),
+            "etag": etag,
+            "last_modified": last_modified,
+        })
+        with self._lock:
+            size = self.store.save(key, record)
+            self._total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict()
+
+    def mark_revalidated(self, url: str) -> Optional[Dict]:
+        """The origin answered 304: renew the entry and return it."""
+        key = self.key_for(url)
+        with self._lock:
+            record = self.store.load(key)
+            if record is None:
+                return None
+            record["fetched_at"] = self._clock()
+            size = self.store.save(key, record)
+            self._total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self.revalidated += 1
+            record["fresh"] = True
+            return record
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self.store.delete(key)
+            self._total_bytes -= size
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "stale": self.stale,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            # Fresh hits plus stale entries a 304 let us keep serving
+            "served_from_cache_ratio": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+        }
+
+
+def cached_doc(record: Dict) -> Dict:
+    """Turn a cache record back into the scraper's doc format."""
+    doc = {field: record.get(field) for field in CACHED_FIELDS}
+    doc.update({"success": True, "cached": True})
+    return doc
+
+
+def _build_page_cache() -> PageCache:
+    try:
+        return PageCache(store=DiskPageStore(PAGE_CACHE_PATH))
+    except OSError as e:
+        logger.warning(f"Page cache directory unavailable ({e}); caching in memory only")
+        return PageCache(store=MemoryPageStore())
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """The shared page cache, opened (directory created and scanned) on first use."""
+    global _page_cache
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = _build_page_cache()
+    return _page_cache
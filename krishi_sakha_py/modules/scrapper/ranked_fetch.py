@@ -0,0 +1,127 @@
+"""
+Ranked multi-URL fetch with early cutoff.
+
+SearxNG returns its results best-first. We fetch the top-N concurrently, drop
+duplicates that only differ by tracking params / www / trailing slash, and stop
+as soon as enough good extractions have arrived or the latency budget runs
+out. Whatever is still loading at that point is cancelled.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_DOCS = 4
+DEFAULT_MIN_QUALITY = 0.25
+DEFAULT_BUDGET_SECONDS = 6.0
+# Extracted text this long counts as a complete article
+FULL_CONTENT_CHARS = 3000
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref", "ref_src", "igshid"}
+
+
+def canonical_url(url: str) -> str:
+    """Normalise a URL so trivially different links to one page compare equal."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, query, ""))
+
+
+def dedupe_urls(urls: List[str], limit: Optional[int] = None) -> List[str]:
+    """Keep the first (best-ranked) occurrence of each canonical URL, at most limit of them."""
+    seen = set()
+    unique = []
+    for url in urls or []:
+        if limit is not None and len(unique) >= limit:
+            break
+        if not url:
+            continue
+        key = canonical_url(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(url)
+    return unique
+
+
+def content_quality(doc: Dict) -> float:
+    """
+    Score an extracted page between 0 and 1.
+
+    Length of the extracted text, discounted when trafilatura found no main
+    content and we fell back to the page's raw text (menus, footers, ...).
+    """
+    if not doc or not doc.get("success"):
+        return 0.0
+    length = len((doc.get("content") or "").strip())
+    score = min(length / FULL_CONTENT_CHARS, 1.0)
+    if doc.get("extractor") != "trafilatura":
+        score *= 0.5
+    return round(score, 3)
+
+
+async def fetch_ranked(
+    urls: List[str],
+    fetch: Callable[[str], Awaitable[Dict]],
+    target_docs: int = DEFAULT_TARGET_DOCS,
+    min_quality: float = DEFAULT_MIN_QUALITY,
+    budget_seconds: float = DEFAULT_BUDGET_SECONDS
+) -> List[Dict]:
+    """
+    Fetch URLs concurrently until target_docs good pages are in or the budget expires.
+
+    Args:
+        urls: Candidate URLs, best first
+        fetch: Coroutine function returning a scraped doc dict for one URL
+        target_docs: Stop once this many docs reach min_quality
+        min_quality: content_quality() needed for a doc to count
+        budget_seconds: Overall time limit for the stage
+
+    Returns:
+        Finished docs in the original rank order, each with a "quality" key
+    """
+    urls = dedupe_urls(urls)
+    if not urls:
+        return []
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget_seconds
+    pending = {asyncio.create_task(fetch(url)): rank for rank, url in enumerate(urls)}
+    finished = {}
+    good = 0
+
+    try:
+        while pending and good < target_docs:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                rank = pending.pop(task)
+                try:
+                    doc = task.result()
+                except Exception as e:
+                    doc = {"url": urls[rank], "success": False, "error": str(e)}
+                doc["quality"] = content_quality(doc)
+                finished[rank] = doc
+                if doc["quality"] >= min_quality:
+                    good += 1
+    finally:
+        if pending:
+            logger.info(f"Scrape cutoff: {good} good docs, cancelling {len(pending)} unfinished pages")
+            for task in pending:
+                task.cancel()
+            # Let the cancelled scrapes hand their pages back to the pool
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return [finished[rank] for rank in sorted(finished)]
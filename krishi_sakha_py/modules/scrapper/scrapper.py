@@ -2,30 +2,29 @@ import asyncio
 import random
 import logging
 from typing import List, Dict, Union
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from bs4 import BeautifulSoup
 import trafilatura
 import json
 from modules.search.searxng_json import searxng_search
+from modules.scrapper.browser_pool import browser_pool
+from modules.scrapper.http_fetcher import (
+    http_fetcher, domain_tiers, has_enough_text, TIER_HTTP, TIER_BROWSER
+)
+from modules.scrapper.page_cache import get_page_cache, cached_doc
+from modules.scrapper.ranked_fetch import fetch_ranked, dedupe_urls, DEFAULT_TARGET_DOCS, DEFAULT_BUDGET_SECONDS
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class FastPlaywrightScraper:
-    def __init__(self, headless: bool = True, timeout: int = 4000, max_parallel: int = 5):
-        self.headless = headless
+    # Headless mode is set on the shared browser_pool, not per scraper
+    def __init__(self, timeout: int = 4000, max_parallel: int = 5):
         self.timeout = timeout
         self.max_parallel = max_parallel
 
     async def scrape_page(self, page, url: str, main_selector: str = None) -> Dict[str, Union[str, bool]]:
         try:
-            # Block heavy resources
-            async def route_intercept(route, request):
-                if request.resource_type in ["image", "media", "font", "stylesheet"]:
-                    await route.abort()
-                else:
-                    await route.continue_()
-            await page.route("**/*", route_intercept)
-
+            # Heavy resources are blocked on the pooled browser context
             # Go to page; no networkidle wait
             await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
 
@@ -42,7 +41,9 @@ class FastPlaywrightScraper:
             final_url = page.url
 
             extracted_content = trafilatura.extract(html_content, url=final_url)
+            extractor = "trafilatura"
             if not extracted_content:
+                extractor = "soup"
                 soup = BeautifulSoup(html_content, 'html.parser')
                 extracted_content = soup.get_text(separator='\n', strip=True)
 
@@ -51,6 +52,7 @@ class FastPlaywrightScraper:
                 "title": title,
                 "content": extracted_content[:8000] if extracted_content else "",
                 "success": True,
+                "extractor": extractor,
                 "html_length": len(html_content)
             }
 
@@ -61,52 +63,92 @@ class FastPlaywrightScraper:
             logger.error(f"❌ Error fetching {url}: {e}")
             return {"url": url, "success": False, "error": str(e)}
 
+    async def _fetch_browser(self, url: str, semaphore: asyncio.Semaphore, main_selector: str = None) -> Dict:
+        # Pages come from the shared browser pool, which also caps how many
+        # pages are open across all concurrent scrapes
+        async with semaphore:
+            async with browser_pool.page() as page:
+                result = await self.scrape_page(page, url, main_selector=main_selector)
+            # tiny random delay to mimic human browsing
+            await asyncio.sleep(random.uniform(0.05, 0.2))
+            result["tier"] = TIER_BROWSER
+            return result
+
+    async def _fetch(self, url: str, semaphore: asyncio.Semaphore, main_selector: str = None) -> Dict:
+        # The cache reads and writes JSON files; keep that off the event loop
+        page_cache = await asyncio.to_thread(get_page_cache)
+        cached = await asyncio.to_thread(page_cache.lookup, url)
+        if cached and cached["fresh"]:
+            return cached_doc(cached)
+
+        doc = await self._fetch_tiered(url, semaphore, main_selector, cached)
+        if doc.get("not_modified"):
+            return cached_doc(await asyncio.to_thread(page_cache.mark_revalidated, url) or cached)
+        if has_enough_text(doc):
+            await asyncio.to_thread(page_cache.put, url, doc, doc.get("etag"), doc.get("last_modified"))
+        elif cached:
+            # Refetch came back worse (site down, bot wall); stale beats nothing
+            return cached_doc(cached)
+        return doc
+
+    async def _fetch_tiered(self, url: str, semaphore: asyncio.Semaphore,
+                            main_selector: str = None, cached: Dict = None) -> Dict:
+        # Static pages are fetched over plain HTTP; Chromium is only used when
+        # that yields too little text or the domain is known to need it
+        http_doc = None
+        if domain_tiers.preferred_tier(url) != TIER_BROWSER:
+            validators = {}
+            if cached:
+                validators = {"etag": cached.get("etag"), "last_modified": cached.get("last_modified")}
+            http_doc = await http_fetcher.fetch(url, **validators)
+            if http_doc.get("not_modified"):
+                return http_doc
+            if has_enough_text(http_doc):
+                domain_tiers.record(url, TIER_HTTP)
+                return http_doc
+            if not http_doc.get("escalate", True):
+                return http_doc
+
+        browser_doc = await self._fetch_browser(url, semaphore, main_selector)
+        if has_enough_text(browser_doc):
+            domain_tiers.record(url, TIER_BROWSER)
+            return browser_doc
+        # Neither tier got a full article; keep whichever has more text
+        if http_doc and http_doc.get("success") and \
+                len(http_doc.get("content") or "") >= len(browser_doc.get("content") or ""):
+            return http_doc
+        return browser_doc
+
     async def scrape_multiple(self, urls: List[str], main_selector: str = None) -> List[Dict]:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless, args=[
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--disable-blink-features=AutomationControlled'
-            ])
-            context = await browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-
-            # Stealth mode
-            await context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                window.chrome = {runtime: {}};
-                Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
-            """)
-
-            semaphore = asyncio.Semaphore(self.max_parallel)
-
-            async def fetch(url):
-                async with semaphore:
-                    page = await context.new_page()
-                    result = await self.scrape_page(page, url, main_selector=main_selector)
-                    await page.close()
-                    # tiny random delay to mimic human browsing
-                    await asyncio.sleep(random.uniform(0.05, 0.2))
-                    return result
-
-            results = await asyncio.gather(*(fetch(url) for url in urls))
-            await browser.close()
-            return results
-
-
-async def json_scrapped(query : str):
-    url = searxng_search(query)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        return await asyncio.gather(*(self._fetch(url, semaphore, main_selector) for url in urls))
+
+    async def scrape_ranked(self,
+                            urls: List[str],
+                            main_selector: str = None,
+                            target_docs: int = DEFAULT_TARGET_DOCS,
+                            budget_seconds: float = DEFAULT_BUDGET_SECONDS) -> List[Dict]:
+        """Scrape ranked search results, stopping once enough good text is in."""
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        return await fetch_ranked(
+            urls,
+            lambda url: self._fetch(url, semaphore, main_selector),
+            target_docs=target_docs,
+            budget_seconds=budget_seconds
+        )
+
+
+async def json_scrapped(query : str, max_urls: int = 8):
+    # searxng_search uses blocking requests; keep it off the event loop
+    urls = await asyncio.to_thread(searxng_search, query, max_results=max_urls) or []
     scraper = FastPlaywrightScraper(
-        headless=True,
         timeout=4000,   # max 4 sec
         max_parallel=10  # parallel scraping
     )
 
-    results = await scraper.scrape_multiple(
-        [url],
+    # Dedupe before the cut so mirrors of one page don't use up the slots
+    results = await scraper.scrape_ranked(
+        dedupe_urls(urls, limit=max_urls),
         main_selector="main, article, .Post"
     )
 
@@ -128,7 +170,6 @@ async def json_scrapped(query : str):
 async def search_from_url(url: str):
 
     scraper = FastPlaywrightScraper(
-        headless=True,
         timeout=4000,   # max 4 sec
         max_parallel=10  # parallel scraping
     )
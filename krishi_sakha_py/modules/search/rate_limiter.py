@@ -0,0 +1,48 @@
+"""
+Async token-bucket rate limiter.
+
+Batch jobs (e.g. per-crop market lookups) share one limiter so they can fire
+their SearxNG queries concurrently without hammering the instance, instead of
+sleeping a fixed time between sequential calls.
+"""
+
+import time
+import asyncio
+from typing import Callable
+
+
+class AsyncRateLimiter:
+    """Allows `rate` acquisitions per second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float = 4.0, burst: int = 4, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+# Shared limiter for SearxNG queries issued by batch lookups
+searxng_rate_limiter = AsyncRateLimiter()
@@ -0,0 +1,112 @@
+"""
+Concurrent retrieval fan-out for the search flows in /chat and /search.
+
+Every source (YouTube, SearxNG + scrape, ...) is started at once and bounded
+by its own deadline. Results are yielded in completion order so the caller can
+stream an SSE event per source as soon as it lands, and whatever is ready when
+the deadlines pass is what goes to the model.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional
+
+from modules.scrapper.scrapper import json_scrapped
+from modules.youtube.youtube_search import search_youtube
+
+logger = logging.getLogger(__name__)
+
+# Seconds each source may take before we give up on it
+DEFAULT_SOURCE_DEADLINES = {
+    "youtube": 4.0,
+    "web": 8.0,
+}
+DEFAULT_OVERALL_DEADLINE = 10.0
+
+SourceFactory = Callable[[], Awaitable[Any]]
+
+
+class RetrievalOrchestrator:
+    """Runs named retrieval sources concurrently under per-source deadlines."""
+
+    def __init__(self,
+                 source_deadlines: Optional[Dict[str, float]] = None,
+                 overall_deadline: float = DEFAULT_OVERALL_DEADLINE):
+        self.source_deadlines = dict(DEFAULT_SOURCE_DEADLINES)
+        if source_deadlines:
+            self.source_deadlines.update(source_deadlines)
+        self.overall_deadline = overall_deadline
+
+    async def _run_source(self, name: str, factory: SourceFactory, deadline: float) -> Dict:
+        start = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(factory(), timeout=deadline)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            logger.warning(f"Retrieval source '{name}' missed its {deadline:.1f}s deadline")
+            data, status, error = None, "timeout", f"Deadline of {deadline:.1f}s exceeded"
+        except Exception as e:
+            logger.error(f"Retrieval source '{name}' failed: {e}")
+            data, status, error = None, "error", str(e)
+
+        return {
+            "source": name,
+            "status": status,
+            "data": data,
+            "error": error,
+            "elapsed": time.perf_counter() - start,
+        }
+
+    async def run(self, sources: Dict[str, SourceFactory]) -> AsyncGenerator[Dict, None]:
+        """
+        Start all sources and yield one result dict per source as it finishes.
+
+        Args:
+            sources: Mapping of source name to a zero-argument coroutine factory
+
+        Yields:
+            {"source", "status" (ok/timeout/error), "data", "error", "elapsed"}
+        """
+        tasks = []
+        for name, factory in sources.items():
+            deadline = min(self.source_deadlines.get(name, self.overall_deadline), self.overall_deadline)
+            tasks.append(asyncio.create_task(self._run_source(name, factory, deadline)))
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The client may disconnect mid-stream; don't leave scrapes running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+def build_search_sources(
+    query: str,
+    youtube_limit: int = 5,
+    web_query: Optional[Awaitable[str]] = None
+) -> Dict[str, SourceFactory]:
+    """
+    Standard YouTube + web sources for a search query.
+
+    Args:
+        query: Query used for YouTube (and the web when web_query is not given)
+        youtube_limit: Maximum number of YouTube results
+        web_query: Optional awaitable resolving to a rewritten web search query,
+            e.g. a preprocess task still running while YouTube already searches
+    """
+    async def youtube():
+        # search_youtube uses blocking requests; keep it off the event loop
+        return await asyncio.to_thread(search_youtube, query, youtube_limit)
+
+    async def web():
+        search_query = (await web_query) if web_query is not None else query
+        return await json_scrapped(search_query or query)
+
+    return {"youtube": youtube, "web": web}
+
+
+# Global orchestrator instance
+retrieval_orchestrator = RetrievalOrchestrator()
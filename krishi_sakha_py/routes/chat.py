@@ -2,16 +2,22 @@ from fastapi import APIRouter, UploadFile, File, Form, Depends
 from fastapi.responses import StreamingResponse
 from typing import Optional, List, Any
 import json
+import asyncio
 import logging
 
 from routes.middlewares.auth_middleware import supabase_jwt_middleware
 from brain.model_run import model_runner
-from routes.helpers.router_picker import route_question
+from routes.helpers.router_picker import route_question_async, get_routing_stats
 from routes.helpers.push_supabase import push_to_supabase
-from data.functions.add_to_vector_db import PDFVectorDBManager
-from modules.scrapper.scrapper import json_scrapped
+from data.functions.vector_db_registry import vector_db_registry
+from configs.vector_db_config import HYBRID_SEARCH_COLLECTIONS
+from configs.rerank_config import RERANK_ENABLED, RERANK_CANDIDATES
+from brain.context_reranker import context_reranker
+from modules.search.retrieval_orchestrator import build_search_sources
+from routes.helpers.search_events import extract_urls, stream_retrieval_events
+from brain.language_brain import language_translator, LANGUAGE_NAMES
+from brain.translation_stream import translate_stream
 from typing import Dict
-from modules.youtube.youtube_search import search_youtube
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -30,12 +36,21 @@ def flatten_docs(docs: List[Any]) -> List[str]:
         else:
             flat_list.append(str(doc))
     return flat_list
+
+
+@router.get("/chat/routing-stats")
+async def routing_stats(user=Depends(supabase_jwt_middleware)):
+    """How /chat questions were routed (local classifier, route cache or LLM) and route cache counters."""
+    return get_routing_stats()
+
+
 @router.post("/chat")
 async def chat_endpoint(
     prompt: str = Form(...),
     conversation_id: str = Form(...),
     image: Optional[UploadFile] = File(None),
     history:str = Form(None),
+    language: Optional[str] = Form(None),
     user=Depends(supabase_jwt_middleware)
 ):
     user_id = user.get("sub")
@@ -105,7 +120,7 @@ async def chat_endpoint(
             yield f"data: {json.dumps({'type': 'status', 'message': 'Processing query...'})}\n\n"
             yield f"data: {json.dumps({'type': 'status', 'message': 'Routing query...'})}\n\n"
 
-            routing = route_question(prompt)
+            routing = await route_question_async(prompt)
             logger.info(f"Routing result: {routing}")
 
             domain = routing.get("domain", "general")
@@ -129,91 +144,77 @@ async def chat_endpoint(
             if domain != "general":
                 if domain != "search":
                     yield f"data: {json.dumps({'type': 'status', 'message': 'Searching for context...'})}\n\n"
-                    db_manager = PDFVectorDBManager(
-                        vector_db_type="chroma",
-                        embedding_method="sentence_transformers",
-                        db_path="/home/linmar/Desktop/Krishi-Sakha/krishi_sakha_py/chroma_db",
-                        collection_name=domain
-                    )
+                    db_manager = vector_db_registry.get(domain)
 
                     search_query = " ".join(keywords) if keywords else prompt
-                    results = db_manager.search_documents(query=search_query, n_results=5)
-                    if not results.get("documents") or results["documents"] == [[]]:
-                        results = db_manager.search_documents(query=prompt, n_results=5)
+                    # Over-fetch; the cross-encoder keeps the best 5
+                    n_results = RERANK_CANDIDATES if RERANK_ENABLED else 5
+                    if domain in HYBRID_SEARCH_COLLECTIONS:
+                        # BM25 catches the exact figures and years MiniLM blurs,
+                        # so no retry with the raw prompt is needed
+                        # Encode, Chroma and the FTS5 query all block; keep them off the loop
+                        results = await asyncio.to_thread(
+                            db_manager.hybrid_search, query=search_query, n_results=n_results)
+                    else:
+                        # The MiniLM encode (and its batching wait) and the Chroma query block
+                        results = await asyncio.to_thread(
+                            db_manager.search_documents, query=search_query, n_results=n_results)
+                        # Retrying with the same text would only repeat the search
+                        if (not results.get("documents") or results["documents"] == [[]]) and search_query != prompt:
+                            results = await asyncio.to_thread(
+                                db_manager.search_documents, query=prompt, n_results=n_results)
+                    # Scored against the user's question, not the extracted keywords
+                    results = await asyncio.to_thread(context_reranker.rerank, prompt, results, 5)
                     docs_flat = flatten_docs(results.get("documents", []))
-                    context = "\n".join(docs_flat) if docs_flat else ""
+                    # model_runner.generate packs the chunks into the token budget
+                    context = results if docs_flat else ""
 
                     yield f"data: {json.dumps({'type': 'status', 'message': f'Context found: {len(docs_flat)} documents'})}\n\n"
                 else:
-                    yield f"data: {json.dumps({'type': 'status', 'message': 'Searching on YouTube...'})}\n\n"
-                    youtube_urls = search_youtube(query, limit=5)  # Limit to 5 results
-                    
-                    yield f"data: {json.dumps({'type': 'status', 'message': 'Searching on the internet...'})}\n\n"
-                    context = await json_scrapped(query)
-                    
-                    # Extract and send URLs immediately
-                    urls = []
-                    for item in context:
-                        if "url" in item:
-                            if isinstance(item["url"], list):
-                                urls.extend(item["url"])
-                            else:
-                                urls.append(item["url"])
-                    
-                    # Send URLs as separate event
-                    yield f"data: {json.dumps({'type': 'urls', 'urls': urls})}\n\n"
-                    
-                    # Send YouTube results as separate event with proper encoding
-                    try:
-                        # Clean the YouTube results to ensure JSON compatibility
-                        cleaned_results = []
-                        for result in youtube_urls:
-                            cleaned_result = {}
-                            for key, value in result.items():
-                                if isinstance(value, str):
-                                    # Ensure proper encoding and remove any problematic characters
-                                    cleaned_result[key] = value.encode('utf-8', 'ignore').decode('utf-8')
-                                else:
-                                    cleaned_result[key] = value
-                            cleaned_results.append(cleaned_result)
-                        
-                        youtube_json = json.dumps({'type': 'youtube', 'results': cleaned_results}, ensure_ascii=False)
-                        yield f"data: {youtube_json}\n\n"
-                    except Exception as json_error:
-                        logger.error(f"Error serializing YouTube results: {json_error}")
-                        yield f"data: {json.dumps({'type': 'youtube', 'results': []})}\n\n"
+                    yield f"data: {json.dumps({'type': 'status', 'message': 'Searching on YouTube and the internet...'})}\n\n"
+                    # YouTube and web scrape run concurrently; each event is
+                    # streamed as soon as its source finishes or times out
+                    retrieved = {}
+                    async for event in stream_retrieval_events(build_search_sources(query, youtube_limit=5), retrieved):
+                        yield event
+                    context = retrieved.get("web") or []
+                    youtube_urls = retrieved.get("youtube") or []
             # Stream normal model
             yield f"data: {json.dumps({'type': 'status', 'message': 'Generating response...'})}\n\n"
 
             # Collect the full response for saving to DB
             full_response = ""
-            async for chunk in model_runner.generate(
+            generation = model_runner.generate(
                 question=prompt,
-                context="Internet web scrapper result : " + json.dumps(context) if domain == "search" else context,
+                context=context,
                 conversation_id=conversation_id,
                 user_id=user_id,
                 stream=True,
                 history=history,
                 metadata=None,  # No metadata needed since we send events directly
                 push_to_db=False  # Prevent automatic DB save to avoid duplicates
-            ):
-                full_response += chunk
-                yield f"data: {json.dumps({'type': 'text', 'chunk': chunk})}\n\n"
+            )
+            if language in LANGUAGE_NAMES:
+                # English chunks stream as before; each finished sentence is
+                # also sent as a 'translation' event
+                events = translate_stream(generation, language, language_translator.translate_async)
+            else:
+                if language and language != "en":
+                    yield f"data: {json.dumps({'type': 'status', 'message': f'Translation to {language} is not supported'})}\n\n"
+                events = ({'type': 'text', 'chunk': chunk} async for chunk in generation)
+
+            async for event in events:
+                if event['type'] == 'text':
+                    full_response += event['chunk']
+                yield f"data: {json.dumps(event)}\n\n"
 
             # Save the complete response to database (single save)
             if full_response:
                 # Only include metadata for database storage when domain is search
                 metadata_for_db = None
                 if domain == "search":
-                    urls = []
-                    for item in context:
-                        if "url" in item:
-                            if isinstance(item["url"], list):
-                                urls.extend(item["url"])
-                            else:
-                                urls.append(item["url"])
                     metadata_for_db = {
-                        'url': urls,
+                        'url': extract_urls(context),
                         'youtberelated': youtube_urls if 'youtube_urls' in locals() else []
                     }
                 
@@ -1,17 +1,12 @@
 import json
 import logging
-import google.generativeai as genai
-from configs.external_keys import GEMINI_API_KEY
+from brain.brain_init import get_gemini_model
 from configs.model_config import AI_SEARCH_SYSTEM_MESSAGE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-2.0-flash')
-
 
 def preprocess_query(user_question: str) -> dict:
     """
@@ -20,7 +15,7 @@ def preprocess_query(user_question: str) -> dict:
     """
     try:
         prompt = f"{AI_SEARCH_SYSTEM_MESSAGE}\n\nQuestion: \"{user_question}\""
-        response = model.generate_content(prompt)
+        response = get_gemini_model().generate_content(prompt)
         response_text = response.text.strip()
         logger.info(f"Raw routing response: {response_text}")
 
@@ -0,0 +1,175 @@
+"""
+Route cache for the /chat domain router.
+
+Farmers ask the same handful of questions over and over ("wheat rust treatment",
+"PM Kisan installment date"), so the Gemini routing decision for a prompt is
+remembered for a while. Lookups first try the normalised prompt text and then,
+when an embedding is supplied, the most similar cached prompt. A similar
+prompt only lends its domain; keywords and query come from the prompt asked.
+"""
+
+import re
+import copy
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from routes.helpers.domain_classifier import extract_keywords
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    text = re.sub(r"[^\w\s]", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+def _extract_years(text: str) -> Tuple[str, ...]:
+    return tuple(sorted(set(_YEAR_PATTERN.findall(text))))
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector] if norm else list(vector)
+
+
+class _Entry:
+    __slots__ = ("result", "expires_at", "embedding", "years")
+
+    def __init__(self, result: Dict, expires_at: float, embedding, years: Tuple[str, ...]):
+        self.result = result
+        self.expires_at = expires_at
+        self.embedding = embedding
+        self.years = years
+
+
+class RouteCache:
+    """TTL + LRU cache of routing results with nearest-neighbour fallback."""
+
+    def __init__(self,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _evict_expired(self, now: float):
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _nearest(self, embedding, years: Tuple[str, ...]) -> Tuple[Optional[str], float]:
+        # Only compare against prompts that mention the same years, otherwise
+        # "fertilizer usage 2023" would happily reuse the 2024 answer.
+        candidates = [(key, entry.embedding) for key, entry in self._entries.items()
+                      if entry.embedding is not None and entry.years == years]
+        if not candidates:
+            return None, 0.0
+
+        if NUMPY_AVAILABLE:
+            matrix = np.asarray([vec for _, vec in candidates], dtype=np.float32)
+            scores = matrix @ np.asarray(embedding, dtype=np.float32)
+            best = int(scores.argmax())
+            return candidates[best][0], float(scores[best])
+
+        best_key, best_score = None, -1.0
+        for key, vec in candidates:
+            score = sum(a * b for a, b in zip(vec, embedding))
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    def lookup(self, prompt: str, embedding: Optional[List[float]] = None,
+               record_miss: bool = True) -> Optional[Dict]:
+        """
+        Return a cached routing result for the prompt, or None.
+
+        Args:
+            prompt: Raw user prompt
+            embedding: Optional prompt embedding for the similarity fallback
+            record_miss: Set to False for a cheap exact-only probe that will be
+                followed by a second lookup with the embedding
+        """
+        key = normalize_prompt(prompt)
+        now = self._clock()
+        with self._lock:
+            self._evict_expired(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return copy.deepcopy(entry.result)
+
+            if embedding is not None:
+                near_key, score = self._nearest(_unit(list(embedding)), _extract_years(key))
+                if near_key is not None and score >= self.similarity_threshold:
+                    self._entries.move_to_end(near_key)
+                    self.semantic_hits += 1
+                    return self._semantic_result(prompt, self._entries[near_key].result)
+
+            if record_miss:
+                self.misses += 1
+            return None
+
+    @staticmethod
+    def _semantic_result(prompt: str, cached: Dict) -> Dict:
+        # Another question's keywords would search the vector DB for the wrong thing
+        years = _YEAR_PATTERN.findall(prompt)
+        return {
+            "domain": cached.get("domain"),
+            "reason": cached.get("reason", ""),
+            "year": years[0] if years else None,
+            "keywords": extract_keywords(prompt),
+            "query": prompt,
+        }
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store(self, prompt: str, result: Dict, embedding: Optional[List[float]] = None):
+        key = normalize_prompt(prompt)
+        if not key:
+            return
+        unit = _unit(list(embedding)) if embedding is not None else None
+        with self._lock:
+            self._entries[key] = _Entry(copy.deepcopy(result), self._clock() + self.ttl_seconds, unit, _extract_years(key))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
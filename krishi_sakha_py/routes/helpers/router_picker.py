@@ -1,16 +1,141 @@
 import json
+import time
+import asyncio
 import logging
-import google.generativeai as genai
-from configs.external_keys import GEMINI_API_KEY
+from typing import Dict, Optional
+from brain.brain_init import get_gemini_model
 from configs.model_config import ROUTER_CONFIG_DISCRIPTION_SYSTEM_PROMPT
+from routes.helpers.route_cache import RouteCache
+from routes.helpers.domain_classifier import DomainClassifier
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-2.0-flash')
+VALID_DOMAINS = ["annual_report", "general", "search", "false"]
+
+
+class GeminiRouterBackend:
+    """Routes questions with Gemini; `agenerate` never blocks the event loop."""
+
+    def __init__(self, model_name: str = 'gemini-2.0-flash'):
+        self.model_name = model_name
+
+    @property
+    def model(self):
+        return get_gemini_model(self.model_name)
+
+    def generate(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt)
+        return response.text
+
+    async def agenerate(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+
+class StubRouterBackend:
+    """
+    Offline backend for tests and benchmarks.
+
+    Returns a fixed routing JSON after an optional simulated latency, and
+    counts how often it was called.
+    """
+
+    def __init__(self, response: Optional[Dict] = None, latency: float = 0.0):
+        self.response = response or {"domain": "general", "reason": "stub", "keywords": []}
+        self.latency = latency
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return json.dumps(self.response)
+
+    async def agenerate(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return json.dumps(self.response)
+
+
+router_backend = GeminiRouterBackend()
+route_cache = RouteCache()
+domain_classifier = DomainClassifier.from_file()
+
+# How each routed question was answered: local classifier, cache or LLM
+routing_stats = {"local": 0, "cache": 0, "llm": 0}
+
+
+def get_routing_stats() -> dict:
+    total = sum(routing_stats.values())
+    skipped = routing_stats["local"] + routing_stats["cache"]
+    return {
+        **routing_stats,
+        "total": total,
+        "llm_skip_rate": skipped / total if total else 0.0,
+        "cache_stats": route_cache.stats(),
+    }
+
+
+def _build_prompt(user_question: str) -> str:
+    return f"{ROUTER_CONFIG_DISCRIPTION_SYSTEM_PROMPT}\n\nQuestion: \"{user_question}\""
+
+
+def _parse_routing_response(response_text: str) -> dict:
+    response_text = response_text.strip()
+    logger.info(f"Raw routing response: {response_text}")
+
+    # Try extracting JSON
+    try:
+        start_idx = response_text.find('{')
+        end_idx   = response_text.rfind('}') + 1
+        if start_idx != -1 and end_idx != 0:
+            json_str = response_text[start_idx:end_idx]
+            routing_result = json.loads(json_str)
+        else:
+            routing_result = json.loads(response_text)
+    except Exception:
+        routing_result = {
+            "domain": "general",
+            "reason": "Failed to parse routing response, defaulting to general",
+            "year": None,
+            "keywords": []
+        }
+
+    # Validate domain
+    if routing_result.get("domain") not in VALID_DOMAINS:
+        routing_result["domain"] = "general"
+        routing_result["reason"] = routing_result.get("reason", "") + " (Invalid domain returned, defaulting to general)"
+
+    # Ensure year and keywords keys exist
+    if "year" not in routing_result:
+        routing_result["year"] = None
+    if "keywords" not in routing_result:
+        routing_result["keywords"] = []
+
+    logger.info(f"Parsed routing result: {routing_result}")
+    return routing_result
+
+
+def _routing_error(e: Exception) -> dict:
+    return {
+        "domain": "general",
+        "reason": f"Error in routing: {str(e)}",
+        "year": None,
+        "keywords": []
+    }
+
+
+def _embed_question(user_question: str):
+    """Embed the question with the shared MiniLM model, or None if unavailable."""
+    try:
+        from data.functions.vector_db_registry import vector_db_registry
+        return vector_db_registry.get_embedding_generator().generate_embeddings([user_question])[0]
+    except Exception as e:
+        logger.warning(f"Route cache embedding unavailable: {e}")
+        return None
 
 
 def route_question(user_question: str) -> dict:
@@ -19,50 +144,72 @@ def route_question(user_question: str) -> dict:
     Returns a dictionary with domain, reason, year, and keywords.
     """
     try:
-        prompt = f"{ROUTER_CONFIG_DISCRIPTION_SYSTEM_PROMPT}\n\nQuestion: \"{user_question}\""
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        logger.info(f"Raw routing response: {response_text}")
-
-        # Try extracting JSON
-        try:
-            start_idx = response_text.find('{')
-            end_idx   = response_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = response_text[start_idx:end_idx]
-                routing_result = json.loads(json_str)
-            else:
-                routing_result = json.loads(response_text)
-        except Exception:
-            routing_result = {
-                "domain": "general",
-                "reason": "Failed to parse routing response, defaulting to general",
-                "year": None,
-                "keywords": []
-            }
-
-        # Validate domain
-        valid_domains = ["annual_report", "general", "search", "false"]
-        if routing_result.get("domain") not in valid_domains:
-            routing_result["domain"] = "general"
-            routing_result["reason"] += " (Invalid domain returned, defaulting to general)"
-
-        # Ensure year and keywords keys exist
-        if "year" not in routing_result:
-            routing_result["year"] = None
-        if "keywords" not in routing_result:
-            routing_result["keywords"] = []
-
-        logger.info(f"Parsed routing result: {routing_result}")
-        return routing_result
+        response_text = router_backend.generate(_build_prompt(user_question))
+        return _parse_routing_response(response_text)
+    except Exception as e:
+        return _routing_error(e)
+
+
+async def route_question_async(
+    user_question: str,
+    backend=None,
+    cache: Optional[RouteCache] = None,
+    use_embeddings: bool = True,
+    classifier: Optional[DomainClassifier] = None
+) -> dict:
+    """
+    Non-blocking version of route_question for the SSE handlers.
 
+    Tries, in order: local keyword rules, the route cache on the normalised
+    prompt, the local centroid classifier and the cache's nearest prompt
+    embedding. Only when none of them is confident is the LLM backend called.
+    """
+    backend = backend or router_backend
+    cache = cache if cache is not None else route_cache
+    classifier = classifier if classifier is not None else domain_classifier
+
+    local = classifier.classify_rules(user_question)
+    if local is not None:
+        routing_stats["local"] += 1
+        logger.info(f"Local routing (rules): {local['domain']}")
+        return local
+
+    cached = cache.lookup(user_question, record_miss=False)
+    if cached is not None:
+        routing_stats["cache"] += 1
+        logger.info(f"Route cache hit (exact): {cached.get('domain')}")
+        return cached
+
+    embedding = None
+    if use_embeddings:
+        embedding = await asyncio.to_thread(_embed_question, user_question)
+        if embedding is not None:
+            local = classifier.classify_embedding(user_question, embedding)
+            if local is not None:
+                routing_stats["local"] += 1
+                logger.info(f"Local routing (centroid): {local['domain']}")
+                return local
+
+            cached = cache.lookup(user_question, embedding)
+            if cached is not None:
+                routing_stats["cache"] += 1
+                logger.info(f"Route cache hit (similar): {cached.get('domain')}")
+                return cached
+    if embedding is None:
+        cache.record_miss()
+
+    routing_stats["llm"] += 1
+
+    try:
+        response_text = await backend.agenerate(_build_prompt(user_question))
+        routing_result = _parse_routing_response(response_text)
     except Exception as e:
-        return {
-            "domain": "general",
-            "reason": f"Error in routing: {str(e)}",
-            "year": None,
-            "keywords": []
-        }
+        return _routing_error(e)
+
+    # Don't pin parse failures in the cache; the next attempt may succeed
+    if not routing_result.get("reason", "").startswith("Failed to parse"):
+        cache.store(user_question, routing_result, embedding)
+    return routing_result
 
 
 def get_route_for_question(question: str) -> str:
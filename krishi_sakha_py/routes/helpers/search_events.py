@@ -0,0 +1,68 @@
+import json
+import logging
+from typing import Any, AsyncGenerator, Dict, List
+
+from modules.search.retrieval_orchestrator import retrieval_orchestrator
+
+logger = logging.getLogger(__name__)
+
+
+def extract_urls(scraped_docs: List[Dict]) -> List[str]:
+    """Collect the page URLs from json_scrapped output."""
+    urls = []
+    for item in scraped_docs or []:
+        if "url" in item:
+            if isinstance(item["url"], list):
+                urls.extend(item["url"])
+            else:
+                urls.append(item["url"])
+    return urls
+
+
+def youtube_event(youtube_results: List[Dict]) -> str:
+    """SSE event for YouTube results, cleaned for JSON compatibility."""
+    try:
+        cleaned_results = []
+        for result in youtube_results or []:
+            cleaned_result = {}
+            for key, value in result.items():
+                if isinstance(value, str):
+                    # Ensure proper encoding and remove any problematic characters
+                    cleaned_result[key] = value.encode('utf-8', 'ignore').decode('utf-8')
+                else:
+                    cleaned_result[key] = value
+            cleaned_results.append(cleaned_result)
+
+        youtube_json = json.dumps({'type': 'youtube', 'results': cleaned_results}, ensure_ascii=False)
+        return f"data: {youtube_json}\n\n"
+    except Exception as json_error:
+        logger.error(f"Error serializing YouTube results: {json_error}")
+        return f"data: {json.dumps({'type': 'youtube', 'results': []})}\n\n"
+
+
+async def stream_retrieval_events(
+    sources: Dict[str, Any],
+    collected: Dict[str, Any]
+) -> AsyncGenerator[str, None]:
+    """
+    Run retrieval sources concurrently and yield SSE events as each finishes.
+
+    `collected` is filled with each source's data (None when it timed out or
+    failed) so the caller can build the model context afterwards.
+    """
+    for name in sources:
+        collected[name] = None
+
+    async for result in retrieval_orchestrator.run(sources):
+        name = result["source"]
+        collected[name] = result["data"]
+        logger.info(f"Retrieval '{name}' finished: {result['status']} in {result['elapsed']:.2f}s")
+
+        if name == "web":
+            yield f"data: {json.dumps({'type': 'urls', 'urls': extract_urls(result['data'])})}\n\n"
+        elif name == "youtube":
+            yield youtube_event(result["data"])
+
+        if result["status"] != "ok":
+            message = f"{name} results unavailable ({result['status']})"
+            yield f"data: {json.dumps({'type': 'status', 'message': message})}\n\n"
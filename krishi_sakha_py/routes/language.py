@@ -4,11 +4,14 @@ For FastAPI application - Indian language translation support
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import json
 import logging
 
 from brain.language_brain import language_translator, LANGUAGE_NAMES
+from brain.translation_workers import TranslationOverloaded
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,6 +30,13 @@ class BatchTranslateRequest(BaseModel):
     language: str = "hi"
 
 
+class DocumentTranslateRequest(BaseModel):
+    """Request model for long-document translation"""
+    text: str
+    language: str = "hi"
+    stream: bool = False
+
+
 class LanguageInfo(BaseModel):
     """Language information model"""
     code: str
@@ -124,7 +134,7 @@ async def translate(request: TranslateRequest):
             )
         print(request.language)
         # Translate using the brain module
-        result = language_translator.translate(request.text, request.language)
+        result = await language_translator.translate_async(request.text, request.language)
         
         if not result.get('success'):
             raise HTTPException(status_code=400, detail=result.get('error', 'Translation failed'))
@@ -133,6 +143,8 @@ async def translate(request: TranslateRequest):
     
     except HTTPException:
         raise
+    except TranslationOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
     except Exception as e:
         logger.error(f"Translation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -174,7 +186,7 @@ async def batch_translate(request: BatchTranslateRequest):
             )
         
         # Translate using the brain module
-        result = language_translator.batch_translate(request.texts, request.language)
+        result = await language_translator.batch_translate_async(request.texts, request.language)
         
         if not result.get('success'):
             raise HTTPException(status_code=400, detail=result.get('error', 'Batch translation failed'))
@@ -184,11 +196,84 @@ async def batch_translate(request: BatchTranslateRequest):
     
     except HTTPException:
         raise
+    except TranslationOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
     except Exception as e:
         logger.error(f"Batch translation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/translate-document")
+async def translate_document(request: DocumentTranslateRequest):
+    """
+    Translate a long text (e.g. a whole crop-advice report) without truncation
+    
+    The text is split on paragraph and sentence boundaries into segments that
+    fit the model; bullets, numbering and line breaks are kept.
+    
+    Request:
+    {
+        "text": "## Wheat\n- Irrigate in the evening.\n- Apply urea after rain.",
+        "language": "hi",
+        "stream": false
+    }
+    
+    With "stream": true the response is SSE: one {"type": "partial", "text",
+    "completed", "total"} event per batch of segments, then {"type": "complete"}.
+    """
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text is required")
+
+    if request.language not in LANGUAGE_NAMES.keys():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid language. Supported: {list(LANGUAGE_NAMES.keys())}"
+        )
+
+    if request.stream:
+        parts = language_translator.translate_document_stream(request.text, request.language)
+        # Translate the first window before the response starts, so a full
+        # queue is still a 503 with Retry-After rather than an SSE error
+        try:
+            first = await parts.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except TranslationOverloaded as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
+        except Exception as e:
+            logger.error(f"Document translation error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        async def event_stream():
+            try:
+                if first is not None:
+                    yield f"data: {json.dumps({'type': 'partial', **first})}\n\n"
+                async for part in parts:
+                    yield f"data: {json.dumps({'type': 'partial', **part})}\n\n"
+                yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            except Exception as e:
+                logger.error(f"Document translation stream error: {e}")
+                yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    try:
+        result = await language_translator.translate_document(request.text, request.language)
+
+        if not result.get('success'):
+            raise HTTPException(status_code=400, detail=result.get('error', 'Translation failed'))
+
+        return result
+
+    except HTTPException:
+        raise
+    except TranslationOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
+    except Exception as e:
+        logger.error(f"Document translation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/translate-with-context")
 async def translate_with_context(
     text: str,
@@ -196,12 +281,12 @@ async def translate_with_context(
     context: Optional[str] = None
 ):
     """
-    Translate text with optional context for better accuracy
+    Translate text of any length (long-document mode)
     
     Query parameters:
         text: Text to translate
         language: Target language code
-        context: Optional context for better translation
+        context: Accepted for compatibility; not sent to the model
     
     Returns translation result
     """
@@ -215,13 +300,9 @@ async def translate_with_context(
                 detail=f"Invalid language. Supported: {list(LANGUAGE_NAMES.keys())}"
             )
         
-        # Use context if provided
-        if context:
-            combined_text = f"{context}\n{text}"
-        else:
-            combined_text = text
-        
-        result = language_translator.translate(combined_text, language)
+        # IndicTrans2 has no context input; prepending it only got the
+        # context translated into the result and the text truncated
+        result = await language_translator.translate_document(text, language)
         
         if not result.get('success'):
             raise HTTPException(status_code=400, detail=result.get('error', 'Translation failed'))
@@ -230,6 +311,8 @@ async def translate_with_context(
     
     except HTTPException:
         raise
+    except TranslationOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
     except Exception as e:
         logger.error(f"Context translation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -10,6 +10,9 @@ sys.path.insert(0, str(project_root))
 import argparse
 import logging
 from data.functions.add_to_vector_db import PDFVectorDBManager
+from configs.ingestion_config import (
+    INGEST_WORKERS, INGEST_PAGES_PER_TASK, INGEST_EMBED_BATCH_SIZE, INGEST_UPSERT_BATCH_SIZE
+)
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +34,8 @@ def main():
     input_group.add_argument("--pdf", type=str, help="Path to single PDF file")
     input_group.add_argument("--directory", type=str, help="Path to directory containing PDFs")
     input_group.add_argument("--search-only", action="store_true", help="Search existing database without adding new documents")
+    input_group.add_argument("--rebuild-sparse-index", action="store_true",
+                             help="Rebuild the BM25 index from the chunks already in the collection")
     
     # Database configuration (fixed to ChromaDB + sentence-transformers)
     parser.add_argument("--db-path", type=str, help="Custom path to store database files")
@@ -43,6 +48,18 @@ def main():
     parser.add_argument("--chunk-overlap", type=int, default=200,
                        help="Text chunk overlap (default: 200)")
     
+    # Directory ingestion pipeline options
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS,
+                       help=f"Processes extracting PDF pages (default: {INGEST_WORKERS})")
+    parser.add_argument("--pages-per-task", type=int, default=INGEST_PAGES_PER_TASK,
+                       help=f"Pages per extraction task (default: {INGEST_PAGES_PER_TASK})")
+    parser.add_argument("--embed-batch-size", type=int, default=INGEST_EMBED_BATCH_SIZE,
+                       help=f"Chunks per embedding batch (default: {INGEST_EMBED_BATCH_SIZE})")
+    parser.add_argument("--upsert-batch-size", type=int, default=INGEST_UPSERT_BATCH_SIZE,
+                       help=f"Chunks per ChromaDB upsert (default: {INGEST_UPSERT_BATCH_SIZE})")
+    parser.add_argument("--force", action="store_true",
+                       help="Re-embed every PDF even if the ingestion manifest says it is unchanged")
+    
     # Metadata options
     parser.add_argument("--organization", type=str,
                        help="Organization that published the document(s)")
@@ -108,11 +125,16 @@ def main():
         logger.info(f"Collection Name: {args.collection}")
         logger.info(f"Chunk Size: {args.chunk_size}")
         logger.info(f"Chunk Overlap: {args.chunk_overlap}")
+        if args.pdf or args.directory:
+            logger.info(f"Workers: {args.workers}, Embed Batch: {args.embed_batch_size}, "
+                        f"Upsert Batch: {args.upsert_batch_size}")
         
         if args.dry_run:
             logger.info("DRY RUN MODE - No actual processing will occur")
             if args.search_only:
                 logger.info("Would search existing database")
+            elif args.rebuild_sparse_index:
+                logger.info("Would rebuild the BM25 index")
             elif args.pdf:
                 logger.info(f"Would process PDF: {args.pdf}")
             else:
@@ -129,6 +151,8 @@ def main():
         # Process PDFs or search existing database
         if args.search_only:
             logger.info("Search-only mode: Skipping PDF processing")
+        elif args.rebuild_sparse_index:
+            manager.vector_db.rebuild_sparse_index()
         elif args.pdf:
             logger.info(f"Processing single PDF: {args.pdf}")
             manager.add_pdf_to_db(
@@ -140,17 +164,35 @@ def main():
                 document_category=args.document_category,
                 year=args.year,
                 language=args.language,
-                tags=args.tags
+                tags=args.tags,
+                force=args.force,
+                workers=args.workers,
+                pages_per_task=args.pages_per_task,
+                embed_batch_size=args.embed_batch_size,
+                upsert_batch_size=args.upsert_batch_size,
             )
         else:
             logger.info(f"Processing PDF directory: {args.directory}")
             # For directory processing, we'll apply the same metadata to all PDFs
             # In a real scenario, you might want to read metadata from a CSV file or similar
-            manager.add_pdf_directory_to_db(
+            stats = manager.add_pdf_directory_to_db(
                 directory_path=args.directory,
                 chunk_size=args.chunk_size,
                 chunk_overlap=args.chunk_overlap,
+                organization=args.organization,
+                document_type=args.document_type,
+                document_category=args.document_category,
+                year=args.year,
+                language=args.language,
+                tags=args.tags,
+                force=args.force,
+                workers=args.workers,
+                pages_per_task=args.pages_per_task,
+                embed_batch_size=args.embed_batch_size,
+                upsert_batch_size=args.upsert_batch_size,
             )
+            if stats and stats['failed']:
+                logger.warning(f"{len(stats['failed'])} PDF(s) could not be ingested")
 
 
         
@@ -218,6 +260,8 @@ def main():
                     print(f"Language: {metadata.get('language', 'Unknown')}")
                     print(f"Tags: {metadata.get('tags', 'None')}")
                     print(f"Page Count: {metadata.get('total_pages', 'Unknown')}")
+                    if metadata.get('page_number'):
+                        print(f"Pages: {metadata.get('page_start')}-{metadata.get('page_end')}")
                     if distances and i < len(distances):
                         print(f"Similarity Score: {distances[i]:.4f}")
                     print(f"Text Preview: {doc[:300]}...")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Compare vector-only search with BM25 + vector hybrid search on a labelled query set.
+
+Labels are fixed independently of both indexes, so the way they were made
+favours neither retriever:
+
+- relevant_ids: chunk ids judged to answer the query, picked from the pooled
+  top results of both methods (--pool writes that pool for labelling)
+- answer_spans: the answer's verbatim text in the report; a retrieved chunk
+  is relevant when it contains one (case and whitespace are ignored)
+
+Reports hit@k (a relevant chunk among the top k) and MRR per method, which
+stay comparable however many chunks mention the topic. Queries with no
+labels yet are listed and left out.
+
+Usage Examples:
+    # Pool both methods' top 10 per query into a file to label
+    python scripts/benchmark_retrieval.py --pool retrieval_pool.json
+
+    # hit@k, MRR and latency on the annual_report collection
+    python scripts/benchmark_retrieval.py
+
+    # Another collection and label file, deeper cut-offs
+    python scripts/benchmark_retrieval.py --collection krishi_sakha_docs --labels my_queries.json --k 5 10 20
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import time
+
+from data.functions.vector_db_registry import vector_db_registry
+from data.functions.hybrid_search import hit_at_k, reciprocal_rank
+
+DEFAULT_LABELS = project_root / "data" / "retrieval_eval" / "labelled_queries.json"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def normalise(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def is_labelled(item) -> bool:
+    return bool(item.get("relevant_ids") or item.get("answer_spans"))
+
+
+def relevance_flags(item, results):
+    """Relevant or not, per retrieved chunk in rank order."""
+    ids = (results.get("ids") or [[]])[0]
+    documents = (results.get("documents") or [[]])[0]
+    relevant_ids = set(item.get("relevant_ids") or [])
+    spans = [normalise(span) for span in item.get("answer_spans") or []]
+    return [chunk_id in relevant_ids or any(span in normalise(document) for span in spans)
+            for chunk_id, document in zip(ids, documents)]
+
+
+def load_methods(collection: str, depth: int):
+    manager = vector_db_registry.get(collection)
+    methods = {
+        "vector": manager.search_documents,
+        "hybrid": manager.hybrid_search,
+    }
+    # Load the model and open both indexes before timing anything
+    for search in methods.values():
+        search(query="warm up", n_results=depth)
+    return methods
+
+
+def write_pool(collection: str, labels_path: Path, depth: int, pool_path: Path):
+    """Top results of both methods per query, merged, for a person to label."""
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        labelled = json.load(f)["queries"]
+    methods = load_methods(collection, depth)
+
+    pool = []
+    for item in labelled:
+        candidates = {}
+        for search in methods.values():
+            results = search(query=item["query"], n_results=depth)
+            ids = (results.get("ids") or [[]])[0]
+            documents = (results.get("documents") or [[]])[0]
+            for chunk_id, document in zip(ids, documents):
+                candidates.setdefault(chunk_id, {"id": chunk_id, "text": document})
+        # Ordered by id, without ranks, so the labeller can't tell which method found what
+        pool.append({"query": item["query"], "candidates": sorted(candidates.values(), key=lambda c: c["id"])})
+
+    with open(pool_path, 'w', encoding='utf-8') as f:
+        json.dump({"collection": collection, "queries": pool}, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {sum(len(q['candidates']) for q in pool)} candidates for {len(pool)} queries to {pool_path}")
+    print("Copy the ids that answer each query into relevant_ids in the label file.")
+
+
+def run(collection: str, labels_path: Path, cut_offs):
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        labelled = json.load(f)["queries"]
+    evaluated = [item for item in labelled if is_labelled(item)]
+    unlabelled = [item["query"] for item in labelled if not is_labelled(item)]
+
+    print(f"Collection:  {collection}")
+    print(f"Queries:     {len(evaluated)} labelled, {len(unlabelled)} without labels")
+    if not evaluated:
+        return
+    depth = max(cut_offs)
+    methods = load_methods(collection, depth)
+
+    hits = {name: {k: [] for k in cut_offs} for name in methods}
+    reciprocal_ranks = {name: [] for name in methods}
+    timings = {name: [] for name in methods}
+    for item in evaluated:
+        for name, search in methods.items():
+            start = time.perf_counter()
+            results = search(query=item["query"], n_results=depth)
+            timings[name].append(time.perf_counter() - start)
+            relevance = relevance_flags(item, results)
+            for k in cut_offs:
+                hits[name][k].append(hit_at_k(relevance, k))
+            reciprocal_ranks[name].append(reciprocal_rank(relevance))
+
+    header = "".join(f"{f'hit@{k}':>8}" for k in cut_offs)
+    print(f"\n{'method':<8}{header}{f'MRR@{depth}':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for name in methods:
+        row = "".join(f"{sum(hits[name][k]) / len(evaluated):>8.3f}" for k in cut_offs)
+        print(f"{name:<8}{row}{sum(reciprocal_ranks[name]) / len(evaluated):>8.3f}"
+              f"{percentile(timings[name], 0.5) * 1000:>10.1f}{percentile(timings[name], 0.95) * 1000:>10.1f}")
+    for query in unlabelled:
+        print(f"  unlabelled: {query}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark vector vs hybrid (BM25 + RRF) retrieval",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--collection", type=str, default="annual_report",
+                        help="Collection to search (default: annual_report)")
+    parser.add_argument("--labels", type=Path, default=DEFAULT_LABELS,
+                        help=f"Labelled queries JSON (default: {DEFAULT_LABELS.relative_to(project_root)})")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10],
+                        help="hit@k cut-offs; MRR uses the largest (default: 1 3 5 10)")
+    parser.add_argument("--pool", type=Path, default=None,
+                        help="Write both methods' top results per query here for labelling instead of scoring")
+    args = parser.parse_args()
+
+    if args.pool:
+        write_pool(args.collection, args.labels, max(args.k), args.pool)
+    else:
+        run(args.collection, args.labels, sorted(args.k))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the /chat domain router and its route cache.
+
+Replays a list of farmer questions (with repeats) through route_question_async
+using the stub backend, so no Gemini key or network is needed.
+
+Usage Examples:
+    # Simulate a 800 ms LLM router, exact-match cache only
+    python scripts/benchmark_router.py --latency 0.8 --no-embeddings
+
+    # Include the MiniLM nearest-neighbour lookup
+    python scripts/benchmark_router.py --latency 0.8 --rounds 5
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import time
+
+from routes.helpers.route_cache import RouteCache
+from routes.helpers.router_picker import StubRouterBackend, route_question_async
+
+SAMPLE_QUESTIONS = [
+    "wheat rust treatment",
+    "Wheat rust treatment?",
+    "how to treat rust in wheat",
+    "What is the fertilizer usage mentioned in the 2024 annual report?",
+    "fertilizer usage in the 2024 annual report",
+    "latest onion mandi price in Dehradun",
+    "best time to sow paddy in Uttarakhand",
+    "when should I sow paddy in uttarakhand",
+    "PM Kisan installment date",
+    "pm kisan next installment date",
+]
+
+
+async def run(rounds: int, latency: float, use_embeddings: bool):
+    backend = StubRouterBackend(latency=latency)
+    cache = RouteCache()
+    timings = []
+
+    for _ in range(rounds):
+        for question in SAMPLE_QUESTIONS:
+            start = time.perf_counter()
+            await route_question_async(question, backend=backend, cache=cache,
+                                       use_embeddings=use_embeddings)
+            timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    stats = cache.stats()
+    print(f"Requests:       {len(timings)}")
+    print(f"LLM calls:      {backend.calls}")
+    print(f"Exact hits:     {stats['exact_hits']}")
+    print(f"Semantic hits:  {stats['semantic_hits']}")
+    print(f"Hit rate:       {stats['hit_rate']:.1%}")
+    print(f"Mean latency:   {sum(timings) / len(timings) * 1000:.1f} ms")
+    print(f"p50 latency:    {timings[len(timings) // 2] * 1000:.1f} ms")
+    print(f"p95 latency:    {timings[int(len(timings) * 0.95) - 1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the chat router with an offline stub backend",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="How many times to replay the question set (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.8,
+                        help="Simulated LLM routing latency in seconds (default: 0.8)")
+    parser.add_argument("--no-embeddings", action="store_true",
+                        help="Disable the embedding nearest-neighbour lookup")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rounds, args.latency, not args.no_embeddings))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
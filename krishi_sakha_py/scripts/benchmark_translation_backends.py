@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compare IndicTrans2 backends: latency, model size, memory, chrF drift.
+
+Every backend translates the fixed parity sentences (brain/translation_parity.py).
+The torch_fp32 output is the reference for the chrF drift column. Latency is
+per sentence with batch size 1, which is how most /translate calls arrive.
+Run with CUDA_VISIBLE_DEVICES="" to measure the CPU production setup.
+
+Usage Examples:
+    # All backends, Hindi
+    CUDA_VISIBLE_DEVICES="" python scripts/benchmark_translation_backends.py
+
+    # fp32 vs int8 on Tamil, writing the translations for manual review
+    python scripts/benchmark_translation_backends.py --backends torch_fp32 torch_int8 --language ta --dump out.json
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import resource
+import statistics
+import time
+
+from brain.translation_backends import BACKENDS, load_backend
+from brain.translation_parity import PARITY_SENTENCES, MAX_CHRF_DRIFT, chrf_drift
+from configs.translation_config import TRANSLATION_DECODE_MODE
+
+LANGUAGE_TAGS = {'hi': 'hin_Deva', 'bn': 'ben_Beng', 'ta': 'tam_Taml', 'te': 'tel_Telu', 'mr': 'mar_Deva',
+                 'gu': 'guj_Gujr', 'kn': 'kan_Knda', 'ml': 'mal_Mlym', 'pa': 'pan_Guru', 'ur': 'urd_Arab'}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(name: str, input_texts, mode: str):
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    backend = load_backend(name)
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up
+    backend.translate(input_texts[:1], mode=mode)
+
+    translations, latencies = [], []
+    for text in input_texts:
+        start = time.perf_counter()
+        translations.extend(backend.translate([text], mode=mode))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "backend": name,
+        "load_seconds": load_seconds,
+        "model_mb": backend.memory_bytes() / 1024 ** 2,
+        "peak_rss_growth_mb": peak_rss_mb() - rss_before,
+        "latency_p50_ms": statistics.median(latencies),
+        "latency_max_ms": max(latencies),
+        "translations": translations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark IndicTrans2 translation backends",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS),
+                        help="Backends to compare (torch_fp32 is always run as the reference)")
+    parser.add_argument("--language", default="hi", choices=sorted(LANGUAGE_TAGS),
+                        help="Target language code (default: hi)")
+    parser.add_argument("--mode", default=TRANSLATION_DECODE_MODE,
+                        help=f"Decode mode (default: {TRANSLATION_DECODE_MODE})")
+    parser.add_argument("--dump", help="Write all translations to this JSON file")
+    args = parser.parse_args()
+
+    input_texts = [f"eng_Latn {LANGUAGE_TAGS[args.language]} {text}" for text in PARITY_SENTENCES]
+    names = ["torch_fp32"] + [name for name in args.backends if name != "torch_fp32"]
+
+    results = []
+    for name in names:
+        try:
+            results.append(run_backend(name, input_texts, args.mode))
+        except Exception as e:
+            print(f"✗ {name}: {e}")
+
+    if not results or results[0]["backend"] != "torch_fp32":
+        print("✗ torch_fp32 reference failed; nothing to compare")
+        return 1
+
+    reference = results[0]["translations"]
+    print(f"{len(PARITY_SENTENCES)} sentences, language: {args.language}, mode: {args.mode}\n")
+    print(f"{'backend':<12}{'load s':>8}{'model MB':>10}{'RSS +MB':>9}{'p50 ms':>9}{'max ms':>9}"
+          f"{'chrF':>8}{'drift':>7}{'same':>7}")
+    exit_code = 0
+    for result in results:
+        drift = chrf_drift(reference, result["translations"])
+        result["parity"] = drift
+        if not drift["within_budget"]:
+            exit_code = 1
+        print(f"{result['backend']:<12}{result['load_seconds']:>8.1f}{result['model_mb']:>10.1f}"
+              f"{result['peak_rss_growth_mb']:>9.0f}{result['latency_p50_ms']:>9.1f}{result['latency_max_ms']:>9.1f}"
+              f"{drift['chrf']:>8.1f}{drift['drift']:>7.1f}{drift['identical']:>4}/{drift['total']:<2}")
+
+    print(f"\nMax accepted drift: {MAX_CHRF_DRIFT} chrF points")
+    if args.dump:
+        with open(args.dump, 'w', encoding='utf-8') as f:
+            json.dump({"sentences": PARITY_SENTENCES, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"Translations written to {args.dump}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    exit(main())
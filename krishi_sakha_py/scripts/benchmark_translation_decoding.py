@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark IndicTrans2 decode modes (tokens/sec) on the current device.
+
+Compares the old uncached path (greedy_nocache, what every call site used to
+run) with the KV-cached greedy decoder and beam search. Run with
+CUDA_VISIBLE_DEVICES="" to measure the CPU production setup.
+
+Usage Examples:
+    # All modes, Hindi, 3 timed rounds
+    CUDA_VISIBLE_DEVICES="" python scripts/benchmark_translation_decoding.py
+
+    # Only compare cached vs uncached greedy on Tamil with batch size 8
+    python scripts/benchmark_translation_decoding.py --modes greedy_nocache greedy --language ta --batch-size 8
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+
+from brain.language_brain import language_translator, LANGUAGES
+from brain.translation_decoding import DECODE_MODES, decode_batch
+
+# Loads IndicTrans2 (the translator is lazy)
+model = language_translator.model
+tokenizer = language_translator.tokenizer
+device = language_translator.device
+
+SAMPLE_SENTENCES = [
+    "Irrigate the wheat field in the evening.",
+    "Apply 50 kilograms of urea per acre after the first irrigation.",
+    "Yellow rust appears as yellow stripes on the leaves of wheat plants.",
+    "Spray neem oil every week to control aphids on mustard.",
+    "The monsoon is expected to reach Uttarakhand in the third week of June.",
+    "Store the harvested grain in a dry place to protect it from moisture and insects.",
+    "Farmers can apply for the PM Kisan scheme at the nearest common service centre.",
+    "Test the soil before sowing to decide how much fertilizer the crop needs.",
+]
+
+
+def count_generated_tokens(outputs) -> int:
+    special = {tokenizer.pad_token_id, tokenizer.eos_token_id, model.config.decoder_start_token_id}
+    return sum(1 for token in outputs.flatten().tolist() if token not in special)
+
+
+def run_mode(mode: str, batches, rounds: int):
+    # Warm-up (also runs the beam-mode cache probe outside the timing)
+    decode_batch(model, tokenizer, batches[0], mode=mode)
+
+    tokens = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for inputs in batches:
+            tokens += count_generated_tokens(decode_batch(model, tokenizer, inputs, mode=mode))
+    elapsed = time.perf_counter() - start
+    return tokens, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark IndicTrans2 decode modes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--modes", nargs="+", default=list(DECODE_MODES), choices=DECODE_MODES,
+                        help="Decode modes to compare")
+    parser.add_argument("--language", default="hi", choices=sorted(LANGUAGES),
+                        help="Target language code (default: hi)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Sentences per generate call (default: 1)")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Timed passes over the sample sentences (default: 3)")
+    args = parser.parse_args()
+
+    target_lang = LANGUAGES[args.language]
+    batches = []
+    for i in range(0, len(SAMPLE_SENTENCES), args.batch_size):
+        texts = [f"eng_Latn {target_lang} {text}" for text in SAMPLE_SENTENCES[i:i + args.batch_size]]
+        batches.append(tokenizer(texts, return_tensors="pt", padding=True).to(device))
+
+    print(f"Device: {device}, language: {args.language}, batch size: {args.batch_size}, rounds: {args.rounds}\n")
+    print(f"{'mode':<16}{'tokens':>8}{'seconds':>10}{'tokens/sec':>12}")
+
+    results = {}
+    for mode in args.modes:
+        tokens, elapsed = run_mode(mode, batches, args.rounds)
+        results[mode] = tokens / elapsed if elapsed else 0.0
+        print(f"{mode:<16}{tokens:>8}{elapsed:>10.2f}{results[mode]:>12.1f}")
+
+    baseline = results.get("greedy_nocache")
+    if baseline:
+        print()
+        for mode, rate in results.items():
+            if mode != "greedy_nocache":
+                print(f"{mode} vs greedy_nocache: {rate / baseline:.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Show which imports dominate app startup.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter (so
+nothing is cached in this process) and aggregates the cumulative import
+time per module. The top-level view groups by package (torch,
+transformers, langchain, ...); the project view lists this repo's own
+modules so a newly added eager model load shows up immediately.
+
+Usage Examples:
+    # Top 25 packages and project modules when importing main.py
+    python scripts/profile_startup.py
+
+    # Profile a different module, top 10
+    python scripts/profile_startup.py --module routes.chat --top 10
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import argparse
+import subprocess
+import time
+
+PROJECT_PACKAGES = ("main", "brain", "configs", "data", "modules", "routes")
+
+
+def profile_imports(module: str):
+    """Return (wall_seconds, [(module, self_us, cumulative_us, depth)])."""
+    env = dict(os.environ, MODEL_WARM_UP="0")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        # Still report what was imported before the failure
+        print(f"✗ import {module} failed:\n{result.stderr.strip().splitlines()[-1]}\n")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nesting depth is encoded as two spaces per level
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return wall, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile import time of the FastAPI app",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="Rows per table (default: 25)")
+    args = parser.parse_args()
+
+    wall, entries = profile_imports(args.module)
+    if not entries:
+        print("No import timings captured")
+        return 1
+
+    # A package's cost is the cumulative time of its first (outermost) import
+    packages = {}
+    for name, _, cumulative_us, _ in entries:
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), cumulative_us)
+
+    project = [(name, cumulative_us) for name, _, cumulative_us, _ in entries
+               if name.split(".")[0] in PROJECT_PACKAGES]
+
+    print(f"import {args.module}: {wall:.2f}s wall (interpreter start included)\n")
+    print(f"{'package':<40}{'cumulative ms':>14}")
+    for package, cumulative_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<40}{cumulative_us / 1000:>14.1f}")
+
+    print(f"\n{'project module':<40}{'cumulative ms':>14}")
+    for name, cumulative_us in sorted(project, key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<40}{cumulative_us / 1000:>14.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
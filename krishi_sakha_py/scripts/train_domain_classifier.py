@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the local domain classifier used in front of the LLM router.
+
+Centroids are built from MiniLM embeddings of the refined Q&A datasets
+(all farmer questions, so they train the "general" domain) plus the seed
+questions in routes/helpers/domain_classifier.py for the other domains.
+
+The evaluation reports how many labelled questions were answered locally
+(i.e. skipped the LLM) and how accurate those local answers were.
+
+Usage Examples:
+    # Train centroids and evaluate on the bundled labelled set
+    python scripts/train_domain_classifier.py
+
+    # Only evaluate the saved centroids
+    python scripts/train_domain_classifier.py --eval-only
+
+    # Try a stricter confidence threshold
+    python scripts/train_domain_classifier.py --eval-only --min-margin 0.12
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+
+from configs.vector_db_config import PROJECT_ROOT
+from data.functions.vector_db_registry import vector_db_registry
+from routes.helpers.domain_classifier import (
+    DEFAULT_CENTROIDS_PATH,
+    DEFAULT_MIN_MARGIN,
+    DEFAULT_MIN_SIMILARITY,
+    SEED_QUESTIONS,
+    DomainClassifier,
+)
+from routes.helpers.route_cache import normalize_prompt
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET_DIR = PROJECT_ROOT.parent / "notebook" / "data" / "datasets" / "refined_datasets"
+DEFAULT_LABELLED_SET = PROJECT_ROOT / "data" / "router_eval" / "labelled_questions.json"
+
+
+def load_dataset_questions(dataset_dir: Path) -> list:
+    """Unique `instruction` strings from every refined dataset file."""
+    questions = set()
+    for path in sorted(dataset_dir.glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                question = (item.get("instruction") or "").strip()
+                if question:
+                    questions.add(question)
+    return sorted(questions)
+
+
+def mean_vector(vectors: list) -> list:
+    dims = len(vectors[0])
+    totals = [0.0] * dims
+    for vec in vectors:
+        for i, value in enumerate(vec):
+            totals[i] += value
+    return [value / len(vectors) for value in totals]
+
+
+def train(dataset_dir: Path, output: Path):
+    embedder = vector_db_registry.get_embedding_generator()
+
+    examples = {domain: list(questions) for domain, questions in SEED_QUESTIONS.items()}
+    examples["general"] = load_dataset_questions(dataset_dir)
+    logger.info(f"Training examples: { {d: len(q) for d, q in examples.items()} }")
+
+    centroids = {}
+    for domain, questions in examples.items():
+        embeddings = embedder.generate_embeddings(questions)
+        centroids[domain] = mean_vector(embeddings)
+
+    classifier = DomainClassifier(centroids=centroids)
+    classifier.save(output, metadata={
+        "examples": {d: len(q) for d, q in examples.items()},
+        "model": vector_db_registry.model_name,
+    })
+    logger.info(f"Saved centroids to {output}")
+
+
+def evaluate(classifier: DomainClassifier, labelled_path: Path):
+    with open(labelled_path, 'r', encoding='utf-8') as f:
+        labelled = json.load(f)
+
+    # Seed questions train the centroids; scoring them would inflate accuracy
+    seeds = {normalize_prompt(q) for questions in SEED_QUESTIONS.values() for q in questions}
+    held_out = [item for item in labelled if normalize_prompt(item["question"]) not in seeds]
+    if len(held_out) < len(labelled):
+        print(f"Ignoring {len(labelled) - len(held_out)} labelled questions that are also seed questions")
+    labelled = held_out
+
+    embedder = vector_db_registry.get_embedding_generator()
+    embeddings = embedder.generate_embeddings([item["question"] for item in labelled])
+
+    local = correct = 0
+    per_domain = defaultdict(Counter)
+    elapsed = 0.0
+    for item, embedding in zip(labelled, embeddings):
+        start = time.perf_counter()
+        result = classifier.classify(item["question"], embedding)
+        elapsed += time.perf_counter() - start
+
+        expected = item["domain"]
+        if result is None:
+            per_domain[expected]["escalated"] += 1
+            continue
+        local += 1
+        per_domain[expected]["local"] += 1
+        if result["domain"] == expected:
+            correct += 1
+            per_domain[expected]["correct"] += 1
+        else:
+            print(f"  MISROUTED [{expected} -> {result['domain']}] {item['question']}")
+
+    total = len(labelled)
+    print(f"\n=== Domain classifier evaluation ({total} questions) ===")
+    print(f"Skipped LLM (answered locally): {local}/{total} ({local / total:.1%})")
+    print(f"Local accuracy:                 {correct}/{local} ({(correct / local if local else 0):.1%})")
+    print(f"Mean classify time (excl. embedding): {elapsed / total * 1000:.3f} ms")
+    for domain, counts in sorted(per_domain.items()):
+        print(f"  {domain:<14} local={counts['local']:<3} correct={counts['correct']:<3} "
+              f"escalated={counts['escalated']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train/evaluate the local router domain classifier",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--dataset-dir", type=str, default=str(DEFAULT_DATASET_DIR),
+                        help="Directory with the refined Q&A JSON files")
+    parser.add_argument("--labelled", type=str, default=str(DEFAULT_LABELLED_SET),
+                        help="Labelled question set for evaluation")
+    parser.add_argument("--output", type=str, default=str(DEFAULT_CENTROIDS_PATH),
+                        help="Where to write the trained centroids")
+    parser.add_argument("--eval-only", action="store_true",
+                        help="Skip training and evaluate the saved centroids")
+    parser.add_argument("--min-similarity", type=float, default=DEFAULT_MIN_SIMILARITY)
+    parser.add_argument("--min-margin", type=float, default=DEFAULT_MIN_MARGIN)
+    args = parser.parse_args()
+
+    if not args.eval_only:
+        train(Path(args.dataset_dir), Path(args.output))
+
+    classifier = DomainClassifier.from_file(
+        args.output, min_similarity=args.min_similarity, min_margin=args.min_margin
+    )
+    evaluate(classifier, Path(args.labelled))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,201 @@
+import sys
+import os
+import types
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, **kwargs):
+        if self.closed:
+            raise RuntimeError("Target closed")
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.pages = []
+
+    async def add_init_script(self, script):
+        pass
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+        self.new_context_error = None
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        if self.new_context_error:
+            raise self.new_context_error
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.browsers = []
+
+    async def launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+fake_playwright = FakePlaywright()
+
+
+class _Starter:
+    async def start(self):
+        return fake_playwright
+
+
+playwright_stub = types.ModuleType('playwright')
+async_api_stub = types.ModuleType('playwright.async_api')
+async_api_stub.async_playwright = lambda: _Starter()
+# The scraper imports this too when tests load it alongside the pool
+async_api_stub.TimeoutError = TimeoutError
+sys.modules.setdefault('playwright', playwright_stub)
+sys.modules.setdefault('playwright.async_api', async_api_stub)
+
+from modules.scrapper import browser_pool as browser_pool_module
+browser_pool_module.async_playwright = lambda: _Starter()
+from modules.scrapper.browser_pool import BrowserPool
+
+
+def test_pages_are_recycled_and_contexts_rotated():
+    async def scenario():
+        pool = BrowserPool(num_contexts=1, max_pages_per_context=3)
+        await pool.start()
+        seen = []
+        for _ in range(4):
+            async with pool.page() as page:
+                seen.append(page)
+        return pool, seen
+
+    pool, seen = asyncio.run(scenario())
+    stats = pool.stats()
+
+    # First context served 3 checkouts on one recycled page, then rotated
+    assert seen[0] is seen[1] is seen[2]
+    assert seen[3] is not seen[0]
+    assert stats["launches"] == 1
+    assert stats["rotations"] == 1
+    assert stats["pages_created"] == 2
+    assert stats["pages_reused"] == 2
+    browser = fake_playwright.chromium.browsers[-1]
+    assert browser.contexts[0].closed
+
+
+def test_crashed_browser_is_relaunched():
+    async def scenario():
+        pool = BrowserPool(num_contexts=1)
+        await pool.start()
+        async with pool.page() as first:
+            pass
+        fake_playwright.chromium.browsers[-1].connected = False
+        async with pool.page() as second:
+            pass
+        return pool, first, second
+
+    pool, first, second = asyncio.run(scenario())
+    assert pool.stats()["launches"] == 2
+    assert second is not first
+
+
+def test_checkouts_are_bounded_by_max_parallel():
+    async def scenario():
+        pool = BrowserPool(max_parallel=2)
+        in_use = 0
+        peak = 0
+
+        async def scrape():
+            nonlocal in_use, peak
+            async with pool.page():
+                in_use += 1
+                peak = max(peak, in_use)
+                await asyncio.sleep(0.01)
+                in_use -= 1
+
+        await asyncio.gather(*(scrape() for _ in range(6)))
+        return peak
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_a_failed_rotation_keeps_the_old_context():
+    async def scenario():
+        pool = BrowserPool(num_contexts=1, max_pages_per_context=1)
+        await pool.start()
+        browser = fake_playwright.chromium.browsers[-1]
+        async with pool.page():
+            pass
+
+        # Rotating needs a new context; the browser fails to make one
+        browser.new_context_error = RuntimeError("Target crashed")
+        try:
+            async with pool.page():
+                pass
+        except RuntimeError:
+            pass
+        assert len(pool._contexts) == 1
+        browser.new_context_error = None
+        async with pool.page():
+            pass
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool.stats()["rotations"] == 1
+
+
+def test_checkout_refills_an_empty_pool():
+    async def scenario():
+        pool = BrowserPool(num_contexts=2)
+        await pool.start()
+        browser = fake_playwright.chromium.browsers[-1]
+        # The browser survived but its contexts could not be created
+        pool._contexts = []
+        async with pool.page() as page:
+            pass
+        return pool, browser, page
+
+    pool, browser, page = asyncio.run(scenario())
+    assert pool.stats()["launches"] == 1
+    assert len(pool._contexts) == 2 and page in browser.contexts[-2].pages + browser.contexts[-1].pages
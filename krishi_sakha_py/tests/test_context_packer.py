@@ -0,0 +1,83 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.context_packer import ContextPacker, as_snippets, estimate_tokens
+
+
+def test_near_duplicates_are_dropped_and_scores_order_snippets():
+    packer = ContextPacker(token_budget=1000)
+    snippets = [
+        {"text": "Wheat procurement reached 26 million tonnes in 2023-24.", "score": 0.2, "source": "report.pdf"},
+        {"text": "Fertiliser consumption in 2023-24 was 30.1 million tonnes across India.", "score": 0.9},
+        # Same page scraped twice with a trailing footer
+        {"text": "Fertiliser consumption in 2023-24 was 30.1 million tonnes across India. Share this.", "score": 0.5},
+    ]
+
+    packed = packer.pack(snippets)
+
+    assert packed.count("30.1 million") == 1
+    assert packed.index("Fertiliser") < packed.index("[2] report.pdf\nWheat")
+
+
+def test_over_budget_keeps_sentences_matching_the_question_in_order():
+    text = ("The ministry held several review meetings during the year. "
+            "Fertiliser consumption in 2023-24 was 30.1 million tonnes. "
+            "Officials visited many districts to review progress. "
+            "Subsidy on fertiliser was revised in 2023-24.")
+    packer = ContextPacker(token_budget=30, count_tokens=estimate_tokens)
+
+    packed = packer.pack([{"text": text}], query="fertiliser consumption 2023-24")
+
+    assert packed == ("Fertiliser consumption in 2023-24 was 30.1 million tonnes. "
+                      "Subsidy on fertiliser was revised in 2023-24.")
+    assert estimate_tokens(packed) <= 30
+
+
+def test_scraped_pages_and_search_results_become_labelled_snippets():
+    pages = [
+        {"url": "https://a.example", "title": "Mandi prices", "success": True, "content": "Onion at 2,100 per quintal."},
+        {"url": "https://b.example", "title": "Blocked", "success": False, "content": ""},
+    ]
+    results = {
+        "ids": [["c1", "c2"]],
+        "documents": [["Chunk one.", "Chunk two."]],
+        # As ChromaVectorDB._chunk_metadata writes them
+        "metadatas": [[{"document_title": "Annual Report 2023-24", "source_file": "/data/ar.pdf", "organization": "Unknown",
+                        "page_number": "3", "page_start": "3", "page_end": "4"},
+                       {"document_title": "", "source_file": "/data/ar.pdf", "organization": "Unknown",
+                        "page_number": "9", "page_start": "9", "page_end": "9"}]],
+        "distances": [[0.2, 0.4]],
+        "rerank_scores": [[1.5, None]],
+    }
+
+    assert as_snippets(pages) == [
+        {"text": "Onion at 2,100 per quintal.", "score": None, "source": "Mandi prices - https://a.example"}]
+    assert [(s["score"], s["source"]) for s in as_snippets(results)] == [
+        (1.5, "Annual Report 2023-24 (pages 3-4)"), (None, "ar.pdf (page 9)")]
+    assert ContextPacker().pack("") == ""
+
+
+def test_prioritised_sections_drop_banners_and_trim_low_priority_detail():
+    context = "\n".join([
+        "═" * 79,
+        "CURRENT CONDITIONS (Priority 1)",
+        "─" * 53,
+        "Temperature 28C, humidity 70%.",
+        "═" * 79,
+        "TOP RECOMMENDED CROPS (Priority 2)",
+        "1. Rice",
+        "2. Maize",
+        "═" * 79,
+        "DETAILED CROP INFORMATION",
+    ] + [f"   • Detail line {i} with several more words for the model" for i in range(40)])
+    packer = ContextPacker(count_tokens=estimate_tokens)
+
+    packed = packer.pack(context, token_budget=60)
+
+    assert "═" not in packed and "─" not in packed
+    assert packed.startswith("CURRENT CONDITIONS (Priority 1)\nTemperature 28C, humidity 70%.")
+    assert "1. Rice\n2. Maize" in packed
+    assert "Detail line 39" not in packed
+    assert estimate_tokens(packed) <= 60
@@ -0,0 +1,83 @@
+import sys
+import os
+import csv
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Another test module replaces brain.context_prioritizer with a stub
+sys.modules.pop('brain.context_prioritizer', None)
+
+from brain.context_prioritizer import ContextPrioritizer, WEATHER_KEYWORDS, get_tables
+
+CROP_FIELDS = ["Crop Name", "Avg Yield (per acre)", "Cost of Cultivation (₹)", "Avg Profit Margin",
+               "Market Demand", "Suitability (Weather/Soil)", "Risk Factors"]
+CROPS = [
+    ["Wheat", "18 q", "₹25,000", "~40%", "High", "Cool dry weather, loam soil", "Rust, pest attack"],
+    ["Rice", "22 q", "₹30,000", "35%", "Very High", "Heavy rainfall, clay soil, humid", "Flood, waterlogging"],
+    ["Mandua", "8 q", "₹9,000", "63%", "Growing", "Dry hills, sandy soil", "Low"],
+    ["Tomato", "100 q", "₹60,000", "55%", "Very High", "Warm temperature, irrigation", "Pest, price crash"],
+    ["Barley", "15 q", "₹15,000", "25%", "Moderate", "Cold, drought tolerant", "Lodging"],
+]
+SCHEME_FIELDS = ["schemename", "schemeshorttitle", "schemefor", "briefdescription", "beneficiarystate"]
+SCHEMES = [
+    ["PM Kisan", "PM-KISAN", "Individual", "Income support to farmer families", "['All']"],
+    ["Uttarakhand Horticulture Mission", "UHM", "Individual", "Subsidy for orchards", "['Uttarakhand']"],
+    ["Punjab Crop Residue", "PCR", "Individual", "Crop residue management", "['Punjab', 'Haryana']"],
+    ["Kerala Startup", "KSU", "Business", "Seed funding for startups", "['Kerala']"],
+    ["PM Kisan", "PM-KISAN-2", "Individual", "Duplicate name for farmer support", "['All']"],
+]
+
+
+def _write_csv(path, fields, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(rows)
+
+
+def _paths(tmp_path):
+    crops_csv, schemes_csv = tmp_path / "crops.csv", tmp_path / "schemes.csv"
+    _write_csv(crops_csv, CROP_FIELDS, CROPS)
+    _write_csv(schemes_csv, SCHEME_FIELDS, SCHEMES)
+    return str(crops_csv), str(schemes_csv)
+
+
+def test_ranking_matches_per_row_scoring(tmp_path):
+    prioritizer = ContextPrioritizer(*_paths(tmp_path))
+
+    expected = []
+    for crop in prioritizer.crops_data:
+        score, reason = prioritizer._calculate_relevance_score(crop, WEATHER_KEYWORDS)
+        expected.append((crop["Crop Name"], score, reason))
+    expected.sort(key=lambda item: item[1], reverse=True)
+
+    ranked = prioritizer.filter_crops_by_weather("Light rain expected", top_n=4)
+    assert [(c["Crop Name"], c["_relevance_score"], c["_relevance_reason"]) for c in ranked] == expected[:4]
+    assert "Profit margin: 63%" in prioritizer.create_comparison_table(ranked)
+
+
+def test_schemes_are_looked_up_by_state(tmp_path):
+    prioritizer = ContextPrioritizer(*_paths(tmp_path))
+
+    names = [s["name"] for s in prioritizer.get_schemes_for_crops(["Wheat"], "Uttarakhand")]
+    assert names == ["PM Kisan", "Uttarakhand Horticulture Mission"]
+
+    names = [s["name"] for s in prioritizer.get_schemes_for_crops(["Wheat"], "Haryana")]
+    assert names == ["PM Kisan", "Uttarakhand Horticulture Mission", "Punjab Crop Residue"]
+
+    # Non-agriculture schemes never show up, even for their own state
+    assert "Kerala Startup" not in [s["name"] for s in prioritizer.get_schemes_for_crops([], "Kerala")]
+
+
+def test_tables_are_shared_and_reloaded_when_csv_changes(tmp_path):
+    crops_csv, schemes_csv = _paths(tmp_path)
+    first = get_tables(crops_csv, schemes_csv)
+    assert get_tables(crops_csv, schemes_csv) is first
+
+    _write_csv(crops_csv, CROP_FIELDS, CROPS[:2])
+    future = time.time() + 10
+    os.utime(crops_csv, (future, future))
+
+    reloaded = ContextPrioritizer(crops_csv, schemes_csv)
+    assert reloaded.tables is not first
+    assert len(reloaded.crops_data) == 2
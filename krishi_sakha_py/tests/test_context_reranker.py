@@ -0,0 +1,87 @@
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain import context_reranker as reranker_module
+from brain.context_reranker import ContextReranker
+from brain.resource_registry import FAILED
+
+
+def make_results(documents):
+    ids = [f"c{i}" for i in range(len(documents))]
+    return {
+        "ids": [ids],
+        "documents": [documents],
+        "metadatas": [[{"page_number": str(i + 1)} for i in range(len(documents))]],
+        "distances": [[0.1 * (i + 1) for i in range(len(documents))]],
+    }
+
+
+DOCUMENTS = [
+    "Soil health cards were distributed across states.",
+    "Wheat procurement reached 26 million tonnes.",
+    "Fertiliser consumption in 2023-24 was 30.1 million tonnes.",
+    "Fertiliser subsidy was revised for 2023-24.",
+]
+
+
+def overlap_scorer(pairs):
+    # Stand-in for the cross-encoder: shared words with the query
+    return [float(len(set(query.lower().split()) & set(passage.lower().split()))) for query, passage in pairs]
+
+
+def test_rerank_orders_by_score_and_keeps_top_k():
+    reranker = ContextReranker(scorer=overlap_scorer, batch_size=2, enabled=True)
+
+    results = reranker.rerank("fertiliser consumption in 2023-24", make_results(DOCUMENTS), top_k=2)
+
+    assert results["ids"] == [["c2", "c3"]]
+    assert results["metadatas"][0][0] == {"page_number": "3"}
+    assert results["distances"][0] == [make_results(DOCUMENTS)["distances"][0][i] for i in (2, 3)]
+    assert results["rerank"]["scored"] == 4
+    assert reranker.reranked == 1
+
+
+def test_token_budget_drops_chunks_but_keeps_the_best():
+    documents = ["fertiliser " * 200, "fertiliser use", "unrelated text"]
+    reranker = ContextReranker(scorer=overlap_scorer, enabled=True)
+
+    results = reranker.rerank("fertiliser use", make_results(documents), top_k=3, token_budget=10)
+
+    assert results["ids"] == [["c1", "c2"]]
+    assert results["rerank"]["tokens"] <= 10
+
+    # A single oversized chunk is still better than no context
+    results = reranker.rerank("fertiliser", make_results(documents[:1] + [""]), token_budget=10)
+    assert results["ids"] == [["c0"]]
+
+
+def test_latency_budget_stops_scoring_and_keeps_retrieval_order():
+    calls = []
+
+    def slow_scorer(pairs):
+        calls.append(len(pairs))
+        time.sleep(0.02)
+        return overlap_scorer(pairs)
+
+    reranker = ContextReranker(scorer=slow_scorer, batch_size=2, latency_budget_ms=30, enabled=True)
+    results = reranker.rerank("wheat procurement", make_results(DOCUMENTS), top_k=4)
+
+    # The second batch would overrun the budget, so only the first is scored
+    assert calls == [2]
+    assert results["ids"] == [["c1", "c0", "c2", "c3"]]
+    assert results["rerank_scores"][0][2:] == [None, None]
+    assert reranker.partial == 1
+
+
+def test_unloaded_model_skips_reranking(monkeypatch):
+    monkeypatch.setattr(reranker_module.cross_encoder_resource, "state", FAILED)
+    reranker = ContextReranker(enabled=True)
+
+    results = reranker.rerank("fertiliser consumption", make_results(DOCUMENTS), top_k=2)
+
+    assert results["ids"] == [["c0", "c1"]]
+    assert results["rerank"]["scored"] == 0
+    assert reranker.skipped == 1
@@ -0,0 +1,66 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.document_translation import plan_document, split_to_fit, translate_units
+
+
+def word_count(text):
+    return len(text.split())
+
+
+REPORT = (
+    "## Wheat advisory\n\n"
+    "- Irrigate in the evening. Avoid urea before rain.\n"
+    "- Spray neem oil weekly.\n\n"
+    "1. Test the soil.\n"
+    "2. Sow after the first rain."
+)
+
+
+def test_plan_keeps_markers_and_paragraph_breaks():
+    units = plan_document(REPORT, word_count, max_tokens=50)
+
+    assert [(unit["marker"], unit["pieces"]) for unit in units] == [
+        ("## ", ["Wheat advisory"]),
+        ("- ", ["Irrigate in the evening."]),
+        ("", ["Avoid urea before rain."]),
+        ("- ", ["Spray neem oil weekly."]),
+        ("1. ", ["Test the soil."]),
+        ("2. ", ["Sow after the first rain."]),
+    ]
+    assert [unit["separator"] for unit in units] == ["\n\n", " ", "\n", "\n\n", "\n", ""]
+
+
+def test_long_sentences_split_on_clauses_then_words():
+    sentence = "Apply compost, then irrigate lightly, and cover the beds with straw mulch to keep moisture in"
+    assert split_to_fit(sentence, word_count, max_tokens=6) == [
+        "Apply compost, then irrigate lightly,", "and cover the beds with straw", "mulch to keep moisture in"]
+    assert all(word_count(piece) <= 6 for piece in split_to_fit(sentence * 5, word_count, max_tokens=6))
+
+
+def test_windows_stream_in_order_and_rebuild_the_document():
+    calls = []
+
+    async def translate_pieces(pieces, language):
+        calls.append(list(pieces))
+        return {piece: piece.upper() for piece in pieces}
+
+    async def scenario():
+        units = plan_document(REPORT, word_count, max_tokens=50)
+        return [part async for part in translate_units(units, "hi", translate_pieces, window=2)]
+
+    parts = asyncio.run(scenario())
+
+    assert "".join(part["text"] for part in parts) == (
+        "## WHEAT ADVISORY\n\n"
+        "- IRRIGATE IN THE EVENING. AVOID UREA BEFORE RAIN.\n"
+        "- SPRAY NEEM OIL WEEKLY.\n\n"
+        "1. TEST THE SOIL.\n"
+        "2. SOW AFTER THE FIRST RAIN."
+    )
+    assert len(calls) == 3 and all(len(pieces) <= 2 for pieces in calls)
+    assert [part["completed"] for part in parts] == [2, 4, 6]
+    assert parts[-1]["total"] == 6
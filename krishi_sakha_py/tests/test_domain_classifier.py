@@ -0,0 +1,63 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from routes.helpers.domain_classifier import DomainClassifier, extract_keywords
+
+
+def test_rules_route_unambiguous_questions():
+    classifier = DomainClassifier()
+
+    report = classifier.classify("What is the fertilizer usage mentioned in the 2024 annual report?")
+    assert report["domain"] == "annual_report"
+    assert report["year"] == "2024"
+    assert "fertilizer" in report["keywords"]
+
+    assert classifier.classify("Onion mandi price in Dehradun")["domain"] == "search"
+    assert classifier.classify("latest news on wheat MSP")["domain"] == "search"
+
+
+def test_conflicting_or_unmatched_rules_escalate():
+    classifier = DomainClassifier()
+    assert classifier.classify("latest annual report on dairy") is None
+    assert classifier.classify("how to control rust in wheat") is None
+
+
+def test_centroid_needs_similarity_and_margin():
+    classifier = DomainClassifier(
+        centroids={"general": [1.0, 0.0, 0.0], "false": [0.0, 1.0, 0.0]},
+        min_similarity=0.5,
+        min_margin=0.1,
+    )
+
+    assert classifier.classify("control aphids in mustard", [0.9, 0.1, 0.0])["domain"] == "general"
+    # Too close to both centroids
+    assert classifier.classify("ambiguous", [0.5, 0.5, 0.0]) is None
+    # Far from everything
+    assert classifier.classify("unrelated", [0.0, 0.0, 1.0]) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "centroids.json"
+    DomainClassifier(centroids={"general": [1.0, 0.0]}).save(path, metadata={"examples": 1})
+
+    loaded = DomainClassifier.from_file(path)
+    assert loaded.centroids == {"general": [1.0, 0.0]}
+    assert DomainClassifier.from_file(tmp_path / "missing.json").centroids == {}
+
+
+def test_extract_keywords_skips_stopwords():
+    assert extract_keywords("What is the seed rate of maize?") == ["seed", "rate", "maize"]
+
+
+def test_labelled_eval_set_is_held_out_from_the_seed_questions():
+    import json
+    from configs.vector_db_config import PROJECT_ROOT
+    from routes.helpers.domain_classifier import SEED_QUESTIONS
+    from routes.helpers.route_cache import normalize_prompt
+
+    with open(PROJECT_ROOT / "data" / "router_eval" / "labelled_questions.json", 'r', encoding='utf-8') as f:
+        labelled = {normalize_prompt(item["question"]) for item in json.load(f)}
+    seeds = {normalize_prompt(q) for questions in SEED_QUESTIONS.values() for q in questions}
+    assert not labelled & seeds
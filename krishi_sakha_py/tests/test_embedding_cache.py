@@ -0,0 +1,155 @@
+import sys
+import os
+import time
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.functions.embedding_cache import EmbeddingCache, MmapVectorStore
+
+
+class _CountingEmbedder:
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        if self.delay:
+            time.sleep(self.delay)
+        return [[float(len(text)), 0.5, -1.0] for text in texts]
+
+
+def test_repeated_and_normalised_texts_are_encoded_once():
+    embed = _CountingEmbedder()
+    cache = EmbeddingCache(embed, "minilm", max_wait_ms=0)
+
+    first = cache.get_many(["wheat rust", "onion  price ", "wheat rust"])
+    second = cache.get_many(["onion price", "wheat rust"])
+
+    assert embed.batches == [["wheat rust", "onion price"]]
+    assert first[0] == first[2] == second[1] == [10.0, 0.5, -1.0]
+    stats = cache.stats()
+    assert stats["misses"] == 2 and stats["memory_hits"] == 2 and stats["batches"] == 1
+
+
+def test_vectors_survive_a_restart_through_the_mmap_store(tmp_path):
+    store_dir = str(tmp_path / "minilm")
+    EmbeddingCache(_CountingEmbedder(), "minilm", store=MmapVectorStore(store_dir), max_wait_ms=0).get_many(
+        ["soil test", "drip irrigation"])
+
+    embed = _CountingEmbedder()
+    restarted = EmbeddingCache(embed, "minilm", store=MmapVectorStore(store_dir), max_wait_ms=0)
+    vectors = restarted.get_many(["drip irrigation", "soil test", "mulching"])
+
+    assert embed.batches == [["mulching"]]
+    assert vectors[0] == [15.0, 0.5, -1.0]
+    assert restarted.stats()["disk_hits"] == 2
+    assert len(restarted.store) == 3
+
+
+def test_torn_rows_are_ignored_on_load(tmp_path):
+    store = MmapVectorStore(str(tmp_path))
+    cache = EmbeddingCache(_CountingEmbedder(), "minilm", store=store, max_wait_ms=0)
+    cache.get_many(["neem oil"])
+    # A crash after the key was written but before its vector hit the disk
+    with open(store.keys_path, 'a', encoding='utf-8') as f:
+        f.write("deadbeef 7\n")
+
+    assert len(MmapVectorStore(str(tmp_path))) == 1
+
+
+
+def test_appends_after_a_torn_row_stay_aligned(tmp_path):
+    store = MmapVectorStore(str(tmp_path))
+    EmbeddingCache(_CountingEmbedder(), "minilm", store=store, max_wait_ms=0).get_many(["neem oil"])
+    # A crash part way through the next row, after its key was written
+    with open(store.vectors_path, 'ab') as f:
+        f.write(b"\x00" * 5)
+    with open(store.keys_path, 'a', encoding='utf-8') as f:
+        f.write("deadbeef 1\n")
+
+    reopened = MmapVectorStore(str(tmp_path))
+    EmbeddingCache(_CountingEmbedder(), "minilm", store=reopened, max_wait_ms=0).get_many(["drip irrigation"])
+
+    restarted = EmbeddingCache(_CountingEmbedder(), "minilm", store=MmapVectorStore(str(tmp_path)), max_wait_ms=0)
+    assert restarted.get_many(["neem oil", "drip irrigation"]) == [[8.0, 0.5, -1.0], [15.0, 0.5, -1.0]]
+    assert restarted.stats()["disk_hits"] == 2
+    assert len(restarted.store) == 2
+
+
+def test_memory_hits_do_not_wait_for_disk_reads():
+    class SlowStore:
+        def get(self, key):
+            time.sleep(0.3)
+            return None
+
+        def put_many(self, items):
+            pass
+
+    cache = EmbeddingCache(_CountingEmbedder(), "minilm", store=SlowStore(), max_wait_ms=0)
+    cache.get_many(["wheat rust"])
+
+    reader = threading.Thread(target=cache.get_many, args=(["mandi price"],))
+    reader.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    assert cache.get_many(["wheat rust"]) == [[10.0, 0.5, -1.0]]
+    assert time.perf_counter() - started < 0.2
+    reader.join()
+
+
+def test_concurrent_misses_share_batches_and_in_flight_texts():
+    embed = _CountingEmbedder(delay=0.02)
+    cache = EmbeddingCache(embed, "minilm", max_wait_ms=10)
+    results = {}
+
+    def worker(name, texts):
+        results[name] = cache.get_many(texts)
+
+    threads = [threading.Thread(target=worker, args=(i, ["urea dose", f"query {i}"])) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    encoded = [text for batch in embed.batches for text in batch]
+    assert sorted(encoded) == ["query 0", "query 1", "query 2", "query 3", "urea dose"]
+    assert len(embed.batches) < 4
+    assert all(result[0] == [9.0, 0.5, -1.0] for result in results.values())
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_encoder_errors_reach_every_waiting_caller():
+    def broken(texts):
+        raise RuntimeError("model not loaded")
+
+    cache = EmbeddingCache(broken, "minilm", max_wait_ms=0)
+    with pytest.raises(RuntimeError):
+        cache.get_many(["rice blast"])
+    # Nothing is left in flight, so the next call retries
+    with pytest.raises(RuntimeError):
+        cache.get_many(["rice blast"])
+    assert cache.stats()["misses"] == 2
+
+
+def test_unexpected_store_errors_do_not_wedge_later_misses():
+    class BrokenStore:
+        def get(self, key):
+            return None
+
+        def put_many(self, vectors):
+            raise KeyError("corrupt index")
+
+        def __len__(self):
+            return 0
+
+    cache = EmbeddingCache(_CountingEmbedder(), "minilm", store=BrokenStore(), max_wait_ms=0)
+    with pytest.raises(KeyError):
+        cache.get_many(["rice blast"])
+
+    # The drain flag was reset, so this caller drains instead of waiting forever
+    cache.store = None
+    assert cache.get_many(["rice blast"]) == [[10.0, 0.5, -1.0]]
@@ -0,0 +1,121 @@
+import sys
+import os
+import importlib
+import asyncio
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.scrapper.http_fetcher import (
+    DomainTierMemory, HttpFetcher, domain_of, has_enough_text, TIER_HTTP, TIER_BROWSER
+)
+
+ARTICLE_HTML = (
+    "<html><head><title>Wheat sowing guide</title></head><body><article><h1>Wheat sowing guide</h1>"
+    + "".join(f"<p>Sow wheat in the second fortnight of November for the best yield in zone {i}. "
+              f"Use 100 kg of seed per hectare and irrigate at crown root initiation.</p>" for i in range(8))
+    + "</article></body></html>"
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_domain_tier_is_remembered_per_domain_until_ttl():
+    clock = FakeClock()
+    memory = DomainTierMemory(ttl_seconds=60, clock=clock)
+
+    memory.record("https://www.krishijagran.com/news/a", TIER_BROWSER)
+    memory.record("https://agritech.tnau.ac.in/crop.html", TIER_HTTP)
+
+    assert memory.preferred_tier("https://krishijagran.com/other-article") == TIER_BROWSER
+    assert memory.preferred_tier("https://agritech.tnau.ac.in/x") == TIER_HTTP
+    assert memory.preferred_tier("https://unknown.org/") is None
+
+    clock.now = 61
+    assert memory.preferred_tier("https://krishijagran.com/other-article") is None
+
+
+def test_domain_memory_is_bounded():
+    memory = DomainTierMemory(max_domains=2)
+    for host in ("a.in", "b.in", "c.in"):
+        memory.record(f"https://{host}/", TIER_HTTP)
+    assert memory.preferred_tier("https://a.in/") is None
+    assert memory.stats()["domains"] == 2
+
+
+def test_has_enough_text():
+    assert domain_of("https://WWW.Example.com/path") == "example.com"
+    assert has_enough_text({"success": True, "content": "x" * 600})
+    assert not has_enough_text({"success": True, "content": "Loading..."})
+    assert not has_enough_text({"success": False, "content": "x" * 600})
+
+
+def _tiered_fetch(monkeypatch, handler, url):
+    """Run the scraper's HTTP-then-browser fetch against a mock transport."""
+    # Other test modules put a stub scraper in sys.modules; this needs the real one
+    monkeypatch.delitem(sys.modules, "modules.scrapper.scrapper", raising=False)
+    scrapper_module = importlib.import_module("modules.scrapper.scrapper")
+
+    browser_urls = []
+
+    async def fake_browser(url, semaphore, main_selector=None):
+        browser_urls.append(url)
+        return {"url": url, "success": True, "content": "Rendered " * 100, "tier": TIER_BROWSER}
+
+    fetcher = HttpFetcher(transport=httpx.MockTransport(handler))
+    tiers = DomainTierMemory()
+    monkeypatch.setattr(scrapper_module, "http_fetcher", fetcher)
+    monkeypatch.setattr(scrapper_module, "domain_tiers", tiers)
+    scraper = scrapper_module.FastPlaywrightScraper()
+    monkeypatch.setattr(scraper, "_fetch_browser", fake_browser)
+
+    async def scenario():
+        try:
+            return await scraper._fetch_tiered(url, asyncio.Semaphore(1))
+        finally:
+            await fetcher.close()
+
+    return asyncio.run(scenario()), browser_urls, tiers
+
+
+def test_static_html_is_extracted_over_http(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, html=ARTICLE_HTML, headers={"etag": '"v1"'})
+
+    doc, browser_urls, tiers = _tiered_fetch(monkeypatch, handler, "https://agritech.tnau.ac.in/wheat.html")
+
+    assert doc["tier"] == TIER_HTTP and doc["title"] == "Wheat sowing guide"
+    assert "second fortnight of November" in doc["content"] and has_enough_text(doc)
+    assert doc["etag"] == '"v1"'
+    assert browser_urls == []
+    assert tiers.preferred_tier("https://agritech.tnau.ac.in/other.html") == TIER_HTTP
+
+
+def test_non_html_responses_are_not_escalated(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, content=b"%PDF-1.7", headers={"content-type": "application/pdf"})
+
+    doc, browser_urls, _ = _tiered_fetch(monkeypatch, handler, "https://agricoop.gov.in/report.pdf")
+
+    assert doc["success"] is False and doc["escalate"] is False
+    assert "application/pdf" in doc["error"]
+    assert browser_urls == []
+
+
+def test_error_statuses_escalate_to_the_browser(monkeypatch):
+    for status in (403, 503):
+        def handler(request, status=status):
+            return httpx.Response(status, html="<html>Access denied</html>")
+
+        doc, browser_urls, tiers = _tiered_fetch(monkeypatch, handler, "https://krishijagran.com/news/a")
+
+        assert doc["tier"] == TIER_BROWSER
+        assert browser_urls == ["https://krishijagran.com/news/a"]
+        assert tiers.preferred_tier("https://krishijagran.com/news/b") == TIER_BROWSER
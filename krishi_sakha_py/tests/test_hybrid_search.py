@@ -0,0 +1,98 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.functions.hybrid_search import reciprocal_rank_fusion, hit_at_k, reciprocal_rank
+from data.functions.sparse_index import SparseIndex
+
+CHUNKS = {
+    "a": ("Fertiliser consumption in 2023-24 was 30.1 million tonnes.", "annual_report"),
+    "b": ("Fertiliser consumption in 2022-23 was 29.8 million tonnes.", "annual_report"),
+    "c": ("Balanced use of fertilisers improves soil health.", "annual_report"),
+    "d": ("PM-KISAN released the 16th instalment to 9 crore farmers.", "annual_report"),
+    "e": ("Fertiliser subsidy guidelines for 2023-24.", "circular"),
+}
+
+
+def make_index():
+    index = SparseIndex(":memory:", "docs")
+    index.upsert(list(CHUNKS), [text for text, _ in CHUNKS.values()],
+                 [{"document_type": document_type, "page_number": "1"} for _, document_type in CHUNKS.values()])
+    return index
+
+
+def test_bm25_ranks_exact_years_and_scheme_names_first():
+    index = make_index()
+
+    assert index.search("fertiliser consumption 2023-24", n_results=3)[0]["id"] == "a"
+    assert index.search("PM-KISAN instalment", n_results=1)[0]["id"] == "d"
+    assert index.search("what is the", n_results=3) == []
+
+
+def test_filters_upserts_and_deletes_stay_in_sync():
+    index = make_index()
+
+    assert [hit["id"] for hit in index.search("2023-24", where_filter={"document_type": "circular"})] == ["e"]
+
+    index.upsert(["a"], ["Seed replacement rate rose in 2023-24."], [{"document_type": "annual_report"}])
+    index.delete(["b"])
+    assert "a" not in [hit["id"] for hit in index.search("fertiliser consumption")]
+    assert "b" not in [hit["id"] for hit in index.search("fertiliser consumption")]
+    assert len(index) == 4
+
+
+def test_rrf_prefers_chunks_both_retrievers_agree_on():
+    fused = reciprocal_rank_fusion([["c", "a", "b"], ["a", "e"]], k=60)
+
+    assert [chunk_id for chunk_id, _ in fused] == ["a", "c", "e", "b"]
+    relevance = [False, False, True, True]
+    assert (hit_at_k(relevance, 2), hit_at_k(relevance, 3)) == (0.0, 1.0)
+    assert reciprocal_rank(relevance) == 1 / 3 and reciprocal_rank([False]) == 0.0
+
+
+class FakeEmbedder:
+    def generate_embeddings(self, texts):
+        return [[0.0] for _ in texts]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, query_embeddings, n_results, where=None):
+        self.queries.append(where)
+        # MiniLM likes the generic chunk and misses the exact year
+        ids = ["c", "b", "a"][:n_results]
+        return {
+            "ids": [ids],
+            "documents": [[CHUNKS[i][0] for i in ids]],
+            "metadatas": [[{"document_type": CHUNKS[i][1]} for i in ids]],
+            "distances": [[0.2, 0.3, 0.4][:n_results]],
+        }
+
+
+class FakeClient:
+    def __init__(self):
+        self.collection = FakeCollection()
+
+    def get_collection(self, name):
+        return self.collection
+
+
+def test_manager_hybrid_search_fuses_vector_and_bm25(tmp_path, monkeypatch):
+    # Imported here so test_vector_db_registry's module stubs are in place first
+    from data.functions import add_to_vector_db
+    monkeypatch.setattr(add_to_vector_db, "CHROMADB_AVAILABLE", True)
+    client = FakeClient()
+    manager = add_to_vector_db.PDFVectorDBManager(db_path=str(tmp_path), collection_name="annual_report",
+                                                  embedding_generator=FakeEmbedder(), client=client)
+    manager.vector_db._sparse_index = make_index()
+
+    results = manager.hybrid_search("fertiliser consumption 2023-24", n_results=3, document_type="annual_report")
+
+    assert results["ids"][0][0] == "a"
+    assert results["retrievers"][0][0] == ["vector", "bm25"]
+    assert "e" not in results["ids"][0]
+    assert client.collection.queries == [{"document_type": "annual_report"}]
+    assert len(results["documents"][0]) == len(results["distances"][0]) == 3
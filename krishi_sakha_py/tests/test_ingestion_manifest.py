@@ -0,0 +1,205 @@
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.functions.ingestion_manifest import IngestionManifest
+from data.functions.ingestion_pipeline import IngestionPipeline
+from data.functions.parse_pdf import PDFParser
+
+
+class FakeCorpus:
+    """Page texts per PDF name; the PDF file's bytes change whenever its pages do."""
+
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.pages = {}
+        self.counted = []
+        self.unreadable = set()
+
+    def write(self, name, pages):
+        self.pages[name] = pages
+        path = self.tmp_path / name
+        path.write_text(repr(pages))
+        return path
+
+    def count(self, pdf_path):
+        self.counted.append(pdf_path.name)
+        return len(self.pages[pdf_path.name]), "fake"
+
+    def extract(self, pdf_path, start_page, end_page):
+        if (pdf_path.name, start_page) in self.unreadable:
+            raise ValueError("damaged page")
+        return [(page_num, self.pages[pdf_path.name][page_num - 1]) for page_num in range(start_page, end_page)]
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.texts = []
+
+    def generate_embeddings(self, texts):
+        self.texts.extend(texts)
+        return [[1.0] for _ in texts]
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.ids = set()
+        self.upserted = []
+        self.deleted = []
+
+    def upsert_documents(self, chunks, embeddings):
+        self.upserted.extend(chunk["id"] for chunk in chunks)
+        self.ids.update(chunk["id"] for chunk in chunks)
+
+    def delete_documents(self, ids):
+        self.deleted.extend(ids)
+        self.ids.difference_update(ids)
+
+
+def page(n, crop="wheat"):
+    return " ".join(f"Page {n} note {i}: irrigate the {crop} field in the evening." for i in range(8))
+
+
+def ingest(corpus, manifest, vector_db, paths, **options):
+    embedder = FakeEmbedder()
+    pipeline = IngestionPipeline(embedder, vector_db, chunk_size=300, chunk_overlap=50, workers=2,
+                                 pages_per_task=3, executor_factory=ThreadPoolExecutor,
+                                 page_counter=corpus.count, page_extractor=corpus.extract,
+                                 manifest=manifest, **options)
+    stats = pipeline.run(paths, {"organization": "ICAR"})
+    return pipeline, stats, embedder
+
+
+def test_unchanged_pdfs_are_not_reopened(tmp_path):
+    corpus = FakeCorpus(tmp_path)
+    paths = [corpus.write("report.pdf", [page(n) for n in range(1, 10)])]
+    manifest, vector_db = IngestionManifest(":memory:", "docs"), FakeVectorDB()
+
+    ingest(corpus, manifest, vector_db, paths)
+    corpus.counted.clear()
+    _, stats, embedder = ingest(corpus, manifest, vector_db, paths)
+
+    assert stats["skipped_pdfs"] == 1 and stats["pages"] == 0
+    assert embedder.texts == [] and vector_db.deleted == []
+    # The page count comes from the manifest; the page tree isn't parsed
+    assert corpus.counted == []
+
+
+def test_untouched_pdfs_are_not_hashed_again(tmp_path, monkeypatch):
+    corpus = FakeCorpus(tmp_path)
+    paths = [corpus.write("report.pdf", [page(n) for n in range(1, 10)])]
+    manifest = IngestionManifest(":memory:", "docs")
+    ingest(corpus, manifest, FakeVectorDB(), paths)
+
+    hashed = []
+    original_hash = PDFParser._generate_file_hash
+
+    def counting_hash(self, path):
+        hashed.append(path)
+        return original_hash(self, path)
+
+    monkeypatch.setattr(PDFParser, "_generate_file_hash", counting_hash)
+    # Just written, so its mtime can't be trusted yet: hashed once more
+    hour_ago = time.time() - 3600
+    os.utime(paths[0], (hour_ago, hour_ago))
+    assert ingest(corpus, manifest, FakeVectorDB(), paths)[1]["skipped_pdfs"] == 1
+    assert len(hashed) == 1
+
+    assert ingest(corpus, manifest, FakeVectorDB(), paths)[1]["skipped_pdfs"] == 1
+    assert len(hashed) == 1
+
+
+def test_only_the_changed_page_range_is_re_embedded(tmp_path):
+    corpus = FakeCorpus(tmp_path)
+    pages = [page(n) for n in range(1, 10)]
+    paths = [corpus.write("report.pdf", pages)]
+    manifest, vector_db = IngestionManifest(":memory:", "docs"), FakeVectorDB()
+    ingest(corpus, manifest, vector_db, paths)
+    before = set(vector_db.ids)
+
+    # Same length, so chunk boundaries after the edit don't move
+    pages[4] = page(5, crop="maize")
+    corpus.write("report.pdf", pages)
+    vector_db.upserted.clear()
+    _, stats, embedder = ingest(corpus, manifest, vector_db, paths)
+
+    assert stats["changed_pages"] == 1
+    assert stats["reused_chunks"] > 0
+    assert embedder.texts and all("_4_" in chunk_id for chunk_id in vector_db.upserted)
+    assert any("maize" in text for text in embedder.texts)
+    assert vector_db.ids == before
+
+
+def test_removed_pages_and_pdfs_leave_no_orphans(tmp_path):
+    corpus = FakeCorpus(tmp_path)
+    report = corpus.write("report.pdf", [page(n) for n in range(1, 10)])
+    bulletin = corpus.write("bulletin.pdf", [page(n, crop="rice") for n in range(1, 4)])
+    manifest, vector_db = IngestionManifest(":memory:", "docs"), FakeVectorDB()
+    ingest(corpus, manifest, vector_db, [report, bulletin])
+
+    corpus.write("report.pdf", [page(n) for n in range(1, 5)])
+    pipeline, stats, _ = ingest(corpus, manifest, vector_db, [report])
+    pipeline.remove_documents([str(bulletin.resolve())])
+
+    assert stats["deleted_chunks"] > 0
+    assert not any("_7_" in chunk_id for chunk_id in vector_db.ids)
+    assert manifest.sources() == [str(report.resolve())]
+    assert set(vector_db.ids) == {chunk_id for value in manifest.get(str(report.resolve()))["ranges"].values()
+                                  for chunk_id in value["chunk_ids"]}
+
+
+def test_force_re_embeds_everything_without_deleting(tmp_path):
+    corpus = FakeCorpus(tmp_path)
+    paths = [corpus.write("report.pdf", [page(n) for n in range(1, 4)])]
+    manifest, vector_db = IngestionManifest(":memory:", "docs"), FakeVectorDB()
+    ingest(corpus, manifest, vector_db, paths)
+
+    _, forced, _ = ingest(corpus, manifest, vector_db, paths, force=True)
+    assert forced["skipped_pdfs"] == 0 and forced["reused_chunks"] == 0 and forced["chunks"] > 0
+    assert vector_db.deleted == []
+
+
+def test_truncating_or_appending_at_a_range_boundary_matches_a_fresh_ingest(tmp_path):
+    for before, after in ((9, 6), (6, 9)):
+        corpus = FakeCorpus(tmp_path)
+        paths = [corpus.write("report.pdf", [page(n) for n in range(1, before + 1)])]
+        manifest, vector_db = IngestionManifest(":memory:", "docs"), FakeVectorDB()
+        ingest(corpus, manifest, vector_db, paths)
+
+        corpus.write("report.pdf", [page(n) for n in range(1, after + 1)])
+        ingest(corpus, manifest, vector_db, paths)
+
+        fresh = FakeVectorDB()
+        ingest(corpus, IngestionManifest(":memory:", "docs"), fresh, paths)
+        assert vector_db.ids == fresh.ids, (before, after)
+
+
+def test_a_failed_range_leaves_no_chunks_the_manifest_does_not_list(tmp_path):
+    corpus = FakeCorpus(tmp_path)
+    paths = [corpus.write("report.pdf", [page(n) for n in range(1, 10)])]
+    manifest, vector_db = IngestionManifest(":memory:", "docs"), FakeVectorDB()
+    corpus.unreadable.add(("report.pdf", 7))
+
+    # First ingest: ranges 1 and 4 reach Chroma before range 7 fails
+    _, stats, _ = ingest(corpus, manifest, vector_db, paths, embed_batch_size=2, upsert_batch_size=2)
+    assert list(stats["failed"]) == [str(paths[0])] and vector_db.upserted
+    assert vector_db.ids == set() and manifest.sources() == []
+
+    corpus.unreadable.clear()
+    ingest(corpus, manifest, vector_db, paths)
+    # An update whose last range fails overwrites recorded chunks on the way
+    corpus.write("report.pdf", [page(n, "rice") for n in range(1, 10)])
+    corpus.unreadable.add(("report.pdf", 7))
+    ingest(corpus, manifest, vector_db, paths, embed_batch_size=2, upsert_batch_size=2)
+    recorded = {chunk_id for value in manifest.get(str(paths[0].resolve()))["ranges"].values()
+                for chunk_id in value["chunk_ids"]}
+    assert vector_db.ids == recorded
+
+    corpus.unreadable.clear()
+    ingest(corpus, manifest, vector_db, paths)
+    fresh = FakeVectorDB()
+    ingest(corpus, IngestionManifest(":memory:", "docs"), fresh, paths)
+    assert vector_db.ids == fresh.ids
@@ -0,0 +1,121 @@
+import sys
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.functions.ingestion_pipeline import IngestionPipeline
+
+
+def page_text(page_num):
+    return " ".join(f"Wheat field {page_num} sentence {i} needs irrigation." for i in range(12))
+
+
+def fake_counter(pdf_path):
+    if "broken" in pdf_path.name:
+        raise ValueError("not a PDF")
+    return int(pdf_path.stem.split("_")[-1]), "fake"
+
+
+def fake_extractor(pdf_path, start_page, end_page):
+    return [(page_num, page_text(page_num)) for page_num in range(start_page, end_page)]
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def generate_embeddings(self, texts):
+        self.batch_sizes.append(len(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class FakeVectorDB:
+    def __init__(self, fail=False):
+        self.upserts = []
+        self.deleted = []
+        self.fail = fail
+
+    def upsert_documents(self, chunks, embeddings):
+        if self.fail:
+            raise RuntimeError("chroma is down")
+        assert len(chunks) == len(embeddings)
+        self.upserts.append(chunks)
+
+    def delete_documents(self, ids):
+        self.deleted.extend(ids)
+
+
+def make_pdfs(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(path)
+    return paths
+
+
+def make_pipeline(embedder, vector_db, **options):
+    return IngestionPipeline(embedder, vector_db, chunk_size=300, chunk_overlap=50,
+                             workers=2, pages_per_task=3, executor_factory=ThreadPoolExecutor,
+                             page_counter=fake_counter, page_extractor=fake_extractor, **options)
+
+
+def test_chunks_are_batched_and_ids_are_stable(tmp_path):
+    pdfs = make_pdfs(tmp_path, "report_10.pdf", "bulletin_4.pdf")
+    embedder, vector_db = FakeEmbedder(), FakeVectorDB()
+
+    stats = make_pipeline(embedder, vector_db, embed_batch_size=8, upsert_batch_size=20).run(
+        pdfs, {"organization": "ICAR", "tags": ["wheat"]})
+
+    chunks = [chunk for batch in vector_db.upserts for chunk in batch]
+    assert stats["pdfs"] == 2 and stats["pages"] == 14 and stats["chunks"] == len(chunks)
+    assert all(size <= 8 for size in embedder.batch_sizes)
+    assert all(len(batch) <= 20 for batch in vector_db.upserts)
+
+    report = [chunk for chunk in chunks if chunk["source_file"] == str(pdfs[0])]
+    assert [chunk["chunk_index"] for chunk in report] == list(range(len(report)))
+    assert len({chunk["id"] for chunk in chunks}) == len(chunks)
+    assert report[0]["id"].endswith("_1_0") and report[-1]["id"].split("_")[1] == "10"
+    assert report[0]["metadata"]["organization"] == "ICAR"
+    assert report[0]["metadata"]["document_title"] == "report_10"
+
+
+def test_text_is_not_lost_at_page_range_borders(tmp_path):
+    pdfs = make_pdfs(tmp_path, "report_7.pdf")
+    vector_db = FakeVectorDB()
+
+    make_pipeline(FakeEmbedder(), vector_db, embed_batch_size=4).run(pdfs)
+
+    chunks = [chunk for batch in vector_db.upserts for chunk in batch]
+    text = " ".join(chunk["text"] for chunk in chunks)
+    for page_num in range(1, 8):
+        assert f"Wheat field {page_num} sentence 0 needs" in text
+        assert f"Wheat field {page_num} sentence 11 needs irrigation." in text
+    # Chunks that run over a range border still get their real pages
+    for chunk in chunks:
+        pages = {int(n) for n in re.findall(r"Wheat field (\d+)", chunk["text"])}
+        assert (chunk["metadata"]["page_start"], chunk["metadata"]["page_end"]) == (min(pages), max(pages))
+    assert any(chunk["metadata"]["page_start"] == 3 and chunk["metadata"]["page_end"] == 4 for chunk in chunks)
+
+
+def test_unreadable_pdfs_are_reported_and_skipped(tmp_path):
+    pdfs = make_pdfs(tmp_path, "broken_3.pdf", "report_2.pdf")
+    progress = []
+
+    stats = make_pipeline(FakeEmbedder(), FakeVectorDB(), on_progress=progress.append).run(pdfs)
+
+    assert stats["pdfs"] == 1
+    assert list(stats["failed"]) == [str(pdfs[0])]
+    assert progress[-1]["pages"] == 2 and "chunks_per_sec" in progress[-1]
+
+
+def test_upsert_errors_stop_the_run(tmp_path):
+    pdfs = make_pdfs(tmp_path, "report_30.pdf")
+
+    with pytest.raises(RuntimeError, match="chroma is down"):
+        make_pipeline(FakeEmbedder(), FakeVectorDB(fail=True), embed_batch_size=2,
+                      upsert_batch_size=2, queue_batches=1).run(pdfs)
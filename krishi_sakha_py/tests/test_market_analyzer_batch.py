@@ -0,0 +1,73 @@
+import sys
+import os
+import time
+import types
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Keep Playwright/requests out of the import; searches are injected below
+scrapper_stub = types.ModuleType('modules.scrapper.scrapper')
+async def _dummy_json_scrapped(query):
+    return []
+scrapper_stub.json_scrapped = _dummy_json_scrapped
+searxng_stub = types.ModuleType('modules.search.searxng_json')
+searxng_stub.searxng_search = lambda query, **kwargs: []
+sys.modules.setdefault('modules.scrapper.scrapper', scrapper_stub)
+sys.modules.setdefault('modules.search.searxng_json', searxng_stub)
+# Another test module replaces brain.market_analyzer with a stub
+sys.modules.pop('brain.market_analyzer', None)
+
+from brain.market_analyzer import lookup_crops_batch
+from modules.search.rate_limiter import AsyncRateLimiter
+
+
+def test_crops_are_looked_up_concurrently():
+    async def search(query):
+        await asyncio.sleep(0.1)
+        return [{"title": query}]
+
+    start = time.perf_counter()
+    results = asyncio.run(lookup_crops_batch(
+        ["wheat", "rice", "maize", "mandua"],
+        lambda crop: f"{crop} price",
+        search=search,
+        rate_limiter=AsyncRateLimiter(rate=100, burst=10)
+    ))
+
+    assert time.perf_counter() - start < 0.3
+    assert results["mandua"] == {"search_results": [{"title": "mandua price"}], "status": "found"}
+
+
+def test_deadline_returns_partial_results():
+    async def search(query):
+        if query.startswith("rice"):
+            await asyncio.sleep(5)
+        if query.startswith("maize"):
+            raise RuntimeError("searxng down")
+        return [] if query.startswith("barley") else [{"title": query}]
+
+    results = asyncio.run(lookup_crops_batch(
+        ["wheat", "rice", "maize", "barley"],
+        lambda crop: f"{crop} price",
+        deadline_seconds=0.2,
+        search=search,
+        rate_limiter=AsyncRateLimiter(rate=100, burst=10)
+    ))
+
+    assert results["wheat"]["status"] == "found"
+    assert results["rice"]["status"] == "timeout"
+    assert results["maize"]["status"] == "error"
+    assert results["barley"]["status"] == "no_results"
+
+
+def test_rate_limiter_spaces_out_bursts():
+    async def scenario():
+        limiter = AsyncRateLimiter(rate=20, burst=2)
+        start = time.perf_counter()
+        for _ in range(4):
+            await limiter.acquire()
+        return time.perf_counter() - start
+
+    # Two immediate tokens, then two more at 20/s
+    assert 0.08 <= asyncio.run(scenario()) < 0.3
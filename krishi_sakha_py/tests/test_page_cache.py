@@ -0,0 +1,118 @@
+import sys
+import os
+import importlib
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from configs.page_cache_config import HOUR, DAY
+from modules.scrapper.page_cache import PageCache, MemoryPageStore, DiskPageStore, ttl_for_url, cached_doc
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _doc(url, text="Wheat sowing guide " * 50):
+    return {"url": url, "title": "Guide", "content": text, "success": True, "extractor": "trafilatura", "tier": "http"}
+
+
+def test_domain_ttls():
+    assert ttl_for_url("https://www.krishijagran.com/news/x") == 6 * HOUR
+    assert ttl_for_url("https://agritech.tnau.ac.in/crop.html") == 30 * DAY
+    assert ttl_for_url("https://example.com/") == DAY
+
+
+def test_fresh_stale_and_revalidated_lookups():
+    clock = FakeClock()
+    cache = PageCache(store=MemoryPageStore(), clock=clock)
+    url = "https://krishijagran.com/news/wheat-msp/"
+
+    assert cache.lookup(url) is None
+    cache.put(url, _doc(url), etag='"abc"')
+
+    # Canonical form: tracking params and www don't matter
+    record = cache.lookup("https://www.krishijagran.com/news/wheat-msp?utm_source=feed")
+    assert record["fresh"] and record["etag"] == '"abc"'
+    assert cached_doc(record)["cached"] is True
+
+    clock.now += 7 * HOUR
+    record = cache.lookup(url)
+    assert record["fresh"] is False
+
+    assert cache.mark_revalidated(url)["fresh"] is True
+    assert cache.lookup(url)["fresh"] is True
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale"], stats["revalidated"], stats["misses"]) == (2, 1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
+    assert stats["served_from_cache_ratio"] == 0.75
+
+
+def test_lru_size_cap_evicts_least_recently_used(tmp_path):
+    cache = PageCache(store=DiskPageStore(str(tmp_path)), max_bytes=2500)
+    urls = [f"https://site{i}.in/page" for i in range(3)]
+    cache.put(urls[0], _doc(urls[0], "a" * 1000))
+    cache.put(urls[1], _doc(urls[1], "b" * 1000))
+    cache.lookup(urls[0])
+    cache.put(urls[2], _doc(urls[2], "c" * 1000))
+
+    assert cache.lookup(urls[1]) is None
+    assert cache.lookup(urls[0]) is not None
+    assert cache.lookup(urls[2]) is not None
+
+    # The on-disk index survives a restart
+    reopened = PageCache(store=DiskPageStore(str(tmp_path)), max_bytes=2500)
+    assert reopened.stats()["entries"] == 2
+    assert reopened.lookup(urls[2])["content"] == "c" * 1000
+
+
+def test_failed_docs_are_not_cached():
+    cache = PageCache(store=MemoryPageStore())
+    cache.put("https://a.in/", {"url": "https://a.in/", "success": False, "error": "Timeout"})
+    assert cache.lookup("https://a.in/") is None
+
+
+def test_unchanged_page_is_revalidated_over_http_without_the_browser(monkeypatch):
+    import httpx
+    # Other test modules put a stub scraper in sys.modules; this needs the real one
+    monkeypatch.delitem(sys.modules, "modules.scrapper.scrapper", raising=False)
+    scrapper_module = importlib.import_module("modules.scrapper.scrapper")
+    from modules.scrapper.http_fetcher import HttpFetcher, DomainTierMemory
+
+    url = "https://krishijagran.com/news/wheat-msp/"
+    validators = []
+
+    def handler(request):
+        validators.append(request.headers.get("if-none-match"))
+        return httpx.Response(304, headers={"etag": '"abc"'})
+
+    async def no_browser(*args, **kwargs):
+        raise AssertionError("an unchanged page was rendered in Chromium")
+
+    clock = FakeClock()
+    cache = PageCache(store=MemoryPageStore(), clock=clock)
+    cache.put(url, _doc(url), etag='"abc"')
+    clock.now += 7 * HOUR
+    fetcher = HttpFetcher(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(scrapper_module, "get_page_cache", lambda: cache)
+    monkeypatch.setattr(scrapper_module, "http_fetcher", fetcher)
+    monkeypatch.setattr(scrapper_module, "domain_tiers", DomainTierMemory())
+    scraper = scrapper_module.FastPlaywrightScraper()
+    monkeypatch.setattr(scraper, "_fetch_browser", no_browser)
+
+    async def scenario():
+        try:
+            return await scraper._fetch(url, asyncio.Semaphore(1))
+        finally:
+            await fetcher.close()
+
+    doc = asyncio.run(scenario())
+
+    assert validators == ['"abc"']
+    assert doc["success"] and doc["cached"] is True and doc["content"] == _doc(url)["content"]
+    assert cache.stats()["revalidated"] == 1
@@ -0,0 +1,52 @@
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.functions.parse_pdf import PDFParser
+
+
+def page_text(page_num, sentences=10):
+    return " ".join(f"Page {page_num} line {i}: sow mustard after the rains end." for i in range(sentences))
+
+
+def pages_in(text):
+    return {int(n) for n in re.findall(r"Page (\d+) line", text)}
+
+
+def test_chunks_carry_the_pages_they_span():
+    parser = PDFParser(chunk_size=400, chunk_overlap=80)
+    pages = [(1, page_text(1)), (2, "   "), (3, page_text(3, sentences=2)), (4, page_text(4))]
+
+    chunks = list(parser.chunk_pages(pages, {"organization": "ICAR"}))
+
+    assert [chunk["metadata"]["chunk_index"] for chunk in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        spanned = pages_in(chunk["text"])
+        assert chunk["metadata"]["page_start"] == chunk["metadata"]["page_number"] == min(spanned)
+        assert chunk["metadata"]["page_end"] == max(spanned)
+        assert chunk["metadata"]["organization"] == "ICAR"
+    assert any(chunk["metadata"]["page_start"] != chunk["metadata"]["page_end"] for chunk in chunks)
+    assert "--- Page" not in " ".join(chunk["text"] for chunk in chunks)
+
+
+def test_pages_are_consumed_lazily():
+    parser = PDFParser(chunk_size=300, chunk_overlap=50)
+    consumed = []
+
+    def pages():
+        for page_num in range(1, 1001):
+            consumed.append(page_num)
+            yield page_num, page_text(page_num)
+
+    stream = parser.chunk_pages(pages())
+    first = next(stream)
+
+    assert first["metadata"]["page_number"] == 1
+    # Only enough pages to fill the buffer once, not the whole report
+    assert len(consumed) < 10
+    last = None
+    for last in stream:
+        pass
+    assert last["metadata"]["page_end"] == 1000
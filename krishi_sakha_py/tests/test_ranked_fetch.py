@@ -0,0 +1,70 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.scrapper.ranked_fetch import canonical_url, dedupe_urls, content_quality, fetch_ranked
+
+
+def test_dedupe_by_canonical_url_keeps_best_rank():
+    urls = [
+        "https://www.krishijagran.com/news/wheat-msp/?utm_source=x",
+        "https://krishijagran.com/news/wheat-msp",
+        "https://agritech.tnau.ac.in/crop/rice.html#pests",
+        "https://agritech.tnau.ac.in/crop/rice.html",
+    ]
+    assert dedupe_urls(urls) == [urls[0], urls[2]]
+    assert canonical_url("HTTPS://WWW.Example.com/a/?b=2&a=1&fbclid=z") == "https://example.com/a?a=1&b=2"
+
+
+def test_limit_counts_unique_urls_only():
+    urls = [
+        "https://www.krishijagran.com/news/wheat-msp/",
+        "https://krishijagran.com/news/wheat-msp?utm_medium=social",
+        "https://krishijagran.com/news/wheat-msp",
+        "https://agritech.tnau.ac.in/crop/rice.html",
+        "https://icar.org.in/",
+    ]
+    assert dedupe_urls(urls, limit=2) == [urls[0], urls[3]]
+
+
+def test_content_quality_prefers_trafilatura_extractions():
+    article = {"success": True, "extractor": "trafilatura", "content": "x" * 3000}
+    raw_text = {"success": True, "extractor": "soup", "content": "x" * 3000}
+    assert content_quality(article) == 1.0
+    assert content_quality(raw_text) == 0.5
+    assert content_quality({"success": False, "content": "x" * 3000}) == 0.0
+
+
+def test_stops_after_enough_good_docs_and_cancels_the_rest():
+    delays = {"https://a.in": 0.01, "https://b.in": 0.02, "https://c.in": 5.0, "https://d.in": 5.0}
+    cancelled = []
+
+    async def fetch(url):
+        try:
+            await asyncio.sleep(delays[url])
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return {"url": url, "success": True, "extractor": "trafilatura", "content": "text " * 500}
+
+    docs = asyncio.run(fetch_ranked(list(delays), fetch, target_docs=2, budget_seconds=2.0))
+
+    assert [d["url"] for d in docs] == ["https://a.in", "https://b.in"]
+    assert sorted(cancelled) == ["https://c.in", "https://d.in"]
+
+
+def test_budget_expiry_returns_finished_docs_in_rank_order():
+    async def fetch(url):
+        if url == "https://slow.in":
+            await asyncio.sleep(5.0)
+        if url == "https://broken.in":
+            raise RuntimeError("boom")
+        return {"url": url, "success": True, "extractor": "soup", "content": "short"}
+
+    urls = ["https://slow.in", "https://broken.in", "https://fast.in"]
+    docs = asyncio.run(fetch_ranked(urls, fetch, target_docs=3, budget_seconds=0.1))
+
+    assert [d["url"] for d in docs] == ["https://broken.in", "https://fast.in"]
+    assert docs[0]["success"] is False
@@ -0,0 +1,75 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.resource_registry import ResourceRegistry, NOT_LOADED, READY, FAILED
+
+
+def test_resource_loads_once_under_concurrent_gets():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = ResourceRegistry()
+    resource = registry.register("model", loader)
+    assert resource.state == NOT_LOADED
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("model"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+    assert resource.state == READY
+    assert resource.load_seconds >= 0.05
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("ollama not running")
+        return "client"
+
+    registry = ResourceRegistry()
+    registry.register("ollama", flaky)
+
+    with pytest.raises(RuntimeError):
+        registry.get("ollama")
+    status = registry.status()
+    assert status["ready"] is False
+    assert status["resources"]["ollama"]["state"] == FAILED
+    assert status["resources"]["ollama"]["error"] == "ollama not running"
+
+    assert registry.get("ollama") == "client"
+    assert registry.status()["ready"] is True
+
+
+def test_background_warm_up_skips_lazy_only_resources_and_survives_failures():
+    registry = ResourceRegistry()
+    registry.register("embeddings", lambda: "minilm")
+    registry.register("broken", lambda: 1 / 0)
+    registry.register("on_demand", lambda: "only when asked", warm_up=False)
+
+    async def run():
+        await registry.start_warm_up()
+
+    asyncio.run(run())
+    resources = registry.status()["resources"]
+    assert resources["embeddings"]["state"] == READY
+    assert resources["broken"]["state"] == FAILED
+    assert resources["on_demand"]["state"] == NOT_LOADED
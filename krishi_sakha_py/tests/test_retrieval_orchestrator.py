@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+import types
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Stub the scraper/YouTube modules so importing the orchestrator doesn't pull in
+# Playwright, trafilatura or network access.
+scrapper_stub = types.ModuleType('modules.scrapper.scrapper')
+async def _dummy_json_scrapped(query):
+    return []
+scrapper_stub.json_scrapped = _dummy_json_scrapped
+youtube_stub = types.ModuleType('modules.youtube.youtube_search')
+youtube_stub.search_youtube = lambda query, limit=10: []
+sys.modules.setdefault('modules.scrapper.scrapper', scrapper_stub)
+sys.modules.setdefault('modules.youtube.youtube_search', youtube_stub)
+
+from modules.search.retrieval_orchestrator import RetrievalOrchestrator
+
+
+async def _collect(orchestrator, sources):
+    return [result async for result in orchestrator.run(sources)]
+
+
+def _sleeper(seconds, value):
+    async def source():
+        await asyncio.sleep(seconds)
+        return value
+    return source
+
+
+def test_sources_run_concurrently_and_yield_in_completion_order():
+    orchestrator = RetrievalOrchestrator(source_deadlines={"slow": 1.0, "fast": 1.0})
+    start = time.perf_counter()
+    results = asyncio.run(_collect(orchestrator, {
+        "slow": _sleeper(0.2, "slow-data"),
+        "fast": _sleeper(0.05, "fast-data"),
+    }))
+    elapsed = time.perf_counter() - start
+
+    assert [r["source"] for r in results] == ["fast", "slow"]
+    assert all(r["status"] == "ok" for r in results)
+    # Concurrent: roughly the slowest source, not the sum
+    assert elapsed < 0.35
+
+
+def test_deadline_and_errors_do_not_block_other_sources():
+    async def broken():
+        raise RuntimeError("searxng down")
+
+    orchestrator = RetrievalOrchestrator(source_deadlines={"youtube": 0.05}, overall_deadline=1.0)
+    results = {r["source"]: r for r in asyncio.run(_collect(orchestrator, {
+        "youtube": _sleeper(0.5, ["late"]),
+        "web": broken,
+        "extra": _sleeper(0.01, "ok"),
+    }))}
+
+    assert results["youtube"]["status"] == "timeout"
+    assert results["youtube"]["data"] is None
+    assert results["web"]["status"] == "error"
+    assert "searxng down" in results["web"]["error"]
+    assert results["extra"]["data"] == "ok"
@@ -0,0 +1,74 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from routes.helpers.route_cache import RouteCache, normalize_prompt
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalized_prompts_share_an_entry():
+    cache = RouteCache()
+    cache.store("Wheat rust treatment?", {"domain": "general", "keywords": ["wheat rust"]})
+
+    assert normalize_prompt("  WHEAT   rust, treatment ") == "wheat rust treatment"
+    assert cache.lookup("wheat rust treatment")["domain"] == "general"
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = RouteCache(ttl_seconds=10, clock=clock)
+    cache.store("onion price", {"domain": "search"})
+
+    clock.now = 9
+    assert cache.lookup("onion price") is not None
+    clock.now = 11
+    assert cache.lookup("onion price") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_similar_prompt_hits_only_with_matching_years():
+    cache = RouteCache(similarity_threshold=0.9)
+    cache.store("fertilizer usage 2024 report", {"domain": "annual_report"}, embedding=[1.0, 0.0])
+
+    assert cache.lookup("fertilizer use in 2024 report", embedding=[0.99, 0.05])["domain"] == "annual_report"
+    assert cache.lookup("fertilizer use in 2023 report", embedding=[0.99, 0.05]) is None
+    assert cache.lookup("something unrelated 2024", embedding=[0.0, 1.0]) is None
+
+    stats = cache.stats()
+    assert stats["semantic_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_lru_cap_drops_oldest_entry():
+    cache = RouteCache(max_entries=2)
+    cache.store("a", {"domain": "general"})
+    cache.store("b", {"domain": "general"})
+    cache.lookup("a")
+    cache.store("c", {"domain": "general"})
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+
+
+def test_similar_prompt_reuses_only_the_domain():
+    cache = RouteCache(similarity_threshold=0.9)
+    cache.store("onion price Haldwani", {"domain": "search", "reason": "prices", "keywords": ["onion", "haldwani"],
+                                         "query": "onion price Haldwani"}, embedding=[1.0, 0.0])
+
+    similar = cache.lookup("onion price Dehradun", embedding=[0.99, 0.05])
+    assert similar["domain"] == "search"
+    assert similar["keywords"] == ["onion", "price", "dehradun"]
+    assert similar["query"] == "onion price Dehradun"
+
+    # Callers can't edit the cached result through what they were given
+    cache.lookup("onion price Haldwani")["keywords"].append("tomato")
+    assert cache.lookup("onion price Haldwani")["keywords"] == ["onion", "haldwani"]
@@ -0,0 +1,68 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.translation_batcher import TranslationBatcher
+
+
+def test_concurrent_requests_are_batched_per_language():
+    calls = []
+
+    def translate_batch(texts, target_language):
+        calls.append((target_language, list(texts)))
+        return [f"{target_language}:{text}" for text in texts]
+
+    async def scenario():
+        batcher = TranslationBatcher(translate_batch, max_batch_size=8, max_wait_ms=20)
+        requests = [("Hello", "hi"), ("Water the field", "ta"), ("Good morning", "hi"), ("Thank you", "hi")]
+        results = await asyncio.gather(*(batcher.submit(text, lang) for text, lang in requests))
+        return batcher, results
+
+    batcher, results = asyncio.run(scenario())
+
+    assert results == ["hi:Hello", "ta:Water the field", "hi:Good morning", "hi:Thank you"]
+    assert sorted(calls) == [("hi", ["Hello", "Good morning", "Thank you"]), ("ta", ["Water the field"])]
+    stats = batcher.stats()
+    assert stats["batches"] == 2 and stats["requests"] == 4
+    assert stats["avg_batch_size"] == 2.0
+
+
+def test_max_batch_size_splits_batches():
+    sizes = []
+
+    def translate_batch(texts, target_language):
+        sizes.append(len(texts))
+        return list(texts)
+
+    async def scenario():
+        batcher = TranslationBatcher(translate_batch, max_batch_size=3, max_wait_ms=20)
+        return await asyncio.gather(*(batcher.submit(str(i), "hi") for i in range(7)))
+
+    assert asyncio.run(scenario()) == [str(i) for i in range(7)]
+    assert sizes == [3, 3, 1]
+
+
+def test_model_errors_reach_every_caller_in_the_batch():
+    def translate_batch(texts, target_language):
+        raise RuntimeError("CUDA out of memory")
+
+    async def scenario():
+        batcher = TranslationBatcher(translate_batch, max_wait_ms=5)
+        return await asyncio.gather(batcher.submit("a", "hi"), batcher.submit("b", "hi"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_batcher_survives_a_new_event_loop():
+    batcher = TranslationBatcher(lambda texts, target_language: [text.upper() for text in texts], max_wait_ms=5)
+
+    async def scenario(text):
+        return await asyncio.wait_for(batcher.submit(text, "hi"), timeout=2)
+
+    # Each asyncio.run closes its loop, taking the first worker with it
+    assert asyncio.run(scenario("first")) == "FIRST"
+    assert asyncio.run(scenario("second")) == "SECOND"
+    assert batcher.stats()["batches"] == 2
@@ -0,0 +1,66 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.translation_decoding import TORCH_AVAILABLE, budget_max_new_tokens, cached_greedy_decode, decode_batch
+
+# The length budget is plain arithmetic; only the decoder tests need torch
+requires_torch = pytest.mark.skipif(not TORCH_AVAILABLE, reason="torch not installed")
+if TORCH_AVAILABLE:
+    import torch
+
+
+class FakeSeq2Seq:
+    """Emits a scripted token per step and counts what the decoder is fed."""
+
+    config = SimpleNamespace(eos_token_id=2, pad_token_id=1, decoder_start_token_id=2)
+
+    def __init__(self, script, vocab_size=6):
+        self.script = script
+        self.vocab_size = vocab_size
+        self.decoder_input_lengths = []
+        self.encoder_calls = 0
+
+    def get_encoder(self):
+        def encoder(input_ids, attention_mask, return_dict):
+            self.encoder_calls += 1
+            return SimpleNamespace(last_hidden_state=torch.zeros(input_ids.shape[0], input_ids.shape[1], 4))
+        return encoder
+
+    def __call__(self, encoder_outputs, attention_mask, decoder_input_ids, past_key_values, use_cache, return_dict):
+        self.decoder_input_lengths.append(decoder_input_ids.shape[1])
+        step = 0 if past_key_values is None else past_key_values[0]
+        logits = torch.zeros(decoder_input_ids.shape[0], 1, self.vocab_size)
+        for row, token in enumerate(self.script[step]):
+            logits[row, 0, token] = 1.0
+        return SimpleNamespace(logits=logits, past_key_values=(step + 1,))
+
+
+def test_length_budget_scales_with_input_and_is_capped():
+    assert budget_max_new_tokens(10) == 25
+    assert budget_max_new_tokens(400) == 256
+
+
+@requires_torch
+def test_cached_greedy_feeds_one_token_per_step_and_stops_at_eos():
+    model = FakeSeq2Seq(script=[[3, 4], [2, 3], [5, 2], [5, 5]])
+    input_ids = torch.tensor([[7, 8, 9], [7, 8, 1]])
+    attention_mask = torch.tensor([[1, 1, 1], [1, 1, 0]])
+
+    outputs = cached_greedy_decode(model, input_ids, attention_mask, max_new_tokens=10)
+
+    # Row 0 finishes first and is padded while row 1 runs on
+    assert outputs.tolist() == [[2, 3, 2, 1], [2, 4, 3, 2]]
+    assert model.encoder_calls == 1
+    assert model.decoder_input_lengths == [1, 1, 1]
+
+
+@requires_torch
+def test_decode_batch_rejects_unknown_modes():
+    inputs = {"input_ids": torch.tensor([[7]]), "attention_mask": torch.tensor([[1]])}
+    with pytest.raises(ValueError):
+        decode_batch(FakeSeq2Seq(script=[[2]]), None, inputs, mode="sampling")
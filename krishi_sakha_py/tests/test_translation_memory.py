@@ -0,0 +1,66 @@
+import sys
+import os
+import json
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.translation_memory import TranslationMemory, segment, reassemble
+
+
+def test_segment_and_reassemble_keep_line_structure():
+    text = 'Irrigate in the evening. Avoid urea before rain!\nSpray neem oil "weekly." Done'
+    sentences, separators = segment(text)
+    assert sentences == ['Irrigate in the evening.', 'Avoid urea before rain!', 'Spray neem oil "weekly."', 'Done']
+    assert reassemble(sentences, separators) == text
+
+
+def test_seeded_lookups_and_per_language_hit_rate(tmp_path):
+    seed = tmp_path / "offline_cache.json"
+    seed.write_text(json.dumps({"phrases": {"Thank you": {"hi": "धन्यवाद", "ta": "நன்றி"}}}), encoding="utf-8")
+    memory = TranslationMemory(db_path=str(tmp_path / "tm.sqlite3"), seed_path=seed)
+
+    assert memory.lookup_many(["Thank you", "Sow wheat in November."], "hi") == {"Thank you": "धन्यवाद"}
+    memory.store_many({"Sow wheat in November.": "नवंबर में गेहूं बोएं।"}, "hi")
+    assert memory.lookup_many(["Sow  wheat in November."], "hi") == {"Sow  wheat in November.": "नवंबर में गेहूं बोएं।"}
+    assert memory.lookup_many(["Thank you"], "ta") == {"Thank you": "நன்றி"}
+
+    stats = memory.stats()["languages"]
+    assert stats["hi"] == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+    assert stats["ta"]["hit_rate"] == 1.0
+
+
+def test_memory_persists_beyond_the_lru(tmp_path):
+    db_path = str(tmp_path / "tm.sqlite3")
+    memory = TranslationMemory(db_path=db_path, lru_size=1, seed_path=None)
+    memory.store_many({"One.": "एक।", "Two.": "दो।"}, "hi")
+    assert memory.stats()["lru_entries"] == 1
+
+    reopened = TranslationMemory(db_path=db_path, seed_path=None)
+    assert reopened.lookup_many(["One.", "Two."], "hi") == {"One.": "एक।", "Two.": "दो।"}
+
+
+def test_async_translations_use_the_memory_off_the_event_loop(tmp_path, monkeypatch):
+    from brain import language_brain
+    from brain.resource_registry import LazyResource
+
+    seed = tmp_path / "offline_cache.json"
+    seed.write_text(json.dumps({"phrases": {"Thank you": {"hi": "धन्यवाद"}}}), encoding="utf-8")
+    threads = []
+
+    class RecordingMemory(TranslationMemory):
+        def lookup_many(self, sentences, language):
+            threads.append(threading.get_ident())
+            return super().lookup_many(sentences, language)
+
+    resource = LazyResource("translation_memory", lambda: RecordingMemory(db_path=":memory:", seed_path=seed))
+    monkeypatch.setattr(language_brain, "translation_memory_resource", resource)
+
+    async def scenario():
+        return threading.get_ident(), await language_brain.language_translator.translate_async("Thank you", "hi")
+
+    loop_thread, result = asyncio.run(scenario())
+
+    assert result["translation"] == "धन्यवाद"
+    assert threads and loop_thread not in threads
@@ -0,0 +1,55 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.translation_parity import PARITY_SENTENCES, MAX_CHRF_DRIFT, chrf, chrf_drift
+
+
+def test_chrf_bounds():
+    assert chrf(["गेहूं की सिंचाई करें"], ["गेहूं की सिंचाई करें"]) == pytest.approx(100.0)
+    assert chrf(["abc"], ["xyz"]) == 0.0
+
+
+def test_chrf_ignores_whitespace_and_penalises_small_edits():
+    assert chrf(["शाम को  सिंचाई करें"], ["शाम को सिंचाई करें"]) == pytest.approx(100.0)
+    score = chrf(["शाम को सिंचाई करो"], ["शाम को सिंचाई करें"])
+    assert 50.0 < score < 100.0
+
+
+def test_chrf_drift_reports_identical_rows():
+    drift = chrf_drift(["नमस्ते", "धन्यवाद"], ["नमस्ते", "धन्यवाद!"])
+    assert drift["identical"] == 1
+    assert drift["total"] == 2
+    assert 0.0 < drift["drift"] < MAX_CHRF_DRIFT * 4
+
+
+# The model-backed parity run downloads IndicTrans2; opt in with
+# TRANSLATION_PARITY_TESTS=1
+requires_model = pytest.mark.skipif(
+    not os.getenv("TRANSLATION_PARITY_TESTS"), reason="set TRANSLATION_PARITY_TESTS=1 to run model parity")
+
+
+@pytest.fixture(scope="module")
+def fp32_reference():
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from brain.translation_backends import load_backend
+
+    backend = load_backend("torch_fp32")
+    input_texts = [f"eng_Latn hin_Deva {text}" for text in PARITY_SENTENCES]
+    return input_texts, backend.translate(input_texts)
+
+
+@requires_model
+@pytest.mark.parametrize("name", ["torch_int8", "onnx"])
+def test_backend_chrf_drift_against_fp32(name, fp32_reference):
+    if name == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+    from brain.translation_backends import load_backend
+
+    input_texts, reference = fp32_reference
+    drift = chrf_drift(reference, load_backend(name).translate(input_texts))
+    assert drift["drift"] <= MAX_CHRF_DRIFT, drift
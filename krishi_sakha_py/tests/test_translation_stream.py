@@ -0,0 +1,66 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.translation_stream import SentenceStreamBuffer, translate_stream
+from brain.translation_workers import TranslationOverloaded
+
+
+async def _chunks(parts, delay=0.0):
+    for part in parts:
+        if delay:
+            await asyncio.sleep(delay)
+        yield part
+
+
+def test_buffer_releases_only_completed_sentences():
+    buffer = SentenceStreamBuffer()
+    assert buffer.feed("Irrigate the wh") == ""
+    assert buffer.feed("eat field. Apply ur") == "Irrigate the wheat field. "
+    assert buffer.feed("ea at 2.5 kg") == ""
+    assert buffer.feed(" per acre.\n- Spray") == "Apply urea at 2.5 kg per acre.\n"
+    assert buffer.flush() == "- Spray"
+    assert buffer.flush() == ""
+
+
+def test_translations_interleave_with_text_and_keep_order():
+    async def translate(text, language):
+        # First block is the slowest, so later blocks finish before it
+        await asyncio.sleep(0.03 if text.startswith("Irrigate") else 0.0)
+        return {'success': True, 'translation': f"{language}:{text}"}
+
+    async def scenario():
+        parts = ["Irrigate in the evening. ", "Avoid urea before rain.\n", "Spray neem", " oil weekly"]
+        return [event async for event in translate_stream(_chunks(parts, delay=0.02), "hi", translate)]
+
+    events = asyncio.run(scenario())
+
+    text = "".join(event['chunk'] for event in events if event['type'] == 'text')
+    assert text == "Irrigate in the evening. Avoid urea before rain.\nSpray neem oil weekly"
+
+    translations = [event for event in events if event['type'] == 'translation']
+    assert [event['index'] for event in translations] == [0, 1, 2]
+    assert [event['translation'] for event in translations] == [
+        "hi:Irrigate in the evening.", "hi:Avoid urea before rain.", "hi:Spray neem oil weekly"]
+    assert [event['separator'] for event in translations] == [" ", "\n", ""]
+    # The first translation goes out before the English stream has finished
+    first_translation = events.index(translations[0])
+    assert any(event['type'] == 'text' for event in events[first_translation + 1:])
+
+
+def test_failed_blocks_are_reported_without_stopping_the_stream():
+    async def translate(text, language):
+        if "rain" in text:
+            raise TranslationOverloaded("Translation queue is full")
+        return {'success': True, 'translation': text.upper()}
+
+    async def scenario():
+        parts = ["Avoid urea before rain. ", "Irrigate today."]
+        return [event async for event in translate_stream(_chunks(parts), "ta", translate)]
+
+    translations = [event for event in asyncio.run(scenario()) if event['type'] == 'translation']
+    assert translations[0]['success'] is False
+    assert translations[0]['error'] == "Translation queue is full"
+    assert translations[1]['translation'] == "IRRIGATE TODAY."
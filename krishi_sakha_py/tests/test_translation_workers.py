@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from brain.translation_workers import TranslationWorkerPool, TranslationOverloaded
+
+
+def test_inference_runs_off_the_event_loop():
+    pool = TranslationWorkerPool(max_workers=1, max_pending=4)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        worker_thread = await pool.run(lambda: (time.sleep(0.2), threading.get_ident())[1])
+        beat.cancel()
+        return loop_thread, worker_thread, ticks
+
+    loop_thread, worker_thread, ticks = asyncio.run(scenario())
+    pool.shutdown()
+    assert worker_thread != loop_thread
+    # The loop kept serving other coroutines while the model "ran"
+    assert ticks >= 10
+
+
+def test_requests_beyond_max_pending_are_shed():
+    pool = TranslationWorkerPool(max_workers=1, max_pending=2)
+
+    async def translate():
+        async with pool.slot():
+            return await pool.run(time.sleep, 0.1)
+
+    async def scenario():
+        return await asyncio.gather(*(translate() for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    pool.shutdown()
+    assert sum(isinstance(r, TranslationOverloaded) for r in results) == 2
+    stats = pool.stats()
+    assert stats["shed"] == 2 and stats["admitted"] == 2 and stats["pending"] == 0
+
+
+def test_slot_is_released_on_errors():
+    pool = TranslationWorkerPool(max_pending=1)
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            async with pool.slot():
+                raise ValueError("bad input")
+        async with pool.slot():
+            return pool.pending
+
+    assert asyncio.run(scenario()) == 1
+    pool.shutdown()
+
+
+def test_waiting_slots_queue_instead_of_shedding():
+    pool = TranslationWorkerPool(max_workers=1, max_pending=1)
+
+    async def translate(wait):
+        async with pool.slot(wait=wait):
+            return await pool.run(time.sleep, 0.05)
+
+    async def scenario():
+        return await asyncio.gather(translate(False), translate(True), translate(False), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    pool.shutdown()
+    # The later window of an admitted document waited; a new request was shed
+    assert results[1] is None
+    assert isinstance(results[2], TranslationOverloaded)
+    assert pool.stats()["pending"] == 0
@@ -0,0 +1,75 @@
+import sys
+import os
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Lightweight stand-ins for sentence-transformers and chromadb so the registry
+# can be exercised without downloading MiniLM or touching a real database.
+model_loads = []
+clients_opened = []
+
+
+class _FakeSentenceTransformer:
+    def __init__(self, model_name):
+        model_loads.append(model_name)
+
+
+class _FakeCollection:
+    def __init__(self, name):
+        self.name = name
+
+
+class _FakeClient:
+    def __init__(self, path):
+        clients_opened.append(path)
+
+    def get_collection(self, name):
+        return _FakeCollection(name)
+
+    def create_collection(self, name):
+        return _FakeCollection(name)
+
+
+fake_st = types.ModuleType('sentence_transformers')
+fake_st.SentenceTransformer = _FakeSentenceTransformer
+fake_chromadb = types.ModuleType('chromadb')
+fake_chromadb.PersistentClient = _FakeClient
+fake_chromadb_config = types.ModuleType('chromadb.config')
+fake_chromadb_config.Settings = object
+
+sys.modules.setdefault('sentence_transformers', fake_st)
+sys.modules.setdefault('chromadb', fake_chromadb)
+sys.modules.setdefault('chromadb.config', fake_chromadb_config)
+
+from data.functions.vector_db_registry import VectorDBRegistry
+
+
+def test_registry_shares_model_and_counts_hits(tmp_path):
+    model_loads.clear()
+    clients_opened.clear()
+    registry = VectorDBRegistry(db_path=str(tmp_path))
+
+    first = registry.get("annual_report")
+    second = registry.get("annual_report")
+    other = registry.get("krishi_sakha_docs")
+
+    assert first is second
+    assert other is not first
+    assert other.embedding_generator is first.embedding_generator
+    assert len(model_loads) == 1
+    assert len(clients_opened) == 1
+
+    stats = registry.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["collections"] == ["annual_report", "krishi_sakha_docs"]
+
+
+def test_warm_up_preloads_collections(tmp_path):
+    registry = VectorDBRegistry(db_path=str(tmp_path))
+    assert registry.warm_up(["annual_report"]) == ["annual_report"]
+    assert registry.stats()["embedding_model_loaded"] is True
+
+    registry.get("annual_report")
+    assert registry.hits == 1
@@ -1,11 +1,18 @@
 """
 IndicTrans2 Translation Model - Fixed Demo
-Uses use_cache=False to avoid past_key_values bug
+Uses the KV-cached greedy decoder from krishi_sakha_py/brain/translation_decoding.py,
+which sidesteps the past_key_values bug in generate()
 """
 
+import sys
+from pathlib import Path
+
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "krishi_sakha_py"))
+from brain.translation_decoding import decode_batch
+
 
 class IndicTrans2:
     def __init__(self):
@@ -26,21 +33,15 @@ class IndicTrans2:
         self.model = self.model.to(self.device).eval()
         print("✓ Model loaded!")
     
-    def translate(self, text, source_lang='eng_Latn', target_lang='hin_Deva', max_length=256):
+    def translate(self, text, source_lang='eng_Latn', target_lang='hin_Deva', max_length=None, mode='greedy'):
         if not text.strip():
             return ""
         
         input_text = f"{source_lang} {target_lang} {text}"
         inputs = self.tokenizer(input_text, return_tensors="pt", padding=True).to(self.device)
         
-        with torch.no_grad():
-            # Use use_cache=False to avoid past_key_values bug
-            outputs = self.model.generate(
-                **inputs, 
-                max_length=max_length, 
-                num_beams=1,
-                use_cache=False
-            )
+        # max_length=None budgets the output from the input length
+        outputs = decode_batch(self.model, self.tokenizer, inputs, mode=mode, max_new_tokens=max_length)
         
         return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
 
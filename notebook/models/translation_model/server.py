@@ -9,7 +9,15 @@ import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 import json
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+# Share the KV-cached decoder with the FastAPI backend
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "krishi_sakha_py"))
+from brain.translation_decoding import decode_batch
+
+DECODE_MODE = os.getenv("TRANSLATION_DECODE_MODE", "greedy")
 
 app = Flask(__name__)
 CORS(app)
@@ -85,13 +93,7 @@ def translate():
         
         inputs = tokenizer(input_text, return_tensors="pt", padding=True).to(device)
         
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_length=256,
-                num_beams=1,
-                use_cache=False
-            )
+        outputs = decode_batch(model, tokenizer, inputs, mode=DECODE_MODE)
         
         translation = tokenizer.decode(outputs[0], skip_special_tokens=True)
         
@@ -150,13 +152,7 @@ def batch_translate():
             input_text = f"eng_Latn {target_lang} {text}"
             inputs = tokenizer(input_text, return_tensors="pt", padding=True).to(device)
             
-            with torch.no_grad():
-                outputs = model.generate(
-                    **inputs,
-                    max_length=256,
-                    num_beams=1,
-                    use_cache=False
-                )
+            outputs = decode_batch(model, tokenizer, inputs, mode=DECODE_MODE)
             
             translation = tokenizer.decode(outputs[0], skip_special_tokens=True)
             results.append({